@@ -1,8 +1,9 @@
 from flask import Flask
 from flask_cors import CORS
 from app.config import Config
-from app.domain.entities import CrawlConfig
+from app.domain.entities import CrawlConfig, ScopeRules
 from app.container.service_container import init_container
+from app.infrastructure.admission import AdmissionController
 
 
 def create_app(config_class=Config):
@@ -15,15 +16,59 @@ def create_app(config_class=Config):
             timeout=app.config['CRAWLER_TIMEOUT'],
             max_pages=app.config['CRAWLER_MAX_PAGES'],
             max_depth=app.config['CRAWLER_MAX_DEPTH'],
+            frontier_strategy=app.config['CRAWLER_FRONTIER_STRATEGY'],
+            frontier_memory_limit=app.config['CRAWLER_FRONTIER_MEMORY_LIMIT'],
+            frontier_spill_dir=app.config['CRAWLER_FRONTIER_SPILL_DIR'],
+            deadline=app.config['CRAWLER_DEADLINE'],
+            max_bytes=app.config['CRAWLER_MAX_BYTES'],
+            budget_focus=app.config['CRAWLER_BUDGET_FOCUS'],
+            link_graph=app.config['CRAWLER_LINK_GRAPH'],
+            page_metadata=app.config['CRAWLER_PAGE_METADATA'],
+            scope=ScopeRules(
+                exclude=app.config['CRAWLER_SCOPE_EXCLUDE'],
+                exclude_extensions=app.config['CRAWLER_SCOPE_EXCLUDE_EXTENSIONS']
+            ),
+            max_pages_per_template=app.config['CRAWLER_MAX_PAGES_PER_TEMPLATE'],
+            trap_loop_repeats=app.config['CRAWLER_TRAP_LOOP_REPEATS'],
+            content_dedup=app.config['CRAWLER_CONTENT_DEDUP'],
+            near_duplicate_distance=app.config['CRAWLER_NEAR_DUPLICATE_DISTANCE'],
             delay=app.config['CRAWLER_DELAY'],
+            max_concurrency=app.config['CRAWLER_MAX_CONCURRENCY'],
+            adaptive_concurrency=app.config['CRAWLER_ADAPTIVE_CONCURRENCY'],
+            initial_concurrency=app.config['CRAWLER_INITIAL_CONCURRENCY'],
+            adaptive_timeouts=app.config['CRAWLER_ADAPTIVE_TIMEOUTS'],
+            hedge_requests=app.config['CRAWLER_HEDGE_REQUESTS'],
+            hedge_max_ratio=app.config['CRAWLER_HEDGE_MAX_RATIO'],
             user_agent=app.config['CRAWLER_USER_AGENT'],
             verify_ssl=app.config['CRAWLER_VERIFY_SSL'],
             retry_count=app.config['CRAWLER_RETRY_COUNT'],
             retry_delay=app.config['CRAWLER_RETRY_DELAY'],
             follow_redirects=app.config['CRAWLER_FOLLOW_REDIRECTS'],
-            rotate_user_agent=app.config['CRAWLER_ROTATE_USER_AGENT']
+            rotate_user_agent=app.config['CRAWLER_ROTATE_USER_AGENT'],
+            allow_private_hosts=app.config['CRAWLER_ALLOW_PRIVATE_HOSTS'],
+            http_transport=app.config['CRAWLER_HTTP_TRANSPORT'],
+            http2_prior_knowledge=app.config['CRAWLER_HTTP2_PRIOR_KNOWLEDGE']
+        )
+        admission = None
+        if app.config['ADMISSION_ENABLED']:
+            admission = AdmissionController(
+                max_crawls=app.config['ADMISSION_MAX_CRAWLS'],
+                max_crawls_per_tenant=app.config['ADMISSION_MAX_CRAWLS_PER_TENANT'],
+                max_fetches=app.config['ADMISSION_MAX_FETCHES'],
+                max_fetches_per_tenant=app.config['ADMISSION_MAX_FETCHES_PER_TENANT'],
+                max_wait=app.config['ADMISSION_MAX_WAIT'],
+                max_queue=app.config['ADMISSION_MAX_QUEUE']
+            )
+        init_container(
+            crawl_config,
+            metrics_enabled=app.config['METRICS_ENABLED'],
+            archive_path=app.config['ARCHIVE_PATH'],
+            admission=admission,
+            history_path=app.config['HISTORY_PATH'],
+            http_record_path=app.config['HTTP_RECORD_PATH'],
+            http_replay_path=app.config['HTTP_REPLAY_PATH'],
+            http_replay_latency_scale=app.config['HTTP_REPLAY_LATENCY_SCALE']
         )
-        init_container(crawl_config)
     
     from app.presentation.routes import bp
     app.register_blueprint(bp)
@@ -11,6 +11,32 @@ class Config:
     CRAWLER_MAX_PAGES = int(os.getenv('CRAWLER_MAX_PAGES', 100))
     CRAWLER_MAX_DEPTH = int(os.getenv('CRAWLER_MAX_DEPTH', 10))
     CRAWLER_DELAY = float(os.getenv('CRAWLER_DELAY', 0.1))
+    # Default crawl sequential seperti sebelumnya; fetch paralel per host opt-in
+    CRAWLER_MAX_CONCURRENCY = int(os.getenv('CRAWLER_MAX_CONCURRENCY', 1))
+    CRAWLER_ADAPTIVE_CONCURRENCY = os.getenv('CRAWLER_ADAPTIVE_CONCURRENCY', 'False') == 'True'
+    CRAWLER_INITIAL_CONCURRENCY = int(os.getenv('CRAWLER_INITIAL_CONCURRENCY', 1))
+    # Timeout per host dari persentil latency; opt-in supaya field 'timeout' request tetap berlaku apa adanya
+    CRAWLER_ADAPTIVE_TIMEOUTS = os.getenv('CRAWLER_ADAPTIVE_TIMEOUTS', 'False') == 'True'
+    CRAWLER_HEDGE_REQUESTS = os.getenv('CRAWLER_HEDGE_REQUESTS', 'False') == 'True'
+    CRAWLER_HEDGE_MAX_RATIO = float(os.getenv('CRAWLER_HEDGE_MAX_RATIO', 0.1))
+    CRAWLER_FRONTIER_STRATEGY = os.getenv('CRAWLER_FRONTIER_STRATEGY', 'dfs')
+    # Budget memori frontier per crawl (bytes, 0 = tanpa batas); kelebihannya di-spill ke disk
+    CRAWLER_FRONTIER_MEMORY_LIMIT = int(os.getenv('CRAWLER_FRONTIER_MEMORY_LIMIT', 0))
+    CRAWLER_FRONTIER_SPILL_DIR = os.getenv('CRAWLER_FRONTIER_SPILL_DIR', '')
+    # Budget default per crawl, 0 = tanpa batas (bisa di-override per request)
+    CRAWLER_DEADLINE = float(os.getenv('CRAWLER_DEADLINE', 0))
+    CRAWLER_MAX_BYTES = int(os.getenv('CRAWLER_MAX_BYTES', 0))
+    CRAWLER_BUDGET_FOCUS = float(os.getenv('CRAWLER_BUDGET_FOCUS', 0.25))
+    CRAWLER_LINK_GRAPH = os.getenv('CRAWLER_LINK_GRAPH', 'False') == 'True'
+    # Metadata halaman di event 'page' dan tree, dipisah koma (mis. "title,description,word_count")
+    CRAWLER_PAGE_METADATA = [name for name in os.getenv('CRAWLER_PAGE_METADATA', '').split(',') if name]
+    # Rule scope default, dipisah koma (mis. "/admin,re:^/tag/\d+$" dan ".pdf,.zip")
+    CRAWLER_SCOPE_EXCLUDE = [rule for rule in os.getenv('CRAWLER_SCOPE_EXCLUDE', '').split(',') if rule]
+    CRAWLER_SCOPE_EXCLUDE_EXTENSIONS = [ext for ext in os.getenv('CRAWLER_SCOPE_EXCLUDE_EXTENSIONS', '').split(',') if ext]
+    CRAWLER_MAX_PAGES_PER_TEMPLATE = int(os.getenv('CRAWLER_MAX_PAGES_PER_TEMPLATE', 0))
+    CRAWLER_TRAP_LOOP_REPEATS = int(os.getenv('CRAWLER_TRAP_LOOP_REPEATS', 3))
+    CRAWLER_CONTENT_DEDUP = os.getenv('CRAWLER_CONTENT_DEDUP', 'False') == 'True'
+    CRAWLER_NEAR_DUPLICATE_DISTANCE = int(os.getenv('CRAWLER_NEAR_DUPLICATE_DISTANCE', 6))
     CRAWLER_USER_AGENT = os.getenv('CRAWLER_USER_AGENT', 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
     
     # Crawler bypass config
@@ -19,6 +45,64 @@ class Config:
     CRAWLER_RETRY_DELAY = float(os.getenv('CRAWLER_RETRY_DELAY', 1.0))
     CRAWLER_FOLLOW_REDIRECTS = os.getenv('CRAWLER_FOLLOW_REDIRECTS', 'True') == 'True'
     CRAWLER_ROTATE_USER_AGENT = os.getenv('CRAWLER_ROTATE_USER_AGENT', 'True') == 'True'
+    CRAWLER_ALLOW_PRIVATE_HOSTS = os.getenv('CRAWLER_ALLOW_PRIVATE_HOSTS', 'False') == 'True'
+    
+    # Transport HTTP: 'http1' atau 'http2' (butuh requirements-http2.txt)
+    CRAWLER_HTTP_TRANSPORT = os.getenv('CRAWLER_HTTP_TRANSPORT', 'http1')
+    CRAWLER_HTTP2_PRIOR_KNOWLEDGE = os.getenv('CRAWLER_HTTP2_PRIOR_KNOWLEDGE', 'False') == 'True'
+    
+    # Archive WARC response mentah (kosong = nonaktif); '{pid}' diganti PID worker
+    ARCHIVE_PATH = os.getenv('ARCHIVE_PATH', '')
+    
+    # History crawl di SQLite untuk query lintas crawl (kosong = nonaktif)
+    HISTORY_PATH = os.getenv('HISTORY_PATH', '')
+    
+    # Fixture HTTP (.jsonl.gz): rekam semua response crawl, atau replay tanpa jaringan
+    # (latency scale 1.0 = latency rekaman, 0.0 = secepat mungkin)
+    HTTP_RECORD_PATH = os.getenv('HTTP_RECORD_PATH', '')
+    HTTP_REPLAY_PATH = os.getenv('HTTP_REPLAY_PATH', '')
+    HTTP_REPLAY_LATENCY_SCALE = float(os.getenv('HTTP_REPLAY_LATENCY_SCALE', 0.0))
+    
+    # Admission control: batas crawl dan fetch in-flight global/per tenant, 429 jika penuh
+    ADMISSION_ENABLED = os.getenv('ADMISSION_ENABLED', 'True') == 'True'
+    ADMISSION_MAX_CRAWLS = int(os.getenv('ADMISSION_MAX_CRAWLS', 8))
+    ADMISSION_MAX_CRAWLS_PER_TENANT = int(os.getenv('ADMISSION_MAX_CRAWLS_PER_TENANT', 2))
+    ADMISSION_MAX_FETCHES = int(os.getenv('ADMISSION_MAX_FETCHES', 64))
+    ADMISSION_MAX_FETCHES_PER_TENANT = int(os.getenv('ADMISSION_MAX_FETCHES_PER_TENANT', 16))
+    ADMISSION_MAX_WAIT = float(os.getenv('ADMISSION_MAX_WAIT', 2.0))  # detik menunggu di antrian
+    ADMISSION_MAX_QUEUE = int(os.getenv('ADMISSION_MAX_QUEUE', 32))
+    # Tenant = IP client. Header tenant dikirim client dan tidak diautentikasi: aktifkan
+    # ADMISSION_TRUST_TENANT_HEADER hanya di belakang proxy yang mengautentikasi dan mengisi header ini
+    ADMISSION_TRUST_TENANT_HEADER = os.getenv('ADMISSION_TRUST_TENANT_HEADER', 'False') == 'True'
+    ADMISSION_TENANT_HEADER = os.getenv('ADMISSION_TENANT_HEADER', 'X-Tenant-ID')
+    
+    # Revisit scheduler (monitor.py): situs dipantau, dipisah koma; budget fetch per jam
+    REVISIT_SITES = [site for site in os.getenv('REVISIT_SITES', '').split(',') if site]
+    REVISIT_STATE_PATH = os.getenv('REVISIT_STATE_PATH', 'revisit.db')
+    REVISIT_FETCHES_PER_HOUR = float(os.getenv('REVISIT_FETCHES_PER_HOUR', 600))
+    REVISIT_TICK_SECONDS = float(os.getenv('REVISIT_TICK_SECONDS', 60))
+    REVISIT_REDISCOVER_HOURS = float(os.getenv('REVISIT_REDISCOVER_HOURS', 24))
+    REVISIT_POLICY = os.getenv('REVISIT_POLICY', 'change_rate')  # 'change_rate' atau 'uniform' (seperti cron)
+    
+    # Metrics config (/metrics, format Prometheus)
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'False') == 'True'
+    
+    # Profiling per request ("profile": true)
+    PROFILER_INTERVAL = float(os.getenv('PROFILER_INTERVAL', 0.005))
+    PROFILER_OUTPUT_DIR = os.getenv('PROFILER_OUTPUT_DIR')  # jika di-set, collapsed stacks juga disimpan ke file
+    
+    # SSE streaming config
+    STREAM_FLUSH_INTERVAL = float(os.getenv('STREAM_FLUSH_INTERVAL', 0.25))
+    STREAM_MAX_BATCH_EVENTS = int(os.getenv('STREAM_MAX_BATCH_EVENTS', 50))
+    STREAM_RESULT_CHUNK_SIZE = int(os.getenv('STREAM_RESULT_CHUNK_SIZE', 65536))
+    
+    # Production server config (gunicorn + gevent, lihat serve.py)
+    SERVER_WORKERS = int(os.getenv('SERVER_WORKERS', 2))
+    SERVER_WORKER_CLASS = os.getenv('SERVER_WORKER_CLASS', 'gevent')
+    SERVER_WORKER_CONNECTIONS = int(os.getenv('SERVER_WORKER_CONNECTIONS', 1000))
+    SERVER_TIMEOUT = int(os.getenv('SERVER_TIMEOUT', 0))  # 0 = tanpa batas, stream SSE bisa lama
+    SERVER_GRACEFUL_TIMEOUT = int(os.getenv('SERVER_GRACEFUL_TIMEOUT', 30))
+    SERVER_KEEPALIVE = int(os.getenv('SERVER_KEEPALIVE', 75))
 
 
 class DevelopmentConfig(Config):
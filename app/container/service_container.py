@@ -1,77 +1,213 @@
-from typing import Optional
+import logging
+import os
+import threading
+from typing import Optional, TYPE_CHECKING
 from app.domain.entities import CrawlConfig
-from app.domain.interfaces import ICrawler, IHttpClient, IUrlParser, ILinkExtractor
-from app.infrastructure.http_client import RequestsHttpClient
-from app.infrastructure.url_parser import UrlParser
-from app.infrastructure.link_extractor import BeautifulSoupLinkExtractor
-from app.infrastructure.dfs_crawler import DFSWebCrawler
-from app.use_cases.crawl_website import CrawlWebsiteUseCase
-from app.services.crawler_service import CrawlerService
+from app.domain.interfaces import ICrawler, IHttpClient, IUrlParser, ILinkExtractor, IPageSink, IProfiler
+
+# Infrastructure (requests, urllib3, BeautifulSoup) di-import di getter, bukan saat startup,
+# supaya cold start dan endpoint ringan (/health, /api) tidak membayar import crawler stack
+if TYPE_CHECKING:
+    from app.infrastructure.admission import AdmissionController
+    from app.infrastructure.crawl_history import CrawlHistoryStore
+    from app.infrastructure.metrics import CrawlMetrics
+    from app.infrastructure.page_archive import WarcArchiveSet
+    from app.use_cases.crawl_website import CrawlWebsiteUseCase
+    from app.services.crawler_service import CrawlerService
+
+logger = logging.getLogger(__name__)
 
 
 class ServiceContainer:
-    def __init__(self, config: CrawlConfig):
+    def __init__(
+        self,
+        config: CrawlConfig,
+        metrics_enabled: bool = True,
+        archive_path: Optional[str] = None,
+        admission: Optional['AdmissionController'] = None,
+        history_path: Optional[str] = None,
+        http_record_path: Optional[str] = None,
+        http_replay_path: Optional[str] = None,
+        http_replay_latency_scale: float = 0.0
+    ):
         self.config = config
+        self.metrics_enabled = metrics_enabled
+        self.admission = admission
+        # '{pid}' di path diganti PID, supaya setiap worker punya archive sendiri
+        self.archive_pattern = archive_path or None
+        self.archive_path = archive_path.format(pid=os.getpid()) if archive_path else None
+        self.history_path = history_path or None
+        # Fixture HTTP: rekam crawl asli, atau jawab semua GET dari rekaman (tanpa jaringan)
+        self.http_record_path = http_record_path or None
+        self.http_replay_path = http_replay_path or None
+        self.http_replay_latency_scale = http_replay_latency_scale
+        self._history: Optional['CrawlHistoryStore'] = None
+        self._metrics: Optional['CrawlMetrics'] = None
+        self._page_sink: Optional[IPageSink] = None
+        self._archive: Optional['WarcArchiveSet'] = None
         self._http_client: Optional[IHttpClient] = None
         self._url_parser: Optional[IUrlParser] = None
         self._link_extractor: Optional[ILinkExtractor] = None
         self._crawler: Optional[ICrawler] = None
-        self._crawl_use_case: Optional[CrawlWebsiteUseCase] = None
-        self._crawler_service: Optional[CrawlerService] = None
+        self._crawl_use_case: Optional['CrawlWebsiteUseCase'] = None
+        self._crawler_service: Optional['CrawlerService'] = None
+        # Resource bersama dibuat sekali walau request pertama datang bersamaan
+        self._lock = threading.RLock()
+    
+    def _shared(self, attr: str, factory):
+        value = getattr(self, attr)
+        if value is None:
+            with self._lock:
+                value = getattr(self, attr)
+                if value is None:
+                    value = factory()
+                    setattr(self, attr, value)
+        return value
     
     def get_http_client(self) -> IHttpClient:
-        if self._http_client is None:
-            self._http_client = RequestsHttpClient()
-        return self._http_client
+        return self._shared('_http_client', self._create_http_client)
+    
+    def _create_http_client(self) -> IHttpClient:
+        if self.http_replay_path:
+            from app.infrastructure.replay_client import ReplayHttpClient
+            return ReplayHttpClient(self.http_replay_path, latency_scale=self.http_replay_latency_scale)
+        client = self._create_network_client()
+        if self.http_record_path:
+            from app.infrastructure.replay_client import RecordingHttpClient
+            return RecordingHttpClient(client, self.http_record_path.format(pid=os.getpid()))
+        return client
+    
+    def _create_network_client(self) -> IHttpClient:
+        if self.config.http_transport == 'http2':
+            try:
+                from app.infrastructure.http2_client import Http2HttpClient
+                return Http2HttpClient(prior_knowledge=self.config.http2_prior_knowledge)
+            except ImportError:
+                logger.warning("httpx tidak terpasang, memakai transport HTTP/1.1 (requests)")
+        from app.infrastructure.http_client import RequestsHttpClient
+        # Pool per host cukup besar untuk fetch paralel dari beberapa crawl sekaligus
+        return RequestsHttpClient(pool_maxsize=max(10, self.config.max_concurrency * 2))
     
     def get_url_parser(self) -> IUrlParser:
-        if self._url_parser is None:
-            self._url_parser = UrlParser()
-        return self._url_parser
+        from app.infrastructure.url_parser import UrlParser
+        return self._shared('_url_parser', lambda: UrlParser(allow_private_hosts=self.config.allow_private_hosts))
     
     def get_link_extractor(self) -> ILinkExtractor:
-        if self._link_extractor is None:
-            self._link_extractor = BeautifulSoupLinkExtractor()
-        return self._link_extractor
+        from app.infrastructure.link_extractor import BeautifulSoupLinkExtractor
+        return self._shared('_link_extractor', BeautifulSoupLinkExtractor)
+    
+    def get_metrics(self) -> Optional['CrawlMetrics']:
+        if not self.metrics_enabled:
+            return None
+        from app.infrastructure.metrics import CrawlMetrics
+        return self._shared('_metrics', CrawlMetrics)
+    
+    def get_admission(self) -> Optional['AdmissionController']:
+        return self.admission
+    
+    def get_page_sink(self) -> Optional[IPageSink]:
+        if not self.archive_path:
+            return None
+        from app.infrastructure.page_archive import WarcArchiveWriter
+        return self._shared('_page_sink', lambda: WarcArchiveWriter(self.archive_path))
+    
+    def get_archive(self) -> Optional['WarcArchiveSet']:
+        """Reader archive semua worker (lihat WarcArchiveSet), di-cache per proses"""
+        if not self.archive_pattern:
+            return None
+        from app.infrastructure.page_archive import WarcArchiveSet
+        return self._shared('_archive', lambda: WarcArchiveSet(self.archive_pattern))
+    
+    def get_history(self) -> Optional['CrawlHistoryStore']:
+        if not self.history_path:
+            return None
+        from app.infrastructure.crawl_history import CrawlHistoryStore
+        return self._shared('_history', lambda: CrawlHistoryStore(self.history_path))
+    
+    def create_profiler(self, interval: float) -> IProfiler:
+        from app.infrastructure.profiler import SamplingProfiler
+        return SamplingProfiler(interval=interval)
+    
+    def create_crawler(self, config: Optional[CrawlConfig] = None, profiler: Optional[IProfiler] = None) -> ICrawler:
+        """
+        Crawler untuk satu request. Murah dibuat: HTTP client (connection pool),
+        parser, metrics dan page sink dipakai bersama dan thread-safe; state
+        per crawl (frontier, visited, cookie) hidup di dalam crawl_stream.
+        profiler diteruskan supaya thread fetch crawl ini ikut disampling.
+        """
+        from app.infrastructure.dfs_crawler import DFSWebCrawler
+        return DFSWebCrawler(
+            http_client=self.get_http_client(),
+            url_parser=self.get_url_parser(),
+            link_extractor=self.get_link_extractor(),
+            config=config or self.config,
+            metrics=self.get_metrics(),
+            page_sink=self.get_page_sink(),
+            profiler=profiler
+        )
     
     def get_crawler(self) -> ICrawler:
-        if self._crawler is None:
-            self._crawler = DFSWebCrawler(
-                http_client=self.get_http_client(),
-                url_parser=self.get_url_parser(),
-                link_extractor=self.get_link_extractor(),
-                config=self.config
-            )
-        return self._crawler
-    
-    def get_crawl_use_case(self) -> CrawlWebsiteUseCase:
-        if self._crawl_use_case is None:
-            self._crawl_use_case = CrawlWebsiteUseCase(
-                crawler=self.get_crawler(),
-                url_parser=self.get_url_parser()
-            )
-        return self._crawl_use_case
-    
-    def get_crawler_service(self) -> CrawlerService:
-        if self._crawler_service is None:
-            self._crawler_service = CrawlerService(crawl_use_case=self.get_crawl_use_case())
-        return self._crawler_service
+        return self._shared('_crawler', self.create_crawler)
+    
+    def get_crawl_use_case(self) -> 'CrawlWebsiteUseCase':
+        from app.use_cases.crawl_website import CrawlWebsiteUseCase
+        return self._shared('_crawl_use_case', lambda: CrawlWebsiteUseCase(
+            crawler=self.get_crawler(),
+            url_parser=self.get_url_parser()
+        ))
+    
+    def get_crawler_service(self) -> 'CrawlerService':
+        from app.services.crawler_service import CrawlerService
+        return self._shared('_crawler_service', lambda: CrawlerService(
+            crawl_use_case=self.get_crawl_use_case(),
+            history=self.get_history()
+        ))
     
     def reset(self):
+        if hasattr(self._http_client, 'close'):
+            self._http_client.close()
         self._http_client = None
         self._url_parser = None
         self._link_extractor = None
         self._crawler = None
         self._crawl_use_case = None
         self._crawler_service = None
+        self._metrics = None
+        if self._page_sink is not None:
+            self._page_sink.close()
+            self._page_sink = None
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
+        if self._history is not None:
+            self._history.close()
+            self._history = None
 
 
 _container: Optional[ServiceContainer] = None
 
 
-def init_container(config: CrawlConfig) -> ServiceContainer:
+def init_container(
+    config: CrawlConfig,
+    metrics_enabled: bool = True,
+    archive_path: Optional[str] = None,
+    admission: Optional['AdmissionController'] = None,
+    history_path: Optional[str] = None,
+    http_record_path: Optional[str] = None,
+    http_replay_path: Optional[str] = None,
+    http_replay_latency_scale: float = 0.0
+) -> ServiceContainer:
     global _container
-    _container = ServiceContainer(config)
+    _container = ServiceContainer(
+        config,
+        metrics_enabled=metrics_enabled,
+        archive_path=archive_path,
+        admission=admission,
+        history_path=history_path,
+        http_record_path=http_record_path,
+        http_replay_path=http_replay_path,
+        http_replay_latency_scale=http_replay_latency_scale
+    )
     return _container
 
 
@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional
 
 
 @dataclass
@@ -10,15 +10,19 @@ class TreeNode:
     depth: int
     is_valid: bool
     children: List['TreeNode'] = field(default_factory=list)
+    metadata: Optional[Dict[str, Any]] = None  # CrawlConfig.page_metadata, None jika nonaktif
     
     def to_dict(self) -> dict:
-        return {
+        data = {
             'url': self.url,
             'route': self.route,
             'depth': self.depth,
             'is_valid': self.is_valid,
             'children': [child.to_dict() for child in self.children]
         }
+        if self.metadata is not None:
+            data['metadata'] = self.metadata
+        return data
     
     def to_tree_string(self, prefix: str = "", is_last: bool = True) -> str:
         """Menghasilkan representasi string tree yang visual"""
@@ -34,6 +38,82 @@ class TreeNode:
         return result
 
 
+@dataclass
+class PageTiming:
+    """Timing per stage untuk satu page (detik), diisi jika instrumentation aktif"""
+    dns: float = 0.0
+    connect: float = 0.0
+    ttfb: float = 0.0
+    download: float = 0.0
+    parse: float = 0.0
+    normalize: float = 0.0
+    sleep: float = 0.0  # politeness delay sebelum fetch ini
+    retry_sleep: float = 0.0  # backoff di antara retry
+    bytes: int = 0
+    retries: int = 0
+    
+    @property
+    def fetch(self) -> float:
+        return self.dns + self.connect + self.ttfb + self.download
+    
+    def to_dict(self) -> dict:
+        return {
+            'dns': round(self.dns, 6),
+            'connect': round(self.connect, 6),
+            'ttfb': round(self.ttfb, 6),
+            'download': round(self.download, 6),
+            'fetch': round(self.fetch, 6),
+            'parse': round(self.parse, 6),
+            'normalize': round(self.normalize, 6),
+            'sleep': round(self.sleep, 6),
+            'retry_sleep': round(self.retry_sleep, 6),
+            'bytes': self.bytes,
+            'retries': self.retries
+        }
+
+
+@dataclass
+class HttpResponse:
+    """Hasil satu GET: URL akhir setelah redirect, status, headers, dan body HTML"""
+    url: str
+    final_url: str
+    status_code: int
+    headers: Dict[str, str] = field(default_factory=dict)
+    text: Optional[str] = None  # None jika bukan HTML atau status bukan 200
+    redirect_chain: List[str] = field(default_factory=list)  # URL sebelum final_url, urut sesuai hop
+    http_version: Optional[str] = None  # 'HTTP/1.1' atau 'HTTP/2'
+    attempts: int = 1  # jumlah percobaan (retry karena 403/429/5xx/timeout)
+    elapsed: float = 0.0  # durasi attempt terakhir (request sampai body terbaca), tanpa retry dan backoff
+    
+    @property
+    def is_html(self) -> bool:
+        return self.text is not None
+    
+    @property
+    def redirected(self) -> bool:
+        return bool(self.redirect_chain)
+    
+    @property
+    def size(self) -> int:
+        """Ukuran body dalam bytes: Content-Length jika ada, selain itu panjang text"""
+        for name, value in self.headers.items():
+            if name.lower() == 'content-length' and value.isdigit():
+                return int(value)
+        return len(self.text) if self.text is not None else 0
+
+
+# Metadata halaman yang bisa di-extract bersama links (CrawlConfig.page_metadata)
+PAGE_METADATA_FIELDS = ('title', 'description', 'canonical', 'robots', 'lang', 'word_count')
+
+
+@dataclass
+class ExtractedPage:
+    """Hasil parsing satu halaman dalam satu pass"""
+    links: List[str] = field(default_factory=list)
+    canonical: Optional[str] = None  # target <link rel=canonical> (absolute)
+    metadata: Dict[str, Any] = field(default_factory=dict)  # hanya field yang diminta
+
+
 @dataclass
 class CrawlResult:
     start_url: str
@@ -43,7 +123,17 @@ class CrawlResult:
     max_depth_reached: int = 0
     tree: Optional[TreeNode] = None
     route_depths: Dict[str, int] = field(default_factory=dict)  # route -> depth mapping
-    stop_reason: str = 'unknown'  # 'max_pages_reached', 'queue_empty', 'unknown'
+    stop_reason: str = 'unknown'  # 'max_pages_reached', 'queue_empty', 'deadline_reached', 'byte_budget_reached', 'unknown'
+    skipped_by_template: Dict[str, int] = field(default_factory=dict)  # path template -> URL yang dilewati
+    skipped_loops: int = 0  # URL dengan segmen path berulang (crawler trap)
+    duplicate_clusters: Dict[str, List[str]] = field(default_factory=dict)  # route asli -> route dengan konten duplikat
+    aliases: Dict[str, str] = field(default_factory=dict)  # route alias (redirect/canonical) -> route yang dicatat
+    concurrency: Dict[str, dict] = field(default_factory=dict)  # host -> statistik window adaptif
+    tail_latency: Dict[str, Any] = field(default_factory=dict)  # persentil/timeout per host dan statistik hedge
+    budget: Dict[str, Any] = field(default_factory=dict)  # deadline/byte budget yang dipakai (jika di-set)
+    frontier: Dict[str, Any] = field(default_factory=dict)  # ringkasan URL yang belum dijelajahi
+    link_graph: Dict[str, Any] = field(default_factory=dict)  # analytics link graph (degree, click depth, PageRank)
+    frontier_spill: Dict[str, Any] = field(default_factory=dict)  # statistik spill frontier ke disk (jika dibatasi)
     
     def validate_page_count(self) -> bool:
         """Validasi bahwa valid + invalid = pages_crawled"""
@@ -59,6 +149,18 @@ class CrawlResult:
             'max_depth_reached': self.max_depth_reached,
             'route_depths': self.route_depths,
             'stop_reason': self.stop_reason,
+            'traps': {
+                'skipped_by_template': self.skipped_by_template,
+                'skipped_loops': self.skipped_loops
+            },
+            'duplicate_clusters': self.duplicate_clusters,
+            'aliases': self.aliases,
+            'concurrency': self.concurrency,
+            'tail_latency': self.tail_latency,
+            'budget': self.budget,
+            'frontier': self.frontier,
+            'link_graph': self.link_graph,
+            'frontier_spill': self.frontier_spill,
             'validation': {
                 'valid_count': len(self.found_routes),
                 'invalid_count': len(self.invalid_routes),
@@ -89,12 +191,73 @@ class CrawlResult:
         return result
 
 
+@dataclass
+class ScopeRules:
+    """
+    Rule scope URL per crawl. Entry include/exclude berupa path prefix
+    ('/blog'), glob ('*.html', '/tag/*') atau regex dengan awalan 're:'
+    (regex hanya dari config server, request ditolak di CrawlRequest).
+    """
+    include: List[str] = field(default_factory=list)
+    exclude: List[str] = field(default_factory=list)
+    exclude_extensions: List[str] = field(default_factory=list)  # mis. ['.pdf', '.jpg']
+    allowed_subdomains: Optional[List[str]] = None  # None = semua subdomain, [] = hanya domain start URL
+    allowed_ports: Optional[List[int]] = None  # None = port start URL
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'ScopeRules':
+        return cls(
+            include=list(data.get('include', [])),
+            exclude=list(data.get('exclude', [])),
+            exclude_extensions=list(data.get('exclude_extensions', [])),
+            allowed_subdomains=data.get('subdomains'),
+            allowed_ports=[int(port) for port in data['ports']] if data.get('ports') is not None else None
+        )
+
+
 @dataclass
 class CrawlConfig:
     timeout: int = 10
     max_pages: int = 100
     max_depth: int = 10  # Batas kedalaman DFS
+    frontier_strategy: str = 'dfs'  # 'dfs', 'bfs' atau 'best_first'
+    
+    # Budget memori frontier (estimasi bytes, 0 = tanpa batas). dfs/bfs men-spill entry berlebih
+    # ke file temporary di `frontier_spill_dir` (kosong = temp dir sistem); urutan traversal sama
+    frontier_memory_limit: int = 0
+    frontier_spill_dir: str = ''
+    
+    # Budget per crawl (0 = tanpa batas): deadline wall-clock (detik) dan total bytes body.
+    # Pada `budget_focus` terakhir dari budget, frontier diurutkan berdasarkan biaya/yield
+    deadline: float = 0.0
+    max_bytes: int = 0
+    budget_focus: float = 0.25
+    
+    # Rekam semua edge intra-site (CSR, butuh NumPy) untuk in/out-degree, click depth,
+    # PageRank, orphan dan route tak terjangkau di CrawlResult.link_graph
+    link_graph: bool = False
+    scope: ScopeRules = field(default_factory=ScopeRules)  # include/exclude rules untuk link
+    
+    # Deteksi crawler trap
+    max_pages_per_template: int = 0  # batas fetch per path template (/product/{n}), 0 = tanpa batas
+    trap_loop_repeats: int = 3  # skip path dengan blok segmen berulang sebanyak ini, 0 = nonaktif
+    
+    # Deteksi konten duplikat: halaman duplikat tidak di-extract link-nya
+    content_dedup: bool = False
+    near_duplicate_distance: int = 6  # Hamming distance maksimum SimHash 64-bit
     delay: float = 0.1
+    
+    # Fetch paralel per crawl; adaptive = window AIMD per host (naik selama latency stabil,
+    # turun tajam saat 429/5xx/latency spike), dibatasi max_concurrency
+    max_concurrency: int = 1
+    adaptive_concurrency: bool = False
+    initial_concurrency: int = 1
+    
+    # Tail latency: timeout per host dari p99 latency yang teramati (dibatasi `timeout`),
+    # dan hedged GET kedua setelah p95 host, maksimal hedge_max_ratio dari total fetch
+    adaptive_timeouts: bool = False
+    hedge_requests: bool = False
+    hedge_max_ratio: float = 0.1
     user_agent: str = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
     
     # Opsi untuk bypass
@@ -103,6 +266,20 @@ class CrawlConfig:
     retry_delay: float = 1.0  # Delay antara retry
     follow_redirects: bool = True
     
+    # Transport HTTP: 'http1' (requests) atau 'http2' (httpx, satu koneksi multiplex per host)
+    http_transport: str = 'http1'
+    http2_prior_knowledge: bool = False  # h2c untuk URL http:// (fallback ke HTTP/1.1 jika ditolak)
+    
+    # Sertakan PageTiming di setiap event 'page'
+    collect_timings: bool = False
+    
+    # Metadata halaman (subset PAGE_METADATA_FIELDS) yang di-extract di pass parsing yang sama
+    # dengan links, disertakan di event 'page' dan TreeNode. Kosong = hanya links
+    page_metadata: List[str] = field(default_factory=list)
+    
+    # Izinkan crawl ke host private/loopback (hanya untuk benchmark lokal)
+    allow_private_hosts: bool = False
+    
     # Rotasi User-Agent untuk menghindari blocking
     rotate_user_agent: bool = True
     user_agents: List[str] = field(default_factory=lambda: [
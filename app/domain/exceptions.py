@@ -17,3 +17,11 @@ class CrawlError(DomainException):
         self.url = url
         self.reason = reason
         super().__init__(f"Failed to crawl {url}: {reason}")
+
+
+class OverloadedError(DomainException):
+    """Crawl ditolak admission control; client boleh mencoba lagi setelah retry_after detik"""
+    def __init__(self, reason: str, retry_after: int):
+        self.reason = reason
+        self.retry_after = retry_after
+        super().__init__(f"Server sibuk: {reason}")
@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Generator, Dict, Any
-from app.domain.entities import CrawlResult
+from typing import List, Optional, Generator, Dict, Any, Iterator, Sequence, Tuple, Callable
+from app.domain.entities import CrawlResult, PageTiming, HttpResponse, ExtractedPage
 
 
 class IHttpClient(ABC):
@@ -13,8 +13,9 @@ class IHttpClient(ABC):
         verify_ssl: bool = True,
         retry_count: int = 1,
         retry_delay: float = 1.0,
-        follow_redirects: bool = True
-    ) -> Optional[str]:
+        follow_redirects: bool = True,
+        timing: Optional[PageTiming] = None
+    ) -> Optional[HttpResponse]:
         """
         Melakukan HTTP GET request.
         
@@ -26,11 +27,97 @@ class IHttpClient(ABC):
             retry_count: Jumlah percobaan ulang
             retry_delay: Delay antara retry
             follow_redirects: Apakah follow redirect
+            timing: Jika diberikan, diisi dengan DNS/connect/TTFB/download,
+                bytes dan jumlah retry
             
         Returns:
-            HTML content atau None jika gagal
+            HttpResponse (text None jika bukan HTML/status bukan 200),
+            atau None jika tidak ada response sama sekali
         """
         pass
+    
+    def scoped(self) -> 'IHttpClient':
+        """
+        Client untuk satu crawl: state per crawl (cookie) terpisah, resource mahal
+        (connection pool) dipakai bersama. Harus thread-safe karena satu crawl bisa
+        fetch paralel. Default: client ini sendiri (tidak punya state per crawl).
+        """
+        return self
+
+
+# (url, depth, parent_url)
+FrontierEntry = Tuple[str, int, Optional[str]]
+
+
+class IFrontier(ABC):
+    """Antrian URL yang belum di-crawl; urutan pop menentukan strategi traversal"""
+    
+    @abstractmethod
+    def push(self, url: str, depth: int, parent_url: Optional[str]) -> None:
+        pass
+    
+    @abstractmethod
+    def pop(self) -> FrontierEntry:
+        pass
+    
+    @abstractmethod
+    def requeue(self, entries: List[FrontierEntry]) -> None:
+        """
+        Kembalikan entry yang sudah di-pop (dalam urutan pop) ke depan frontier:
+        pop berikutnya mengembalikannya dengan urutan yang sama, tanpa skor dihitung ulang
+        """
+        pass
+    
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+    
+    @abstractmethod
+    def __iter__(self) -> Iterator[FrontierEntry]:
+        """Iterasi entry yang masih antri (urutan bebas)"""
+        pass
+
+
+class IMetricsSink(ABC):
+    @abstractmethod
+    def observe_page(self, timing: PageTiming, is_valid: bool) -> None:
+        """Agregasi timing satu page"""
+        pass
+
+
+class IPageSink(ABC):
+    """Tujuan capture response mentah (mis. archive WARC)"""
+    
+    @abstractmethod
+    def write(self, response: HttpResponse) -> None:
+        """Simpan satu response; dipanggil dari loop crawl, jadi harus cepat"""
+        pass
+    
+    def close(self) -> None:
+        pass
+
+
+class IProfiler(ABC):
+    """Profiler satu crawl job (mis. sampling profiler untuk flamegraph)"""
+    
+    @abstractmethod
+    def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Profile satu pemanggilan sinkron"""
+        pass
+    
+    @abstractmethod
+    def profile_stream(self, events: Iterator[Dict[str, Any]]) -> Generator[Dict[str, Any], None, None]:
+        """Profile generator event crawl selama generator berjalan"""
+        pass
+    
+    @abstractmethod
+    def track(self, func: Callable[..., Any]) -> Callable[..., Any]:
+        """Bungkus fungsi yang dijalankan crawler di thread worker (fetch paralel, hedge) supaya ikut diprofile"""
+        pass
+    
+    @abstractmethod
+    def report(self, limit: int = 20, output_dir: Optional[str] = None) -> Dict[str, Any]:
+        pass
 
 
 class ICrawler(ABC):
@@ -53,10 +140,6 @@ class ICrawler(ABC):
 
 
 class IUrlParser(ABC):
-    @abstractmethod
-    def is_valid_url(self, url: str, domain: str) -> bool:
-        pass
-    
     @abstractmethod
     def normalize_url(self, url: str) -> str:
         pass
@@ -79,3 +162,10 @@ class ILinkExtractor(ABC):
     @abstractmethod
     def extract_links(self, html: str, current_url: str) -> List[str]:
         pass
+    
+    def extract_page(self, html: str, current_url: str, metadata: Sequence[str] = ()) -> ExtractedPage:
+        """
+        Links plus metadata halaman (field dari PAGE_METADATA_FIELDS yang diminta)
+        dalam satu pass; default hanya links
+        """
+        return ExtractedPage(links=self.extract_links(html, current_url))
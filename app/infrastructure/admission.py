@@ -0,0 +1,164 @@
+import math
+import threading
+import time
+from collections import Counter
+from typing import List, Optional
+from app.domain.exceptions import OverloadedError
+
+
+class CrawlPermit:
+    """Izin menjalankan satu crawl dengan maksimal `fetches` fetch in-flight"""
+
+    def __init__(self, controller: 'AdmissionController', tenant: str, fetches: int, waited: float):
+        self.controller = controller
+        self.tenant = tenant
+        self.fetches = fetches
+        self.waited = waited
+        self.started = time.monotonic()
+        self._released = False
+
+    def release(self) -> None:
+        """Idempotent: aman dipanggil dari finally dan dari callback close response"""
+        if not self._released:
+            self._released = True
+            self.controller._release(self)
+
+    def __enter__(self) -> 'CrawlPermit':
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class AdmissionController:
+    """
+    Admission control untuk crawl: batas global dan per tenant untuk jumlah
+    crawl yang berjalan dan total fetch in-flight (slot fetch = max_concurrency
+    crawl). Request yang tidak muat menunggu di antrian maksimal `max_wait`
+    detik; jika antrian penuh atau waktu tunggu habis, OverloadedError dengan
+    estimasi Retry-After dari durasi crawl rata-rata.
+
+    Memakai threading.Condition, sehingga juga bekerja di worker gevent
+    (di-monkey-patch menjadi greenlet).
+    """
+
+    def __init__(
+        self,
+        max_crawls: int = 8,
+        max_crawls_per_tenant: int = 2,
+        max_fetches: int = 64,
+        max_fetches_per_tenant: int = 16,
+        max_wait: float = 2.0,
+        max_queue: int = 32
+    ):
+        self.max_crawls = max_crawls
+        self.max_crawls_per_tenant = max_crawls_per_tenant
+        self.max_fetches = max_fetches
+        self.max_fetches_per_tenant = max_fetches_per_tenant
+        self.max_wait = max_wait
+        self.max_queue = max_queue
+        self._cond = threading.Condition()
+        self.active_crawls = 0
+        self.active_fetches = 0
+        self.tenant_crawls: Counter = Counter()
+        self.tenant_fetches: Counter = Counter()
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.mean_duration = 5.0  # EWMA durasi crawl, dipakai untuk Retry-After
+
+    def _fits(self, tenant: str, fetches: int) -> bool:
+        return (
+            self.active_crawls < self.max_crawls
+            and self.tenant_crawls[tenant] < self.max_crawls_per_tenant
+            and self.active_fetches + fetches <= self.max_fetches
+            and self.tenant_fetches[tenant] + fetches <= self.max_fetches_per_tenant
+        )
+
+    def retry_after(self) -> int:
+        """Perkiraan detik sampai ada slot: antrian dibagi kapasitas, dikali durasi crawl rata-rata"""
+        waves = (self.waiting + 1) / max(1, self.max_crawls)
+        return max(1, min(300, math.ceil(self.mean_duration * waves)))
+
+    def _reject(self, reason: str) -> OverloadedError:
+        self.rejected += 1
+        return OverloadedError(reason, self.retry_after())
+
+    def acquire(self, tenant: str, fetches: int = 1) -> CrawlPermit:
+        """
+        Tunggu slot (maksimal max_wait). Slot fetch diminta `fetches`, dibatasi
+        limit per tenant, sehingga crawl besar tetap bisa jalan dengan concurrency
+        yang lebih kecil (lihat CrawlPermit.fetches).
+        """
+        fetches = max(1, min(fetches, self.max_fetches_per_tenant, self.max_fetches))
+        start = time.monotonic()
+        with self._cond:
+            if not self._fits(tenant, fetches):
+                if self.max_wait <= 0 or self.waiting >= self.max_queue:
+                    raise self._reject('antrian crawl penuh' if self.max_wait > 0 else 'kapasitas crawl penuh')
+                self.waiting += 1
+                try:
+                    deadline = start + self.max_wait
+                    while not self._fits(tenant, fetches):
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise self._reject('waktu tunggu antrian crawl habis')
+                        self._cond.wait(remaining)
+                finally:
+                    self.waiting -= 1
+
+            self.active_crawls += 1
+            self.active_fetches += fetches
+            self.tenant_crawls[tenant] += 1
+            self.tenant_fetches[tenant] += fetches
+            self.admitted += 1
+        return CrawlPermit(self, tenant, fetches, time.monotonic() - start)
+
+    def _release(self, permit: CrawlPermit) -> None:
+        duration = time.monotonic() - permit.started
+        with self._cond:
+            self.active_crawls -= 1
+            self.active_fetches -= permit.fetches
+            self.tenant_crawls[permit.tenant] -= 1
+            self.tenant_fetches[permit.tenant] -= permit.fetches
+            if not self.tenant_crawls[permit.tenant]:
+                del self.tenant_crawls[permit.tenant]
+                del self.tenant_fetches[permit.tenant]
+            self.mean_duration += (duration - self.mean_duration) * 0.2
+            self._cond.notify_all()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                'active_crawls': self.active_crawls,
+                'active_fetches': self.active_fetches,
+                'waiting': self.waiting,
+                'tenants': len(self.tenant_crawls),
+                'admitted_total': self.admitted,
+                'rejected_total': self.rejected,
+                'mean_crawl_seconds': round(self.mean_duration, 3),
+            }
+
+    def render_prometheus(self) -> str:
+        stats = self.stats()
+        lines: List[str] = []
+        for name in ('active_crawls', 'active_fetches', 'waiting', 'tenants'):
+            lines.append(f'# TYPE crawler_admission_{name} gauge')
+            lines.append(f'crawler_admission_{name} {stats[name]}')
+        for name in ('admitted_total', 'rejected_total'):
+            lines.append(f'# TYPE crawler_admission_{name} counter')
+            lines.append(f'crawler_admission_{name} {stats[name]}')
+        return '\n'.join(lines) + '\n'
+
+
+def tenant_from_request(headers, remote_addr: Optional[str], header_name: str, trust_header: bool = False) -> str:
+    """
+    Tenant = IP client. Header (mis. X-Tenant-ID) hanya dipakai jika trust_header:
+    nilainya dikirim client, jadi tanpa proxy yang mengautentikasi, ganti header
+    di setiap request akan melewati kuota per tenant.
+    """
+    if trust_header:
+        tenant = headers.get(header_name)
+        if tenant:
+            return tenant
+    return remote_addr or 'anonymous'
@@ -0,0 +1,217 @@
+import heapq
+import time
+from collections import Counter, deque
+from typing import Collection, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+from app.domain.interfaces import IFrontier, FrontierEntry
+from app.infrastructure.frontier import entry_size
+from app.infrastructure.trap_detector import path_template
+
+
+STOP_DEADLINE = 'deadline_reached'
+STOP_BYTE_BUDGET = 'byte_budget_reached'
+
+
+class CrawlBudget:
+    """
+    Deadline wall-clock dan byte budget satu crawl (0 = tanpa batas).
+
+    `focus` adalah fraksi terakhir dari waktu/bytes; setelah masuk fase ini
+    crawler mengurutkan frontier berdasarkan biaya/yield (lihat DeadlineFrontier).
+    """
+
+    def __init__(self, deadline: float = 0.0, max_bytes: int = 0, focus: float = 0.25):
+        self.deadline = deadline
+        self.max_bytes = max_bytes
+        self.focus = focus
+        self.started = time.monotonic()
+        self.bytes_used = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.deadline > 0 or self.max_bytes > 0
+
+    def remaining_time(self) -> Optional[float]:
+        if self.deadline <= 0:
+            return None
+        return max(0.0, self.started + self.deadline - time.monotonic())
+
+    def remaining_bytes(self) -> Optional[int]:
+        if self.max_bytes <= 0:
+            return None
+        return max(0, self.max_bytes - self.bytes_used)
+
+    def add_bytes(self, size: int) -> None:
+        self.bytes_used += size
+
+    def exhausted(self) -> Optional[str]:
+        """Return stop reason jika budget habis"""
+        if self.deadline > 0 and self.remaining_time() <= 0:
+            return STOP_DEADLINE
+        if self.max_bytes > 0 and self.bytes_used >= self.max_bytes:
+            return STOP_BYTE_BUDGET
+        return None
+
+    def focusing(self) -> bool:
+        remaining = self.remaining_time()
+        if remaining is not None and remaining < self.deadline * self.focus:
+            return True
+        remaining = self.remaining_bytes()
+        return remaining is not None and remaining < self.max_bytes * self.focus
+
+
+class _Average:
+    __slots__ = ('total', 'count')
+
+    def __init__(self):
+        self.total = 0.0
+        self.count = 0
+
+    def add(self, value: float):
+        self.total += value
+        self.count += 1
+
+    def mean(self, default: float) -> float:
+        return self.total / self.count if self.count else default
+
+
+class CostModel:
+    """
+    Estimasi biaya (latency, bytes) dan yield (link baru) per path template,
+    dari halaman yang sudah di-fetch. Template yang belum pernah di-fetch
+    memakai rata-rata seluruh crawl.
+    """
+
+    def __init__(self):
+        self._latency: Dict[str, _Average] = {}
+        self._size: Dict[str, _Average] = {}
+        self._links: Dict[str, _Average] = {}
+        self._all = (_Average(), _Average(), _Average())
+
+    @staticmethod
+    def template(url: str) -> str:
+        return path_template(urlparse(url).path or '/')
+
+    def observe(self, url: str, latency: float, size: int, new_links: int) -> None:
+        template = self.template(url)
+        for table, overall, value in zip(
+            (self._latency, self._size, self._links), self._all, (latency, size, new_links)
+        ):
+            table.setdefault(template, _Average()).add(value)
+            overall.add(value)
+
+    def _estimate(self, table: Dict[str, _Average], overall: _Average, template: str) -> float:
+        stats = table.get(template)
+        return stats.mean(overall.mean(0.0)) if stats is not None else overall.mean(0.0)
+
+    def score(self, url: str, depth: int, budget: CrawlBudget) -> float:
+        """Biaya relatif terhadap sisa budget dibagi yield; lebih kecil = lebih dulu"""
+        template = self.template(url)
+        cost = 0.0
+        remaining = budget.remaining_time()
+        if remaining is not None:
+            cost += self._estimate(self._latency, self._all[0], template) / max(remaining, 1e-3)
+        remaining = budget.remaining_bytes()
+        if remaining is not None:
+            cost += self._estimate(self._size, self._all[1], template) / max(remaining, 1)
+        expected_links = self._estimate(self._links, self._all[2], template)
+        return (cost + 1e-6 * depth) / (1.0 + expected_links)
+
+
+class DeadlineFrontier(IFrontier):
+    """
+    Priority queue berdasarkan CostModel.score: URL murah dengan banyak link
+    baru lebih dulu. Crawler beralih ke frontier ini saat budget masuk fase focus.
+    Entry yang di-requeue menunggu di depan heap tanpa skor dihitung ulang.
+
+    `source` adalah frontier lama: entry diambil dengan pop (segment yang
+    di-spill dibaca bertahap) dan URL di `visited` dilewati. Dengan
+    `memory_limit` > 0 heap dibatasi sekitar budget itu; sisanya tetap di
+    source (termasuk push baru saat heap penuh) dan mengisi heap lagi setelah
+    pop, sehingga urutan skor hanya berlaku di dalam jendela heap tersebut.
+    """
+
+    def __init__(self, cost_model: CostModel, budget: CrawlBudget, source: Optional[IFrontier] = None,
+                 visited: Collection[str] = frozenset(), memory_limit: int = 0):
+        self.cost_model = cost_model
+        self.budget = budget
+        self.memory_limit = memory_limit
+        self._source = source
+        self._visited = visited
+        self._heap: List[Tuple[float, int, FrontierEntry]] = []
+        self._front: Deque[FrontierEntry] = deque()
+        self._counter = 0
+        self._memory_bytes = 0
+        self._fill()
+
+    def _full(self) -> bool:
+        return self.memory_limit > 0 and self._memory_bytes >= self.memory_limit
+
+    def _fill(self) -> None:
+        while self._source and not self._full():
+            entry = self._source.pop()
+            if entry[0] not in self._visited:
+                self._push_heap(entry)
+
+    def _push_heap(self, entry: FrontierEntry) -> None:
+        score = self.cost_model.score(entry[0], entry[1], self.budget)
+        heapq.heappush(self._heap, (score, self._counter, entry))
+        self._counter += 1
+        self._memory_bytes += entry_size(entry)
+
+    def push(self, url: str, depth: int, parent_url: Optional[str]) -> None:
+        if self._source is not None and self._full():
+            self._source.push(url, depth, parent_url)
+            return
+        self._push_heap((url, depth, parent_url))
+
+    def pop(self) -> FrontierEntry:
+        if self._front:
+            return self._front.popleft()
+        if not self._heap:
+            self._fill()
+        entry = heapq.heappop(self._heap)[2]
+        self._memory_bytes -= entry_size(entry)
+        self._fill()
+        return entry
+
+    def requeue(self, entries: List[FrontierEntry]) -> None:
+        self._front.extendleft(reversed(entries))
+
+    def __bool__(self) -> bool:
+        # Source bisa berisi URL visited saja; isi heap dulu agar pop tidak gagal
+        if not self._heap:
+            self._fill()
+        return bool(self._front or self._heap)
+
+    def __len__(self) -> int:
+        return len(self._front) + len(self._heap) + (len(self._source) if self._source is not None else 0)
+
+    def __iter__(self) -> Iterator[FrontierEntry]:
+        yield from list(self._front)
+        yield from (item[2] for item in self._heap)
+        if self._source is not None:
+            yield from self._source
+
+
+def summarize_frontier(entries: Iterable[FrontierEntry], visited: Iterable[str], max_depth: int, sample: int = 20) -> dict:
+    """Ringkasan URL yang belum dijelajahi: jumlah, per depth, per template, dan contoh URL"""
+    visited = visited if isinstance(visited, (set, frozenset)) else set(visited)
+    seen = set()
+    by_depth: Counter = Counter()
+    by_template: Counter = Counter()
+    urls: List[str] = []
+    for url, depth, _ in entries:
+        if url in visited or url in seen or depth > max_depth:
+            continue
+        seen.add(url)
+        by_depth[depth] += 1
+        by_template[CostModel.template(url)] += 1
+        if len(urls) < sample:
+            urls.append(url)
+    return {
+        'pending': len(seen),
+        'by_depth': {str(depth): count for depth, count in sorted(by_depth.items())},
+        'top_templates': dict(by_template.most_common(10)),
+        'sample': urls,
+    }
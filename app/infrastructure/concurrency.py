@@ -0,0 +1,146 @@
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+
+# Status yang menandakan origin kewalahan
+CONGESTION_STATUSES = frozenset({429, 502, 503, 504})
+
+
+@dataclass
+class HostWindow:
+    window: float
+    baseline: Optional[float] = None  # latency minimum (drift naik perlahan)
+    latency: Optional[float] = None  # EWMA latency
+    samples: int = 0
+    last_decrease: int = -1_000_000  # sample ke-berapa saat window terakhir diturunkan
+    max_window: float = 0.0
+    decreases: int = 0
+
+    def to_dict(self) -> dict:
+        return {
+            'window': int(self.window),
+            'max_window': int(self.max_window),
+            'decreases': self.decreases,
+            'latency_ms': round(self.latency * 1000, 2) if self.latency is not None else None,
+            'baseline_ms': round(self.baseline * 1000, 2) if self.baseline is not None else None,
+        }
+
+
+class AdaptiveConcurrency:
+    """
+    Controller AIMD per host untuk jumlah fetch paralel (in-flight window).
+
+    - Additive increase: +1 per window response selama latency EWMA tetap
+      di bawah `baseline * latency_tolerance`
+    - Multiplicative decrease: window * `backoff` untuk 429/5xx, timeout,
+      retry, atau latency spike. Penurunan paling banyak sekali per window
+      response, supaya satu batch yang gagal tidak menurunkan window berkali-kali.
+
+    Dipanggil dari loop crawl (satu thread), sehingga tidak butuh lock.
+    """
+
+    def __init__(
+        self,
+        initial: int = 2,
+        minimum: int = 1,
+        maximum: int = 16,
+        backoff: float = 0.5,
+        latency_tolerance: float = 1.3,
+        latency_spike_backoff: float = 0.8,
+        ewma_alpha: float = 0.5,
+        baseline_drift: float = 0.002
+    ):
+        self.initial = max(minimum, min(initial, maximum))
+        self.minimum = minimum
+        self.maximum = maximum
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.latency_spike_backoff = latency_spike_backoff
+        self.ewma_alpha = ewma_alpha
+        self.baseline_drift = baseline_drift
+        self.hosts: Dict[str, HostWindow] = {}
+
+    def _host(self, host: str) -> HostWindow:
+        state = self.hosts.get(host)
+        if state is None:
+            state = HostWindow(window=float(self.initial), max_window=float(self.initial))
+            self.hosts[host] = state
+        return state
+
+    def window(self, host: str) -> int:
+        return max(self.minimum, int(math.floor(self._host(host).window)))
+
+    def _decrease(self, state: HostWindow, factor: float):
+        if state.samples - state.last_decrease < state.window:
+            return
+        state.window = max(float(self.minimum), state.window * factor)
+        state.last_decrease = state.samples
+        state.decreases += 1
+
+    def observe(self, host: str, latency: float, status: Optional[int], attempts: int = 1):
+        """Catat hasil satu fetch. status None = tidak ada response (timeout/connection error)"""
+        state = self._host(host)
+        state.samples += 1
+
+        if status is None or status in CONGESTION_STATUSES or status >= 500 or attempts > 1:
+            self._decrease(state, self.backoff)
+            return
+
+        if state.baseline is None or latency < state.baseline:
+            state.baseline = latency
+        else:
+            state.baseline += (latency - state.baseline) * self.baseline_drift
+        if state.latency is None:
+            state.latency = latency
+        else:
+            state.latency += (latency - state.latency) * self.ewma_alpha
+
+        if state.latency > state.baseline * self.latency_tolerance:
+            self._decrease(state, self.latency_spike_backoff)
+            return
+
+        state.window = min(float(self.maximum), state.window + 1.0 / state.window)
+        state.max_window = max(state.max_window, state.window)
+
+    def stats(self) -> Dict[str, dict]:
+        return {host: state.to_dict() for host, state in self.hosts.items()}
+
+
+class HostPacer:
+    """
+    Politeness delay per request per host: request ke host yang sama dimulai
+    minimal `delay` detik setelah request sebelumnya, berapa pun jumlah fetch
+    paralel. Rate per host tidak pernah lebih tinggi dari crawl sequential.
+
+    Dipanggil dari thread fetch, jadi slot diambil di bawah lock.
+    """
+
+    def __init__(
+        self,
+        delay: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        self.delay = delay
+        self.clock = clock
+        self.sleep = sleep
+        self._next: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, host: str) -> float:
+        """Ambil slot request berikutnya untuk host; return detik yang harus ditunggu"""
+        with self._lock:
+            now = self.clock()
+            start = max(now, self._next.get(host, now))
+            self._next[host] = start + self.delay
+            return start - now
+
+    def wait(self, host: str) -> float:
+        """Tunggu sampai slot request host tiba; return detik yang ditunggu"""
+        waited = self.reserve(host)
+        if waited > 0:
+            self.sleep(waited)
+        return waited
@@ -0,0 +1,85 @@
+import hashlib
+import re
+from typing import Dict, List, Optional, Tuple
+
+
+_MARKUP = re.compile(r'<script\b.*?</script>|<style\b.*?</style>|<[^>]+>', re.S | re.I)
+_WORD = re.compile(r'\w+')
+
+
+def exact_hash(html: str) -> str:
+    return hashlib.blake2b(html.encode('utf-8', 'replace'), digest_size=16).hexdigest()
+
+
+def simhash(html: str, shingle_size: int = 3) -> int:
+    """
+    SimHash 64-bit dari word shingles teks halaman (tanpa parsing DOM).
+
+    Halaman dengan isi hampir sama menghasilkan fingerprint dengan
+    Hamming distance kecil.
+    """
+    tokens = _WORD.findall(_MARKUP.sub(' ', html).lower())
+    if len(tokens) < shingle_size:
+        shingles = {' '.join(tokens)} if tokens else set()
+    else:
+        shingles = {' '.join(tokens[i:i + shingle_size]) for i in range(len(tokens) - shingle_size + 1)}
+    if not shingles:
+        return 0
+
+    # blake2b stabil antar proses (hash() bawaan di-randomize per proses)
+    rows = [
+        format(int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big'), '064b')
+        for shingle in shingles
+    ]
+    # Transpose bit lewat zip supaya penghitungan per kolom berjalan di C
+    half = len(rows) / 2
+    fingerprint = 0
+    for column in zip(*rows):
+        fingerprint = (fingerprint << 1) | (column.count('1') > half)
+    return fingerprint
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+class DuplicateIndex:
+    """
+    Index halaman yang sudah di-expand untuk lookup duplikat.
+
+    Exact match lewat dict hash; near-duplicate lewat banding: fingerprint
+    64-bit dibagi menjadi max_distance + 1 band, sehingga dua fingerprint
+    dengan jarak <= max_distance pasti sama di minimal satu band (pigeonhole).
+    Lookup hanya membandingkan kandidat di bucket band yang sama.
+    """
+
+    def __init__(self, max_distance: int = 6):
+        self.max_distance = max_distance
+        self.bands = max_distance + 1
+        self.band_bits = 64 // self.bands
+        self._band_mask = (1 << self.band_bits) - 1
+        self._exact: Dict[str, str] = {}
+        self._buckets: List[Dict[int, List[Tuple[int, str]]]] = [dict() for _ in range(self.bands)]
+
+    def _band_keys(self, fingerprint: int):
+        for band in range(self.bands):
+            yield band, (fingerprint >> (band * self.band_bits)) & self._band_mask
+
+    def find(self, exact: str, fingerprint: Optional[int]) -> Optional[str]:
+        """Return route halaman asli jika duplikat, atau None"""
+        original = self._exact.get(exact)
+        if original is not None or fingerprint is None:
+            return original
+
+        for band, key in self._band_keys(fingerprint):
+            for candidate, route in self._buckets[band].get(key, ()):
+                if hamming(candidate, fingerprint) <= self.max_distance:
+                    return route
+        return None
+
+    def add(self, exact: str, fingerprint: Optional[int], route: str) -> None:
+        self._exact[exact] = route
+        if fingerprint is None:
+            return
+        for band, key in self._band_keys(fingerprint):
+            self._buckets[band].setdefault(key, []).append((fingerprint, route))
@@ -0,0 +1,304 @@
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Generator, List, Optional, Union
+from urllib.parse import urlparse
+from app.domain.entities import CrawlResult
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sites (
+    id INTEGER PRIMARY KEY,
+    host TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS crawls (
+    id INTEGER PRIMARY KEY,
+    site_id INTEGER NOT NULL REFERENCES sites(id),
+    start_url TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL NOT NULL,
+    pages_crawled INTEGER NOT NULL,
+    valid_count INTEGER NOT NULL,
+    invalid_count INTEGER NOT NULL,
+    max_depth INTEGER NOT NULL,
+    stop_reason TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS crawls_by_site ON crawls(site_id, started_at);
+CREATE TABLE IF NOT EXISTS routes (
+    id INTEGER PRIMARY KEY,
+    site_id INTEGER NOT NULL REFERENCES sites(id),
+    route TEXT NOT NULL,
+    first_crawl_id INTEGER NOT NULL,
+    last_crawl_id INTEGER NOT NULL,
+    UNIQUE (site_id, route)
+);
+CREATE TABLE IF NOT EXISTS crawl_routes (
+    crawl_id INTEGER NOT NULL,
+    route_id INTEGER NOT NULL,
+    valid INTEGER NOT NULL,
+    depth INTEGER NOT NULL,
+    PRIMARY KEY (crawl_id, route_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS crawl_routes_by_route ON crawl_routes(route_id, crawl_id);
+-- Route invalid biasanya sedikit: query 'invalid sejak X' tidak perlu memindai semua route
+CREATE INDEX IF NOT EXISTS crawl_routes_invalid ON crawl_routes(crawl_id, route_id) WHERE valid = 0;
+"""
+
+
+def site_key(url: str) -> str:
+    """Site = host (netloc lowercase) dari start URL"""
+    return urlparse(url).netloc.lower()
+
+
+def parse_since(value: Union[str, float, None]) -> Optional[float]:
+    """Unix timestamp atau tanggal ISO 8601 (mis. 2024-05-01) -> unix timestamp"""
+    if value in (None, ''):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return datetime.fromisoformat(str(value)).timestamp()
+    except ValueError:
+        raise ValueError(f"'since' harus unix timestamp atau tanggal ISO 8601, bukan {value!r}")
+
+
+class CrawlHistoryStore:
+    """
+    History crawl di SQLite (WAL): setiap CrawlResult disimpan sebagai baris
+    `crawls` plus satu baris `crawl_routes` per route, route di-intern di
+    tabel `routes` per site. Index (route_id, crawl_id) dan (site_id,
+    started_at) membuat lookup history route, ringkasan site dan diff dua
+    crawl tetap beberapa milidetik meskipun ada ribuan crawl.
+
+    Satu koneksi per store dengan lock, aman dipakai beberapa thread; beberapa
+    proses worker bisa menulis ke file yang sama (WAL + busy timeout).
+    """
+
+    _CRAWL_COLUMNS = 'id, start_url, started_at, finished_at, pages_crawled, valid_count, invalid_count, max_depth, stop_reason'
+
+    def __init__(self, path: str):
+        self.path = path
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30.0, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(_SCHEMA)
+        self._conn.execute(
+            'CREATE TEMP TABLE IF NOT EXISTS ingest (route TEXT PRIMARY KEY, valid INTEGER, depth INTEGER)'
+        )
+
+    def record(self, result: CrawlResult, started_at: Optional[float] = None, finished_at: Optional[float] = None) -> int:
+        """Simpan satu hasil crawl dalam satu transaksi, return ID crawl"""
+        finished_at = finished_at if finished_at is not None else time.time()
+        started_at = started_at if started_at is not None else finished_at
+        rows = {route: (route, 0, result.route_depths.get(route, 0)) for route in result.invalid_routes}
+        rows.update((route, (route, 1, result.route_depths.get(route, 0))) for route in result.found_routes)
+
+        with self._lock:
+            conn = self._conn
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                host = site_key(result.start_url)
+                conn.execute('INSERT OR IGNORE INTO sites(host) VALUES (?)', (host,))
+                site_id = conn.execute('SELECT id FROM sites WHERE host = ?', (host,)).fetchone()[0]
+                crawl_id = conn.execute(
+                    'INSERT INTO crawls(site_id, start_url, started_at, finished_at, pages_crawled,'
+                    ' valid_count, invalid_count, max_depth, stop_reason) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (
+                        site_id, result.start_url, started_at, finished_at, result.pages_crawled,
+                        len(result.found_routes), len(result.invalid_routes), result.max_depth_reached,
+                        result.stop_reason
+                    )
+                ).lastrowid
+
+                # Route di-bulk load ke temp table, lalu upsert/insert dengan join (bukan query per route)
+                conn.execute('DELETE FROM ingest')
+                conn.executemany('INSERT INTO ingest(route, valid, depth) VALUES (?, ?, ?)', rows.values())
+                conn.execute(
+                    'INSERT INTO routes(site_id, route, first_crawl_id, last_crawl_id)'
+                    ' SELECT ?, route, ?, ? FROM ingest WHERE true'
+                    ' ON CONFLICT(site_id, route) DO UPDATE SET last_crawl_id = excluded.last_crawl_id',
+                    (site_id, crawl_id, crawl_id)
+                )
+                conn.execute(
+                    'INSERT INTO crawl_routes(crawl_id, route_id, valid, depth)'
+                    ' SELECT ?, r.id, i.valid, i.depth FROM ingest i'
+                    ' JOIN routes r ON r.site_id = ? AND r.route = i.route',
+                    (crawl_id, site_id)
+                )
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+        return crawl_id
+
+    def recording(self, events: Generator[Dict[str, Any], None, None]) -> Generator[Dict[str, Any], None, None]:
+        """Bungkus crawl_stream: result event 'complete' disimpan, ID-nya ditambahkan ke event"""
+        started_at = time.time()
+        for event in events:
+            if event['type'] == 'complete':
+                event['history_crawl_id'] = self.record(event['result'], started_at=started_at)
+            yield event
+
+    def _query(self, sql: str, params=()) -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _site_id(self, host: str) -> Optional[int]:
+        row = self._query('SELECT id FROM sites WHERE host = ?', (host.lower(),))
+        return row[0][0] if row else None
+
+    @staticmethod
+    def _crawl_dict(row) -> Dict[str, Any]:
+        return {
+            'id': row[0],
+            'start_url': row[1],
+            'started_at': row[2],
+            'finished_at': row[3],
+            'pages_crawled': row[4],
+            'valid_count': row[5],
+            'invalid_count': row[6],
+            'max_depth': row[7],
+            'stop_reason': row[8],
+        }
+
+    def sites(self) -> List[Dict[str, Any]]:
+        rows = self._query(
+            'SELECT s.host, count(c.id), max(c.started_at) FROM sites s'
+            ' LEFT JOIN crawls c ON c.site_id = s.id GROUP BY s.id ORDER BY s.host'
+        )
+        return [{'host': host, 'crawls': count, 'last_crawl_at': last} for host, count, last in rows]
+
+    def crawl(self, crawl_id: int) -> Optional[Dict[str, Any]]:
+        rows = self._query(f'SELECT {self._CRAWL_COLUMNS} FROM crawls WHERE id = ?', (crawl_id,))
+        return self._crawl_dict(rows[0]) if rows else None
+
+    def site_summary(self, host: str, limit: int = 20) -> Optional[Dict[str, Any]]:
+        """Crawl terbaru, jumlah route yang pernah terlihat dan route invalid pada crawl terakhir"""
+        site_id = self._site_id(host)
+        if site_id is None:
+            return None
+        crawls = [
+            self._crawl_dict(row) for row in self._query(
+                f'SELECT {self._CRAWL_COLUMNS} FROM crawls WHERE site_id = ? ORDER BY started_at DESC, id DESC LIMIT ?',
+                (site_id, limit)
+            )
+        ]
+        total_crawls, first_at = self._query(
+            'SELECT count(*), min(started_at) FROM crawls WHERE site_id = ?', (site_id,)
+        )[0]
+        known_routes = self._query('SELECT count(*) FROM routes WHERE site_id = ?', (site_id,))[0][0]
+        latest_invalid = []
+        if crawls:
+            latest_invalid = [row[0] for row in self._query(
+                'SELECT r.route FROM crawl_routes cr JOIN routes r ON r.id = cr.route_id'
+                ' WHERE cr.crawl_id = ? AND cr.valid = 0 ORDER BY r.route',
+                (crawls[0]['id'],)
+            )]
+        return {
+            'host': host.lower(),
+            'total_crawls': total_crawls,
+            'first_crawl_at': first_at,
+            'known_routes': known_routes,
+            'latest_invalid_routes': latest_invalid,
+            'crawls': crawls,
+        }
+
+    def route_history(self, host: str, route: str, limit: int = 100) -> Optional[Dict[str, Any]]:
+        """Kapan route pertama/terakhir terlihat dan statusnya di setiap crawl yang memuatnya"""
+        site_id = self._site_id(host)
+        if site_id is None:
+            return None
+        row = self._query(
+            'SELECT r.id, f.id, f.started_at, l.id, l.started_at FROM routes r'
+            ' JOIN crawls f ON f.id = r.first_crawl_id JOIN crawls l ON l.id = r.last_crawl_id'
+            ' WHERE r.site_id = ? AND r.route = ?',
+            (site_id, route)
+        )
+        if not row:
+            return None
+        route_id, first_id, first_at, last_id, last_at = row[0]
+        seen_in = self._query('SELECT count(*) FROM crawl_routes WHERE route_id = ?', (route_id,))[0][0]
+        entries = self._query(
+            'SELECT c.id, c.started_at, cr.valid, cr.depth FROM crawl_routes cr JOIN crawls c ON c.id = cr.crawl_id'
+            ' WHERE cr.route_id = ? ORDER BY cr.crawl_id DESC LIMIT ?',
+            (route_id, limit)
+        )
+        return {
+            'host': host.lower(),
+            'route': route,
+            'first_seen': {'crawl_id': first_id, 'at': first_at},
+            'last_seen': {'crawl_id': last_id, 'at': last_at},
+            'seen_in_crawls': seen_in,
+            'history': [
+                {'crawl_id': crawl_id, 'at': at, 'is_valid': bool(valid), 'depth': depth}
+                for crawl_id, at, valid, depth in entries
+            ],
+        }
+
+    def routes(
+        self,
+        host: str,
+        valid: Optional[bool] = None,
+        since: Optional[float] = None,
+        limit: int = 1000
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Route site yang terlihat sejak `since`, opsional hanya yang valid/invalid (mis. invalid minggu lalu)"""
+        site_id = self._site_id(host)
+        if site_id is None:
+            return None
+        # Tanpa statistik ANALYZE planner memilih primary key; partial index dipaksa untuk route invalid
+        hint = ' INDEXED BY crawl_routes_invalid' if valid is False else ''
+        sql = (
+            'SELECT r.route, count(*), max(c.started_at) FROM crawls c'
+            f' JOIN crawl_routes cr{hint} ON cr.crawl_id = c.id JOIN routes r ON r.id = cr.route_id'
+            ' WHERE c.site_id = ? AND c.started_at >= ?'
+        )
+        params: list = [site_id, since if since is not None else float('-inf')]
+        if valid is not None:
+            sql += ' AND cr.valid = 1' if valid else ' AND cr.valid = 0'
+        sql += ' GROUP BY r.id ORDER BY r.route LIMIT ?'
+        params.append(limit)
+        return [
+            {'route': route, 'crawls': count, 'last_at': last}
+            for route, count, last in self._query(sql, params)
+        ]
+
+    def diff(self, from_crawl: int, to_crawl: int) -> Optional[Dict[str, Any]]:
+        """Route yang muncul, hilang dan berubah status antara dua crawl"""
+        old, new = self.crawl(from_crawl), self.crawl(to_crawl)
+        if old is None or new is None:
+            return None
+
+        def only_in(crawl_id: int, other_id: int) -> List[str]:
+            return [row[0] for row in self._query(
+                'SELECT r.route FROM crawl_routes a JOIN routes r ON r.id = a.route_id WHERE a.crawl_id = ?'
+                ' AND NOT EXISTS (SELECT 1 FROM crawl_routes b WHERE b.crawl_id = ? AND b.route_id = a.route_id)'
+                ' ORDER BY r.route',
+                (crawl_id, other_id)
+            )]
+
+        changed = self._query(
+            'SELECT r.route, b.valid FROM crawl_routes a'
+            ' JOIN crawl_routes b ON b.crawl_id = ? AND b.route_id = a.route_id AND b.valid != a.valid'
+            ' JOIN routes r ON r.id = a.route_id WHERE a.crawl_id = ? ORDER BY r.route',
+            (to_crawl, from_crawl)
+        )
+        return {
+            'from': old,
+            'to': new,
+            'added': only_in(to_crawl, from_crawl),
+            'removed': only_in(from_crawl, to_crawl),
+            'became_invalid': [route for route, valid in changed if not valid],
+            'became_valid': [route for route, valid in changed if valid],
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.execute('PRAGMA optimize')
+            self._conn.close()
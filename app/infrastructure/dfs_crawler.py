@@ -1,19 +1,50 @@
 import time
 import json
 import logging
-from typing import Set, Dict, List, Tuple, Generator, Any
-from app.domain.interfaces import ICrawler, IHttpClient, IUrlParser, ILinkExtractor
-from app.domain.entities import CrawlResult, CrawlConfig, TreeNode
+import random
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import partial
+from typing import Set, Dict, Generator, Any, Optional, List, Tuple
+from app.domain.interfaces import ICrawler, IHttpClient, IUrlParser, ILinkExtractor, IMetricsSink, IPageSink, IProfiler
+from app.domain.entities import CrawlResult, CrawlConfig, TreeNode, PageTiming, HttpResponse, PAGE_METADATA_FIELDS
+from app.infrastructure.budget import CostModel, CrawlBudget, DeadlineFrontier, summarize_frontier
+from app.infrastructure.concurrency import AdaptiveConcurrency, HostPacer
+from app.infrastructure.frontier import create_frontier
+from app.infrastructure import link_graph
+from app.infrastructure.trap_detector import TrapDetector
+from app.infrastructure.content_fingerprint import DuplicateIndex, exact_hash, simhash
+from app.infrastructure.scope import ScopeMatcher
+from app.infrastructure.tail_latency import Hedger, LatencyTracker
 
 logger = logging.getLogger(__name__)
 
 
+def pick_user_agent(config: CrawlConfig) -> str:
+    """User-Agent untuk satu request, dengan rotasi jika diaktifkan (dipakai juga oleh revisit)"""
+    if config.rotate_user_agent and config.user_agents:
+        return random.choice(config.user_agents)
+    return config.user_agent
+
+
 class DFSWebCrawler(ICrawler):
-    def __init__(self, http_client: IHttpClient, url_parser: IUrlParser, link_extractor: ILinkExtractor, config: CrawlConfig):
+    def __init__(
+        self,
+        http_client: IHttpClient,
+        url_parser: IUrlParser,
+        link_extractor: ILinkExtractor,
+        config: CrawlConfig,
+        metrics: Optional[IMetricsSink] = None,
+        page_sink: Optional[IPageSink] = None,
+        profiler: Optional[IProfiler] = None
+    ):
         self.http_client = http_client
         self.url_parser = url_parser
         self.link_extractor = link_extractor
         self.config = config
+        self.metrics = metrics
+        self.page_sink = page_sink
+        # Profiler request ini (jika ada): fetch di thread executor ikut disampling
+        self.profiler = profiler
     
     def crawl(self, start_url: str) -> CrawlResult:
         """Non-streaming crawl - returns final result"""
@@ -33,121 +64,363 @@ class DFSWebCrawler(ICrawler):
         - 'complete': Crawl selesai dengan result lengkap
         """
         # Emit start event
+        metadata_fields = tuple(self.config.page_metadata)
+        unknown = set(metadata_fields) - set(PAGE_METADATA_FIELDS)
+        if unknown:
+            raise ValueError(f"Page metadata tidak dikenal: {', '.join(sorted(unknown))} (pilihan: {', '.join(PAGE_METADATA_FIELDS)})")
+        
         yield {
             'type': 'start',
             'url': start_url,
             'max_pages': self.config.max_pages,
-            'max_depth': self.config.max_depth
+            'max_depth': self.config.max_depth,
+            'strategy': self.config.frontier_strategy,
+            'max_concurrency': self.config.max_concurrency
         }
         
         result = CrawlResult(start_url=start_url)
-        domain = self.url_parser.get_domain(start_url)
+        # Rule scope dikompilasi sekali per crawl, dicek untuk setiap link
+        scope = ScopeMatcher(start_url, self.config.scope)
         
         visited_urls: Set[str] = set()
         processed_routes: Set[str] = set()
         valid_routes_set: Set[str] = set()
         invalid_routes_set: Set[str] = set()
         
-        stack: List[Tuple[str, int, str | None]] = [(start_url, 0, None)]
+        frontier = create_frontier(
+            self.config.frontier_strategy,
+            self.config.frontier_memory_limit,
+            self.config.frontier_spill_dir
+        )
+        frontier.push(start_url, 0, None)
+        # Frontier dengan budget memori (tetap direferensikan meskipun diganti DeadlineFrontier)
+        spill_frontier = frontier if hasattr(frontier, 'spilled_entries') else None
+        
+        traps = TrapDetector(self.config.max_pages_per_template, self.config.trap_loop_repeats)
+        check_traps = traps.enabled
+        
+        duplicates = DuplicateIndex(self.config.near_duplicate_distance) if self.config.content_dedup else None
+        
+        # Link graph lengkap (semua edge intra-site), dianalisis dengan NumPy di akhir crawl
+        graph = None
+        if self.config.link_graph:
+            if link_graph.NUMPY_AVAILABLE:
+                graph = link_graph.LinkGraphBuilder()
+            else:
+                logger.warning("link_graph diabaikan: NumPy tidak terpasang (pip install -r requirements-graph.txt)")
+        
         pages_crawled = 0
         max_depth_reached = 0
         
         node_map: Dict[str, TreeNode] = {}
         root_node: TreeNode | None = None
         
-        while stack and pages_crawled < self.config.max_pages:
-            current_url, current_depth, parent_url = stack.pop()
-            
-            if current_url in visited_urls:
-                continue
-            
-            if current_depth > self.config.max_depth:
-                continue
+        # Instrumentation hanya aktif jika diminta; jika tidak, tidak ada perf_counter di hot path
+        instrumented = self.config.collect_timings or self.metrics is not None
+        
+        # Fetch paralel: window tetap (max_concurrency) atau adaptif per host
+        concurrency = max(1, self.config.max_concurrency)
+        controller = None
+        if self.config.adaptive_concurrency and concurrency > 1:
+            controller = AdaptiveConcurrency(
+                initial=self.config.initial_concurrency,
+                maximum=concurrency
+            )
+        
+        # Deadline/byte budget: fetch selalu lewat executor supaya yang masih in-flight
+        # saat deadline bisa ditinggalkan
+        budget = CrawlBudget(self.config.deadline, self.config.max_bytes, self.config.budget_focus)
+        cost_model = CostModel() if budget.enabled else None
+        budget_stop = None
+        focused = False
+        
+        executor = ThreadPoolExecutor(max_workers=concurrency) if concurrency > 1 or budget.enabled else None
+        
+        # Tail latency: timeout per host dari persentil latency, hedged GET opsional
+        tracker = None
+        hedger = None
+        if self.config.adaptive_timeouts or self.config.hedge_requests:
+            tracker = LatencyTracker()
+            if self.config.hedge_requests:
+                hedger = Hedger(tracker, self.config.hedge_max_ratio, max_workers=2 * concurrency)
+        # Politeness delay per request per host, juga saat fetch paralel
+        pacer = HostPacer(self.config.delay) if self.config.delay > 0 else None
+        # Client per crawl: cookie/session tidak bocor ke crawl lain yang berjalan bersamaan
+        fetch = partial(
+            self._fetch_entry,
+            tracker=tracker,
+            hedger=hedger,
+            budget=budget if budget.enabled else None,
+            http_client=self.http_client.scoped(),
+            pacer=pacer
+        )
+        
+        while frontier and pages_crawled < self.config.max_pages:
+            if budget.enabled:
+                budget_stop = budget.exhausted()
+                if budget_stop is not None:
+                    break
+                # Mendekati batas budget: URL murah dengan yield tinggi lebih dulu
+                if not focused and budget.focusing():
+                    # Frontier lama jadi source: URL visited dilewati, heap dibatasi budget memori frontier
+                    frontier = DeadlineFrontier(
+                        cost_model, budget, frontier, visited_urls, self.config.frontier_memory_limit
+                    )
+                    focused = True
             
-            visited_urls.add(current_url)
+            # Ambil satu batch: maksimal window in-flight per host (1 = sequential)
+            batch = []
+            deferred = []
+            per_host: Dict[str, int] = {}
+            batch_limit = self.config.max_concurrency if controller is not None else concurrency
+            while frontier and len(batch) < batch_limit and pages_crawled < self.config.max_pages:
+                current_url, current_depth, parent_url = frontier.pop()
+                
+                if current_url in visited_urls:
+                    continue
+                
+                if current_depth > self.config.max_depth:
+                    continue
+                
+                host = self.url_parser.get_domain(current_url)
+                if controller is not None and per_host.get(host, 0) >= controller.window(host):
+                    deferred.append((current_url, current_depth, parent_url))
+                    # Berhenti mencari jika semua host di batch sudah penuh (mis. crawl satu host)
+                    # atau entry yang ditunda sudah sebanyak slot yang tersisa
+                    if len(deferred) >= batch_limit - len(batch) or all(
+                        count >= controller.window(batch_host) for batch_host, count in per_host.items()
+                    ):
+                        break
+                    continue
+                
+                visited_urls.add(current_url)
+                
+                route = self.url_parser.extract_path(current_url)
+                
+                if route in processed_routes:
+                    continue
+                
+                # Start URL tidak pernah di-skip; entry lain bisa sudah antri sebelum template penuh
+                if check_traps and parent_url is not None and traps.check(current_url):
+                    continue
+                
+                processed_routes.add(route)
+                if check_traps:
+                    traps.record_fetch(current_url)
+                pages_crawled += 1
+                per_host[host] = per_host.get(host, 0) + 1
+                
+                batch.append((current_url, current_depth, parent_url, route, host))
             
-            route = self.url_parser.extract_path(current_url)
+            # Entry yang ditunda kembali ke depan frontier dengan urutan pop semula
+            if deferred:
+                frontier.requeue(deferred)
             
-            if route in processed_routes:
+            if not batch:
                 continue
             
-            processed_routes.add(route)
-            pages_crawled += 1
-            
-            if current_depth > max_depth_reached:
-                max_depth_reached = current_depth
-            
-            html = self.http_client.get(
-                url=current_url,
-                timeout=self.config.timeout,
-                headers={'User-Agent': self._get_user_agent()},
-                verify_ssl=self.config.verify_ssl,
-                retry_count=self.config.retry_count,
-                retry_delay=self.config.retry_delay,
-                follow_redirects=self.config.follow_redirects
-            )
-            
-            is_valid = html is not None
+            fetched = self._fetch_batch(batch, executor, instrumented, fetch, budget.remaining_time())
             
-            # Only extract links if we haven't reached max_pages yet
-            remaining_queue = 0
-            if is_valid and pages_crawled < self.config.max_pages:
-                links = self.link_extractor.extract_links(html, current_url)
+            abandoned = []
+            for (current_url, current_depth, parent_url, route, host), fetched_entry in zip(batch, fetched):
+                if fetched_entry is None:
+                    # Fetch ditinggalkan karena deadline: page tidak dihitung, URL kembali ke frontier
+                    pages_crawled -= 1
+                    processed_routes.discard(route)
+                    visited_urls.discard(current_url)
+                    abandoned.append((current_url, current_depth, parent_url))
+                    continue
+                response, timing, latency = fetched_entry
+                
+                if current_depth > max_depth_reached:
+                    max_depth_reached = current_depth
+                
+                if controller is not None:
+                    controller.observe(
+                        host,
+                        latency,
+                        response.status_code if response is not None else None,
+                        response.attempts if response is not None else 1
+                    )
+                # Capture response mentah; sink menulis di thread-nya sendiri
+                if self.page_sink is not None and response is not None:
+                    self.page_sink.write(response)
+                
+                # Target redirect/canonical sudah dicatat: bukan page baru (tanpa page event),
+                # tetapi link halaman ini tetap diikuti
+                collapsed = False
+                
+                # Redirect: semua URL di chain adalah alias dari URL akhir
+                if response is not None and response.redirected:
+                    final_url = self.url_parser.normalize_url(response.final_url)
+                    for alias in response.redirect_chain:
+                        visited_urls.add(self.url_parser.normalize_url(alias))
+                    visited_urls.add(final_url)
+                    
+                    final_route = self.url_parser.extract_path(final_url)
+                    if final_route != route and scope.allows(final_url):
+                        result.aliases[route] = final_route
+                        if graph is not None:
+                            graph.add_alias(route, final_route)
+                        if final_route in processed_routes:
+                            # Halaman tujuan sudah dicatat; fetch ini tidak menghasilkan route baru
+                            pages_crawled -= 1
+                            collapsed = True
+                        processed_routes.add(final_route)
+                        current_url, route = final_url, final_route
+                
+                html = response.text if response is not None else None
+                if budget.enabled and response is not None:
+                    budget.add_bytes(response.size)
+                is_valid = html is not None
+                
+                # Konten yang sama dengan page yang sudah di-expand tidak di-parse ulang
+                duplicate_of = None
+                if is_valid and duplicates is not None and not collapsed:
+                    content_hash = exact_hash(html)
+                    content_simhash = simhash(html)
+                    duplicate_of = duplicates.find(content_hash, content_simhash)
+                    if duplicate_of is not None:
+                        result.duplicate_clusters.setdefault(duplicate_of, []).append(route)
                 
-                for link in links:
-                    normalized_link = self.url_parser.normalize_url(link)
+                # Only extract links if we haven't reached max_pages yet
+                remaining_queue = 0
+                new_links = 0
+                page = None
+                if is_valid and duplicate_of is None and pages_crawled < self.config.max_pages:
+                    if duplicates is not None:
+                        duplicates.add(content_hash, content_simhash, route)
+                    
+                    if timing is not None:
+                        stage_start = time.perf_counter()
+                    page = self.link_extractor.extract_page(html, current_url, metadata_fields)
+                    links = page.links
+                    if timing is not None:
+                        timing.parse = time.perf_counter() - stage_start
+                        stage_start = time.perf_counter()
+                    
+                    # Halaman dicatat dengan route canonical-nya, sehingga target canonical tidak di-fetch lagi
+                    if page.canonical:
+                        canonical_url = self.url_parser.normalize_url(page.canonical)
+                        canonical_route = self.url_parser.extract_path(canonical_url)
+                        if canonical_route != route and scope.allows(canonical_url):
+                            visited_urls.add(canonical_url)
+                            result.aliases[route] = canonical_route
+                            if graph is not None:
+                                graph.add_alias(route, canonical_route)
+                            if canonical_route in processed_routes and not collapsed:
+                                # Canonical hanya petunjuk: misalnya canonical "/" di semua halaman
+                                # tidak boleh menghentikan crawl, jadi link halaman ini tetap di-push
+                                pages_crawled -= 1
+                                collapsed = True
+                            processed_routes.add(canonical_route)
+                            current_url, route = canonical_url, canonical_route
                     
-                    if not self.url_parser.is_valid_url(normalized_link, domain):
-                        continue
+                    graph_src = graph.mark_fetched(route) if graph is not None else None
+                    for link in links:
+                        normalized_link = self.url_parser.normalize_url(link)
+                        
+                        if not scope.allows(normalized_link):
+                            continue
+                        
+                        if graph is not None:
+                            graph.add_edge(graph_src, self.url_parser.extract_path(normalized_link))
+                        
+                        if normalized_link in visited_urls:
+                            continue
+                        
+                        if check_traps and traps.check(normalized_link):
+                            continue
+                        
+                        frontier.push(normalized_link, current_depth + 1, current_url)
+                        new_links += 1
                     
-                    if normalized_link in visited_urls:
-                        continue
+                    if timing is not None:
+                        timing.normalize = time.perf_counter() - stage_start
                     
-                    stack.append((normalized_link, current_depth + 1, current_url))
+                    # Calculate actual remaining queue
+                    if spill_frontier is not None and spill_frontier.spilled_entries:
+                        # Sebagian frontier ada di disk: pakai jumlah entry (batas atas), bukan baca semua segment
+                        remaining_queue = len(frontier)
+                    else:
+                        remaining_queue = sum(
+                            1 for url, depth, _ in frontier 
+                            if url not in visited_urls and depth <= self.config.max_depth
+                    )
+                elif is_valid and duplicate_of is None and metadata_fields:
+                    # Halaman terakhir (max_pages): links tidak dipakai lagi, metadata tetap dicatat
+                    page = self.link_extractor.extract_page(html, current_url, metadata_fields)
                 
-                # Calculate actual remaining queue
-                remaining_queue = sum(
-                    1 for url, depth, _ in stack 
-                    if url not in visited_urls and depth <= self.config.max_depth
-            )
-            
-            # Emit page event with accurate queue size
-            yield {
-                'type': 'page',
-                'route': route,
-                'url': current_url,
-                'depth': current_depth,
-                'is_valid': is_valid,
-                'pages_crawled': pages_crawled,
-                'queue_size': remaining_queue,
-                'progress': min(100, int((pages_crawled / self.config.max_pages) * 100))
-            }
-            
-            node = TreeNode(
-                url=current_url,
-                route=route,
-                depth=current_depth,
-                is_valid=is_valid
-            )
-            node_map[current_url] = node
-            
-            if parent_url is None:
-                root_node = node
-            elif parent_url in node_map:
-                node_map[parent_url].children.append(node)
-            
-            result.route_depths[route] = current_depth
+                page_metadata = page.metadata if page is not None and metadata_fields else None
+                
+                if cost_model is not None:
+                    cost_model.observe(current_url, latency, response.size if response is not None else 0, new_links)
+                
+                if collapsed:
+                    continue
+                
+                # Emit page event with accurate queue size
+                page_event = {
+                    'type': 'page',
+                    'route': route,
+                    'url': current_url,
+                    'depth': current_depth,
+                    'is_valid': is_valid,
+                    'pages_crawled': pages_crawled,
+                    'queue_size': remaining_queue,
+                    'progress': min(100, int((pages_crawled / self.config.max_pages) * 100))
+                }
+                
+                if duplicate_of is not None:
+                    page_event['duplicate_of'] = duplicate_of
+                
+                if page_metadata is not None:
+                    page_event['metadata'] = page_metadata
+                
+                if controller is not None:
+                    page_event['concurrency'] = controller.window(host)
+                    
+                if timing is not None:
+                    if self.metrics is not None:
+                        self.metrics.observe_page(timing, is_valid)
+                    if self.config.collect_timings:
+                        page_event['timings'] = timing.to_dict()
+                
+                yield page_event
+                
+                node = TreeNode(
+                    url=current_url,
+                    route=route,
+                    depth=current_depth,
+                    is_valid=is_valid,
+                    metadata=page_metadata
+                )
+                node_map[current_url] = node
+                
+                if parent_url is None:
+                    root_node = node
+                elif parent_url in node_map:
+                    node_map[parent_url].children.append(node)
+                
+                result.route_depths[route] = current_depth
+                
+                if is_valid:
+                    valid_routes_set.add(route)
+                else:
+                    invalid_routes_set.add(route)
             
-            if is_valid:
-                valid_routes_set.add(route)
-            else:
-                invalid_routes_set.add(route)
+            # Fetch yang ditinggalkan kembali ke depan frontier tanpa mengubah skor/urutan
+            if abandoned:
+                frontier.requeue(abandoned)
             
-            # Check if max pages reached - break immediately without delay
+            # Check if max pages reached
             if pages_crawled >= self.config.max_pages:
                 break
-            
-            time.sleep(self.config.delay)
+        
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        if hedger is not None:
+            hedger.shutdown()
         
         # Build final result
         result.found_routes = sorted(list(valid_routes_set))
@@ -155,6 +428,31 @@ class DFSWebCrawler(ICrawler):
         result.pages_crawled = pages_crawled
         result.max_depth_reached = max_depth_reached
         result.tree = root_node
+        result.skipped_by_template = dict(traps.skipped_by_template.most_common())
+        result.skipped_loops = traps.skipped_loops
+        if controller is not None:
+            result.concurrency = controller.stats()
+        if budget.enabled:
+            result.budget = {
+                'deadline': self.config.deadline,
+                'max_bytes': self.config.max_bytes,
+                'elapsed': round(time.monotonic() - budget.started, 3),
+                'bytes_used': budget.bytes_used,
+                'focused': focused,
+            }
+        if frontier:
+            result.frontier = summarize_frontier(frontier, visited_urls, self.config.max_depth)
+        if spill_frontier is not None:
+            result.frontier_spill = spill_frontier.stats()
+            spill_frontier.close()
+        link_graph_result = None
+        if graph is not None:
+            link_graph_result = graph.build(self.url_parser.extract_path(start_url))
+            result.link_graph = link_graph_result.summary()
+        if tracker is not None:
+            result.tail_latency = {'hosts': tracker.stats(self.config.timeout)}
+            if hedger is not None:
+                result.tail_latency.update(hedger.stats())
         
         if not result.validate_page_count():
             logger.warning(
@@ -168,7 +466,9 @@ class DFSWebCrawler(ICrawler):
         # Determine stop reason
         if pages_crawled >= self.config.max_pages:
             stop_reason = 'max_pages_reached'
-        elif not stack:
+        elif budget_stop is not None:
+            stop_reason = budget_stop
+        elif not frontier:
             stop_reason = 'queue_empty'
         else:
             stop_reason = 'unknown'
@@ -176,15 +476,125 @@ class DFSWebCrawler(ICrawler):
         result.stop_reason = stop_reason
         
         # Emit complete event
-        yield {
+        complete_event = {
             'type': 'complete',
             'result': result,
             'stop_reason': stop_reason
         }
+        if link_graph_result is not None:
+            complete_event['graph'] = link_graph_result
+        yield complete_event
+    
+    def _fetch(
+        self,
+        url: str,
+        timing: Optional[PageTiming],
+        timeout: Optional[float] = None,
+        http_client: Optional[IHttpClient] = None
+    ) -> Tuple[Optional[HttpResponse], Optional[PageTiming], float]:
+        start = time.perf_counter()
+        response = (http_client or self.http_client).get(
+            url=url,
+            timeout=timeout if timeout is not None else self.config.timeout,
+            headers={'User-Agent': self._get_user_agent()},
+            verify_ssl=self.config.verify_ssl,
+            retry_count=self.config.retry_count,
+            retry_delay=self.config.retry_delay,
+            follow_redirects=self.config.follow_redirects,
+            timing=timing
+        )
+        return response, timing, time.perf_counter() - start
+    
+    def _fetch_entry(
+        self,
+        url: str,
+        host: str,
+        timing: Optional[PageTiming],
+        tracker: Optional[LatencyTracker] = None,
+        hedger: Optional[Hedger] = None,
+        budget: Optional[CrawlBudget] = None,
+        http_client: Optional[IHttpClient] = None,
+        pacer: Optional[HostPacer] = None
+    ) -> Tuple[Optional[HttpResponse], Optional[PageTiming], float]:
+        """
+        Fetch dengan politeness delay per host, timeout adaptif per host, dibatasi
+        sisa deadline, dan (opsional) hedged request
+        """
+        if pacer is not None:
+            waited = pacer.wait(host)
+            if timing is not None:
+                timing.sleep = waited
+        timeout = self.config.timeout
+        if tracker is not None and self.config.adaptive_timeouts:
+            timeout = tracker.timeout_for(host, self.config.timeout)
+        remaining = budget.remaining_time() if budget is not None else None
+        if remaining is not None:
+            timeout = max(0.1, min(timeout, remaining))
+        
+        def attempt(is_hedge: bool):
+            if not is_hedge:
+                fetched = self._fetch(url, timing, timeout, http_client)
+            else:
+                # Hedge juga request ke host yang sama, jadi ikut politeness delay
+                if pacer is not None:
+                    pacer.wait(host)
+                # Hedge memakai PageTiming sendiri supaya tidak ditulis bersamaan dengan attempt pertama
+                fetched = self._fetch(url, PageTiming(sleep=timing.sleep) if timing is not None else None, timeout, http_client)
+            if tracker is not None:
+                tracker.record(host, self._attempt_latency(fetched, timeout))
+            return fetched
+        
+        if hedger is None:
+            return attempt(False)
+        
+        return hedger.fetch(host, self._tracked(attempt), lambda fetched: fetched[0] is None or fetched[0].text is None)
+    
+    @staticmethod
+    def _attempt_latency(fetched: Tuple[Optional[HttpResponse], Optional[PageTiming], float], timeout: float) -> float:
+        """
+        Latency satu attempt HTTP untuk LatencyTracker: tanpa retry dan backoff-nya.
+        Tanpa response (timeout/connection error) satu attempt paling lama sebesar timeout.
+        """
+        response, _, latency = fetched
+        if response is not None and response.elapsed > 0:
+            return response.elapsed
+        return min(latency, timeout)
+    
+    def _fetch_batch(
+        self,
+        batch: List[Tuple],
+        executor: Optional[ThreadPoolExecutor],
+        instrumented: bool,
+        fetch=None,
+        wait_timeout: Optional[float] = None
+    ) -> List[Optional[Tuple[Optional[HttpResponse], Optional[PageTiming], float]]]:
+        """
+        Fetch batch; hasil dikembalikan sesuai urutan batch. instrumented False = tanpa timing.
+        Dengan wait_timeout, fetch yang belum selesai setelahnya ditinggalkan (hasil None).
+        """
+        fetch = fetch or self._fetch_entry
+        timings = [PageTiming() if instrumented else None for _ in batch]
+        if executor is None or (len(batch) == 1 and wait_timeout is None):
+            return [fetch(entry[0], entry[4], timing) for entry, timing in zip(batch, timings)]
+        fetch = self._tracked(fetch)
+        futures = [executor.submit(fetch, entry[0], entry[4], timing) for entry, timing in zip(batch, timings)]
+        if wait_timeout is None:
+            return [future.result() for future in futures]
+        done, _ = wait(futures, timeout=wait_timeout)
+        results = []
+        for future in futures:
+            if future in done:
+                results.append(future.result())
+            else:
+                # Request yang sedang berjalan tidak bisa diinterupsi; hasilnya diabaikan
+                future.cancel()
+                results.append(None)
+        return results
+    
+    def _tracked(self, func):
+        """Fungsi yang berjalan di thread executor, dibungkus profiler jika crawl diprofile"""
+        return self.profiler.track(func) if self.profiler is not None else func
     
     def _get_user_agent(self) -> str:
         """Mendapatkan User-Agent, dengan rotasi jika diaktifkan"""
-        if self.config.rotate_user_agent and self.config.user_agents:
-            import random
-            return random.choice(self.config.user_agents)
-        return self.config.user_agent
+        return pick_user_agent(self.config)
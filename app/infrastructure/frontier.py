@@ -0,0 +1,433 @@
+import heapq
+import logging
+import math
+import struct
+import tempfile
+import zlib
+from collections import deque, Counter
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+from app.domain.interfaces import IFrontier, FrontierEntry
+
+logger = logging.getLogger(__name__)
+
+FRONTIER_STRATEGIES = ('dfs', 'bfs', 'best_first')
+
+# Perkiraan memori satu entry di CPython: tuple 3 item + objek str URL.
+# Parent URL tidak dihitung karena dipakai bersama oleh semua link dari halaman yang sama.
+_ENTRY_OVERHEAD = 120
+_ENTRY_HEADER = struct.Struct('<iII')  # depth, panjang URL, panjang parent
+_NO_PARENT = 0xFFFFFFFF
+
+
+def entry_size(entry: FrontierEntry) -> int:
+    return _ENTRY_OVERHEAD + len(entry[0])
+
+
+def encode_segment(entries: List[FrontierEntry]) -> bytes:
+    """Entry frontier -> bytes compact: header biner + URL utf-8, dikompresi zlib (level cepat)"""
+    parts = []
+    for url, depth, parent_url in entries:
+        url_bytes = url.encode('utf-8')
+        parent_bytes = parent_url.encode('utf-8') if parent_url is not None else b''
+        parent_length = len(parent_bytes) if parent_url is not None else _NO_PARENT
+        parts.append(_ENTRY_HEADER.pack(depth, len(url_bytes), parent_length))
+        parts.append(url_bytes)
+        parts.append(parent_bytes)
+    return zlib.compress(b''.join(parts), 1)
+
+
+def decode_segment(data: bytes) -> List[FrontierEntry]:
+    raw = zlib.decompress(data)
+    entries: List[FrontierEntry] = []
+    # Parent yang sama di-intern lagi, seperti sebelum di-spill
+    parents: Dict[str, str] = {}
+    offset = 0
+    header_size = _ENTRY_HEADER.size
+    while offset < len(raw):
+        depth, url_length, parent_length = _ENTRY_HEADER.unpack_from(raw, offset)
+        offset += header_size
+        url = raw[offset:offset + url_length].decode('utf-8')
+        offset += url_length
+        parent_url = None
+        if parent_length != _NO_PARENT:
+            parent_url = raw[offset:offset + parent_length].decode('utf-8')
+            parent_url = parents.setdefault(parent_url, parent_url)
+            offset += parent_length
+        entries.append((url, depth, parent_url))
+    return entries
+
+
+class StackFrontier(IFrontier):
+    """DFS: LIFO stack (perilaku default crawler)"""
+
+    def __init__(self):
+        self._stack: List[FrontierEntry] = []
+
+    def push(self, url: str, depth: int, parent_url: Optional[str]) -> None:
+        self._stack.append((url, depth, parent_url))
+
+    def pop(self) -> FrontierEntry:
+        return self._stack.pop()
+
+    def requeue(self, entries: List[FrontierEntry]) -> None:
+        self._stack.extend(reversed(entries))
+
+    def __len__(self) -> int:
+        return len(self._stack)
+
+    def __iter__(self) -> Iterator[FrontierEntry]:
+        return iter(self._stack)
+
+
+class QueueFrontier(IFrontier):
+    """BFS: FIFO queue, semua section level atas dikunjungi sebelum turun"""
+
+    def __init__(self):
+        self._queue = deque()
+
+    def push(self, url: str, depth: int, parent_url: Optional[str]) -> None:
+        self._queue.append((url, depth, parent_url))
+
+    def pop(self) -> FrontierEntry:
+        return self._queue.popleft()
+
+    def requeue(self, entries: List[FrontierEntry]) -> None:
+        self._queue.extendleft(reversed(entries))
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def __iter__(self) -> Iterator[FrontierEntry]:
+        return iter(self._queue)
+
+
+class BestFirstFrontier(IFrontier):
+    """
+    Best-first: priority queue dengan skor (lebih kecil = lebih dulu) dari
+    - depth: halaman dangkal lebih dulu
+    - path novelty: URL dari section (segmen path pertama) yang baru sedikit
+      ditemukan lebih dulu
+    - link frequency: URL yang sering di-link dari banyak halaman lebih dulu
+
+    Skor dihitung saat push. URL yang di-link ulang hanya di-push lagi jika
+    skornya lebih baik; _live menyimpan entry terbaik per URL, entry lama di
+    heap dilewati saat pop dan heap dipadatkan jika entry basi lebih banyak
+    dari yang hidup. Entry yang di-requeue menunggu di depan heap, skor dan
+    hitungan link tidak berubah.
+    """
+
+    def __init__(self, depth_weight: float = 1.0, novelty_weight: float = 1.0, frequency_weight: float = 0.5):
+        self.depth_weight = depth_weight
+        self.novelty_weight = novelty_weight
+        self.frequency_weight = frequency_weight
+        self._heap: List[Tuple[float, int, FrontierEntry]] = []
+        # URL -> (skor, counter) entry heap yang masih berlaku
+        self._live: Dict[str, Tuple[float, int]] = {}
+        self._front: Deque[FrontierEntry] = deque()
+        self._counter = 0
+        self._link_counts: Counter = Counter()
+        self._section_counts: Counter = Counter()
+
+    @staticmethod
+    def _section(url: str) -> str:
+        path = urlparse(url).path.strip('/')
+        return path.split('/', 1)[0] if path else ''
+
+    def score(self, url: str, depth: int) -> float:
+        frequency = self._link_counts[url]
+        # Jumlah URL berbeda dari section ini yang sudah ditemukan
+        section_load = self._section_counts[self._section(url)]
+        return (
+            self.depth_weight * depth
+            + self.novelty_weight * math.log1p(section_load)
+            - self.frequency_weight * math.log1p(frequency)
+        )
+
+    def push(self, url: str, depth: int, parent_url: Optional[str]) -> None:
+        if url not in self._link_counts:
+            self._section_counts[self._section(url)] += 1
+        self._link_counts[url] += 1
+        score = self.score(url, depth)
+        live = self._live.get(url)
+        if live is not None and live[0] <= score:
+            return
+        # Counter menjaga urutan FIFO untuk skor yang sama
+        self._live[url] = (score, self._counter)
+        heapq.heappush(self._heap, (score, self._counter, (url, depth, parent_url)))
+        self._counter += 1
+        if len(self._heap) > 2 * len(self._live):
+            self._compact()
+
+    def _is_live(self, item: Tuple[float, int, FrontierEntry]) -> bool:
+        return self._live.get(item[2][0]) == item[:2]
+
+    def _compact(self):
+        self._heap = [item for item in self._heap if self._is_live(item)]
+        heapq.heapify(self._heap)
+
+    def pop(self) -> FrontierEntry:
+        if self._front:
+            return self._front.popleft()
+        while True:
+            item = heapq.heappop(self._heap)
+            if self._is_live(item):
+                del self._live[item[2][0]]
+                return item[2]
+
+    def requeue(self, entries: List[FrontierEntry]) -> None:
+        self._front.extendleft(reversed(entries))
+
+    def __len__(self) -> int:
+        return len(self._front) + len(self._live)
+
+    def __iter__(self) -> Iterator[FrontierEntry]:
+        yield from list(self._front)
+        yield from (item[2] for item in self._heap if self._is_live(item))
+
+
+class _SpillFile:
+    """
+    Segment frontier di satu file temporary anonim (otomatis dihapus saat
+    ditutup/di-garbage-collect, juga jika crawl berhenti di tengah jalan).
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or None
+        self._file = None
+        self.bytes_written = 0
+        self.segments_written = 0
+        self.entries_written = 0
+
+    def write(self, entries: List[FrontierEntry]) -> Tuple[int, int, int, int]:
+        """Return segment (offset, panjang, jumlah entry, estimasi memori entry)"""
+        if self._file is None:
+            self._file = tempfile.TemporaryFile(prefix='frontier-', dir=self.directory)
+        data = encode_segment(entries)
+        offset = self._file.seek(0, 2)
+        self._file.write(data)
+        self.bytes_written += len(data)
+        self.segments_written += 1
+        self.entries_written += len(entries)
+        return offset, len(data), len(entries), sum(map(entry_size, entries))
+
+    def read(self, segment: Tuple[int, int, int, int]) -> List[FrontierEntry]:
+        offset, length = segment[0], segment[1]
+        self._file.seek(offset)
+        return decode_segment(self._file.read(length))
+
+    def truncate(self, offset: int) -> None:
+        """Segment yang sudah di-load dibuang dari akhir file (ruang disk kembali)"""
+        self._file.truncate(offset)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class _SpillingFrontier(IFrontier):
+    """Basis frontier dengan budget memori; entry berlebih di-spill ke disk per segment"""
+
+    def __init__(self, memory_limit: int, spill_dir: Optional[str] = None):
+        self.memory_limit = memory_limit
+        # Segment kecil: load satu segment tidak membuat memori melewati budget
+        self.segment_bytes = max(1, memory_limit // 4)
+        self._memory_bytes = 0
+        self._spilled = 0
+        self._spill = _SpillFile(spill_dir)
+        self.peak_memory_bytes = 0
+        self.loads = 0
+
+    def _chunks(self, entries: List[FrontierEntry]) -> Iterator[List[FrontierEntry]]:
+        chunk: List[FrontierEntry] = []
+        size = 0
+        for entry in entries:
+            chunk.append(entry)
+            size += entry_size(entry)
+            if size >= self.segment_bytes:
+                yield chunk
+                chunk, size = [], 0
+        if chunk:
+            yield chunk
+
+    def _write(self, entries: List[FrontierEntry]) -> Tuple[int, int, int, int]:
+        segment = self._spill.write(entries)
+        self._spilled += segment[2]
+        self._memory_bytes -= segment[3]
+        return segment
+
+    def _read(self, segment: Tuple[int, int, int, int]) -> List[FrontierEntry]:
+        entries = self._spill.read(segment)
+        self._spilled -= segment[2]
+        self._memory_bytes += segment[3]
+        self.loads += 1
+        return entries
+
+    def _track(self, size: int) -> None:
+        self._memory_bytes += size
+        if self._memory_bytes > self.peak_memory_bytes:
+            self.peak_memory_bytes = self._memory_bytes
+
+    @property
+    def spilled_entries(self) -> int:
+        """Jumlah entry yang saat ini ada di disk"""
+        return self._spilled
+
+    def stats(self) -> dict:
+        return {
+            'memory_limit': self.memory_limit,
+            'peak_memory_bytes': self.peak_memory_bytes,
+            'spilled_entries': self._spill.entries_written,
+            'spilled_segments': self._spill.segments_written,
+            'spill_bytes': self._spill.bytes_written,
+            'loads': self.loads,
+        }
+
+    def close(self) -> None:
+        self._spill.close()
+
+
+class SpillingStackFrontier(_SpillingFrontier):
+    """
+    DFS dengan budget memori. Urutan pop identik dengan StackFrontier:
+    jika estimasi memori melewati `memory_limit`, entry paling bawah stack
+    (yang paling akhir di-pop) ditulis ke disk sampai memori tinggal separuh
+    budget. Segment disimpan sebagai stack juga, dan segment teratas di-load
+    kembali saat stack di memori kosong.
+    """
+
+    def __init__(self, memory_limit: int, spill_dir: Optional[str] = None):
+        super().__init__(memory_limit, spill_dir)
+        self._stack: List[FrontierEntry] = []
+        self._segments: List[Tuple[int, int, int, int]] = []
+
+    def push(self, url: str, depth: int, parent_url: Optional[str]) -> None:
+        entry = (url, depth, parent_url)
+        self._stack.append(entry)
+        self._track(entry_size(entry))
+        if self._memory_bytes > self.memory_limit and len(self._stack) > 1:
+            self._spill_bottom()
+
+    def _spill_bottom(self):
+        target = self._memory_bytes - self.memory_limit // 2
+        size = 0
+        count = 0
+        while count < len(self._stack) - 1 and size < target:
+            size += entry_size(self._stack[count])
+            count += 1
+        bottom = self._stack[:count]
+        del self._stack[:count]
+        for chunk in self._chunks(bottom):
+            self._segments.append(self._write(chunk))
+
+    def pop(self) -> FrontierEntry:
+        if not self._stack and self._segments:
+            segment = self._segments.pop()
+            self._stack = self._read(segment)
+            self._spill.truncate(segment[0])
+        entry = self._stack.pop()
+        self._memory_bytes -= entry_size(entry)
+        return entry
+
+    def requeue(self, entries: List[FrontierEntry]) -> None:
+        # Entry baru saja di-pop dari stack di memori, jadi tidak memicu spill
+        self._stack.extend(reversed(entries))
+        self._track(sum(map(entry_size, entries)))
+
+    def __len__(self) -> int:
+        return len(self._stack) + self._spilled
+
+    def __iter__(self) -> Iterator[FrontierEntry]:
+        """Membaca semua segment dari disk; untuk ringkasan, bukan hot path"""
+        for segment in list(self._segments):
+            yield from self._spill.read(segment)
+        yield from list(self._stack)
+
+
+class SpillingQueueFrontier(_SpillingFrontier):
+    """
+    BFS dengan budget memori. Urutan pop identik dengan QueueFrontier:
+    antrian = head (di memori, sedang dikonsumsi) + segment di disk (FIFO) +
+    tail (di memori, tempat push). Selama ada segment, tail ditulis ke disk
+    setiap mencapai ukuran segment; head diisi ulang dari segment tertua.
+    """
+
+    def __init__(self, memory_limit: int, spill_dir: Optional[str] = None):
+        super().__init__(memory_limit, spill_dir)
+        self._head: Deque[FrontierEntry] = deque()
+        self._tail: List[FrontierEntry] = []
+        self._tail_bytes = 0
+        self._segments: Deque[Tuple[int, int, int, int]] = deque()
+
+    def push(self, url: str, depth: int, parent_url: Optional[str]) -> None:
+        entry = (url, depth, parent_url)
+        size = entry_size(entry)
+        self._tail.append(entry)
+        self._tail_bytes += size
+        self._track(size)
+        if self._segments:
+            if self._tail_bytes >= self.segment_bytes:
+                self._segments.append(self._write(self._tail))
+                self._tail = []
+                self._tail_bytes = 0
+        elif self._memory_bytes > self.memory_limit:
+            self._spill_back()
+
+    def _spill_back(self):
+        # Belum ada segment: bagian belakang antrian (akhir head + tail) boleh langsung ke disk
+        self._head.extend(self._tail)
+        self._tail = []
+        self._tail_bytes = 0
+        back: List[FrontierEntry] = []
+        remaining = self._memory_bytes
+        while len(self._head) > 1 and remaining > self.memory_limit // 2:
+            back.append(self._head.pop())
+            remaining -= entry_size(back[-1])
+        back.reverse()
+        for chunk in self._chunks(back):
+            self._segments.append(self._write(chunk))
+
+    def pop(self) -> FrontierEntry:
+        if not self._head:
+            if self._segments:
+                self._head = deque(self._read(self._segments.popleft()))
+                if not self._segments:
+                    self._spill.truncate(0)
+            else:
+                self._head = deque(self._tail)
+                self._tail = []
+                self._tail_bytes = 0
+        entry = self._head.popleft()
+        self._memory_bytes -= entry_size(entry)
+        return entry
+
+    def requeue(self, entries: List[FrontierEntry]) -> None:
+        self._head.extendleft(reversed(entries))
+        self._track(sum(map(entry_size, entries)))
+
+    def __len__(self) -> int:
+        return len(self._head) + self._spilled + len(self._tail)
+
+    def __iter__(self) -> Iterator[FrontierEntry]:
+        """Membaca semua segment dari disk; untuk ringkasan, bukan hot path"""
+        yield from list(self._head)
+        for segment in list(self._segments):
+            yield from self._spill.read(segment)
+        yield from list(self._tail)
+
+
+def create_frontier(strategy: str, memory_limit: int = 0, spill_dir: Optional[str] = None) -> IFrontier:
+    """
+    memory_limit > 0: dfs/bfs memakai frontier yang spill ke disk di atas budget (bytes).
+    best_first selalu di memori (heap tidak bisa di-spill per segment); limit diabaikan dengan warning.
+    """
+    if strategy == 'dfs':
+        return SpillingStackFrontier(memory_limit, spill_dir) if memory_limit > 0 else StackFrontier()
+    if strategy == 'bfs':
+        return SpillingQueueFrontier(memory_limit, spill_dir) if memory_limit > 0 else QueueFrontier()
+    if strategy == 'best_first':
+        if memory_limit > 0:
+            logger.warning("Frontier best_first tidak mendukung memory limit, frontier tetap di memori")
+        return BestFirstFrontier()
+    raise ValueError(f"Frontier strategy tidak dikenal: {strategy} (pilihan: {', '.join(FRONTIER_STRATEGIES)})")
@@ -0,0 +1,274 @@
+import logging
+import threading
+import time
+from typing import Dict, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.domain.entities import PageTiming, HttpResponse
+from app.domain.interfaces import IHttpClient
+from app.infrastructure.http_client import DEFAULT_HEADERS
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401  (dipakai httpx untuk HTTP/2)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class Http2HttpClient(IHttpClient):
+    """
+    HTTP client berbasis httpx yang me-multiplex fetch ke host yang sama
+    lewat satu koneksi HTTP/2. Crawl yang berjalan bersamaan (thread atau
+    greenlet) berbagi koneksi tersebut sebagai stream terpisah, sehingga
+    tidak perlu membuka banyak koneksi TCP+TLS per host.
+
+    Fallback ke HTTP/1.1:
+    - https: lewat ALPN jika server tidak menawarkan h2
+    - http: HTTP/1.1, kecuali `prior_knowledge=True` (h2c); host yang
+      menolak h2c diingat dan selanjutnya memakai HTTP/1.1
+    - paket h2 tidak terpasang: semua request memakai HTTP/1.1
+    """
+
+    def __init__(self, prior_knowledge: bool = False, max_connections: int = 100, parent: Optional['Http2HttpClient'] = None):
+        self.http2 = HTTP2_AVAILABLE
+        self.prior_knowledge = prior_knowledge and HTTP2_AVAILABLE
+        self.max_connections = max_connections
+        self._clients: Dict[Tuple[bool, bool], httpx.Client] = {}
+        self._lock = threading.Lock()
+        self._parent = parent
+        if parent is not None:
+            # Client scoped: transport (koneksi HTTP/2) dan pengetahuan per host milik parent
+            self._transports = parent._transports
+            self._http1_hosts = parent._http1_hosts
+            self._h2c_hosts = parent._h2c_hosts
+            self._transport_lock = parent._transport_lock
+            return
+        self._transports: Dict[Tuple[bool, bool], httpx.HTTPTransport] = {}
+        self._http1_hosts: Set[str] = set()
+        self._h2c_hosts: Set[str] = set()  # host yang sudah terbukti mendukung h2c
+        self._transport_lock = threading.Lock()
+
+        if not HTTP2_AVAILABLE:
+            logger.warning("Paket h2 tidak terpasang, Http2HttpClient memakai HTTP/1.1")
+
+    def scoped(self) -> 'Http2HttpClient':
+        """Cookie jar sendiri per crawl; koneksi (transport) tetap dipakai bersama"""
+        return Http2HttpClient(self.prior_knowledge, self.max_connections, parent=self._parent or self)
+
+    def _transport(self, verify_ssl: bool, h2c: bool) -> httpx.HTTPTransport:
+        key = (verify_ssl, h2c)
+        transport = self._transports.get(key)
+        if transport is None:
+            with self._transport_lock:
+                transport = self._transports.get(key)
+                if transport is None:
+                    transport = httpx.HTTPTransport(
+                        http1=not h2c,
+                        http2=self.http2,
+                        verify=verify_ssl,
+                        limits=httpx.Limits(max_connections=self.max_connections)
+                    )
+                    self._transports[key] = transport
+        return transport
+
+    def _client(self, verify_ssl: bool, h2c: bool) -> httpx.Client:
+        key = (verify_ssl, h2c)
+        client = self._clients.get(key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    client = httpx.Client(
+                        transport=self._transport(verify_ssl, h2c),
+                        headers={**DEFAULT_HEADERS, 'Accept-Encoding': 'gzip, deflate'}
+                    )
+                    self._clients[key] = client
+        return client
+
+    def _use_h2c(self, url: str) -> bool:
+        parts = urlsplit(url)
+        return self.prior_knowledge and parts.scheme == 'http' and parts.netloc not in self._http1_hosts
+
+    def get(
+        self,
+        url: str,
+        timeout: int,
+        headers: dict,
+        verify_ssl: bool = True,
+        retry_count: int = 1,
+        retry_delay: float = 1.0,
+        follow_redirects: bool = True,
+        timing: Optional[PageTiming] = None
+    ) -> Optional[HttpResponse]:
+        """
+        HTTP GET lewat koneksi HTTP/2 bersama (atau HTTP/1.1 sebagai fallback).
+
+        Argumen sama dengan RequestsHttpClient.get. Dengan timing, DNS
+        dihitung sebagai bagian dari connect (httpx tidak memisahkannya).
+        """
+        last_response = None
+        attempt = 0
+
+        while attempt < retry_count:
+            h2c = self._use_h2c(url)
+            if timing is not None:
+                timing.retries = attempt
+            request_start = time.perf_counter()
+
+            try:
+                response, text = self._fetch(url, timeout, headers, verify_ssl, follow_redirects, h2c, timing)
+
+            except (httpx.RemoteProtocolError, httpx.ReadError, httpx.WriteError) as e:
+                host = urlsplit(url).netloc
+                if h2c and host not in self._h2c_hosts:
+                    # Server tidak bicara h2c: ingat host ini dan ulangi dengan HTTP/1.1
+                    logger.info(f"h2c ditolak oleh {host}, fallback ke HTTP/1.1")
+                    self._http1_hosts.add(host)
+                    continue
+                logger.warning(f"Protocol error untuk {url}: {e}")
+                if attempt < retry_count - 1:
+                    self._sleep(retry_delay, timing)
+                    attempt += 1
+                    continue
+                return None
+
+            except httpx.TimeoutException:
+                logger.warning(f"Timeout saat mengakses: {url} (attempt {attempt + 1}/{retry_count})")
+                if attempt < retry_count - 1:
+                    self._sleep(retry_delay, timing)
+                    attempt += 1
+                    continue
+                return None
+
+            except httpx.TooManyRedirects:
+                logger.warning(f"Too many redirects untuk: {url}")
+                return None
+
+            except httpx.ConnectError as e:
+                if verify_ssl and 'CERTIFICATE_VERIFY_FAILED' in str(e) and attempt < retry_count - 1:
+                    logger.info(f"Retrying {url} tanpa SSL verification...")
+                    verify_ssl = False
+                else:
+                    logger.error(f"Connection error saat mengakses: {url}")
+                if attempt < retry_count - 1:
+                    self._sleep(retry_delay, timing)
+                    attempt += 1
+                    continue
+                return None
+
+            except httpx.HTTPError as e:
+                logger.error(f"Request error untuk {url}: {e}")
+                if attempt < retry_count - 1:
+                    self._sleep(retry_delay, timing)
+                    attempt += 1
+                    continue
+                return None
+
+            if h2c:
+                self._h2c_hosts.add(urlsplit(url).netloc)
+            last_response = response
+            elapsed = time.perf_counter() - request_start
+            status = response.status_code
+
+            if status == 200:
+                content_type = response.headers.get('Content-Type', '').lower()
+                if 'text/html' not in content_type:
+                    logger.info(f"Skipping non-HTML content type {content_type} for: {url}")
+                    return self._to_response(url, response, None, attempt + 1, elapsed)
+                return self._to_response(url, response, text, attempt + 1, elapsed)
+
+            if status in (403, 429) or status >= 500:
+                wait_time = retry_delay * (attempt + 2) if status == 429 else retry_delay
+                logger.warning(f"Status {status} untuk {url} (attempt {attempt + 1}/{retry_count})")
+                if attempt < retry_count - 1:
+                    self._sleep(wait_time, timing)
+                    attempt += 1
+                    continue
+                break
+
+            if status in (301, 302, 307, 308):
+                logger.info(f"Redirect {status} untuk {url}")
+            else:
+                logger.warning(f"Status code {status} saat mengakses: {url}")
+            return self._to_response(url, response, None, attempt + 1, elapsed)
+
+        if last_response is not None:
+            return self._to_response(url, last_response, None, attempt + 1, elapsed)
+        return None
+
+    def _fetch(
+        self,
+        url: str,
+        timeout: int,
+        headers: dict,
+        verify_ssl: bool,
+        follow_redirects: bool,
+        h2c: bool,
+        timing: Optional[PageTiming]
+    ) -> Tuple[httpx.Response, str]:
+        client = self._client(verify_ssl, h2c)
+
+        if timing is None:
+            response = client.get(url, headers=headers, timeout=timeout, follow_redirects=follow_redirects)
+            return response, response.text
+
+        # Trace httpcore: waktu TCP connect + TLS handshake untuk koneksi baru
+        started: Dict[str, float] = {}
+        connect_time = 0.0
+
+        def trace(event_name: str, info: dict):
+            nonlocal connect_time
+            stage, _, state = event_name.rpartition('.')
+            if stage in ('connection.connect_tcp', 'connection.start_tls'):
+                if state == 'started':
+                    started[stage] = time.perf_counter()
+                elif state in ('complete', 'failed') and stage in started:
+                    connect_time += time.perf_counter() - started.pop(stage)
+
+        request_start = time.perf_counter()
+        with client.stream(
+            'GET', url, headers=headers, timeout=timeout,
+            follow_redirects=follow_redirects, extensions={'trace': trace}
+        ) as response:
+            headers_at = time.perf_counter()
+            body = response.read()
+            timing.download += time.perf_counter() - headers_at
+
+        timing.connect += connect_time
+        timing.ttfb += (headers_at - request_start) - connect_time
+        timing.bytes += len(body)
+        return response, response.text
+
+    def _sleep(self, seconds: float, timing: Optional[PageTiming]):
+        time.sleep(seconds)
+        if timing is not None:
+            timing.retry_sleep += seconds
+
+    @staticmethod
+    def _to_response(url: str, response: httpx.Response, text: Optional[str], attempts: int, elapsed: float) -> HttpResponse:
+        return HttpResponse(
+            url=url,
+            final_url=str(response.url),
+            status_code=response.status_code,
+            headers=dict(response.headers),
+            text=text,
+            redirect_chain=[str(hop.url) for hop in response.history],
+            http_version=response.http_version,
+            attempts=attempts,
+            elapsed=elapsed
+        )
+
+    def close(self):
+        # Client scoped tidak menutup transport bersama (client.close() akan menutupnya)
+        with self._lock:
+            self._clients.clear()
+        if self._parent is not None:
+            return
+        with self._transport_lock:
+            for transport in self._transports.values():
+                transport.close()
+            self._transports.clear()
@@ -1,8 +1,15 @@
 import requests
 import logging
+import socket
+import threading
 import time
 import urllib3
 from typing import Optional
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NewConnectionError, ConnectTimeoutError
+from app.domain.entities import PageTiming, HttpResponse
 from app.domain.interfaces import IHttpClient
 
 # Disable SSL warnings ketika verify=False
@@ -10,26 +17,133 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 logger = logging.getLogger(__name__)
 
+# PageTiming milik request yang sedang berjalan di thread/greenlet ini
+_active = threading.local()
+
+
+# Header browser default untuk bypass blocking
+DEFAULT_HEADERS = {
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9,id;q=0.8',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Cache-Control': 'no-cache',
+    'Pragma': 'no-cache',
+    'Sec-Ch-Ua': '"Not_A Brand";v="8", "Chromium";v="120", "Google Chrome";v="120"',
+    'Sec-Ch-Ua-Mobile': '?0',
+    'Sec-Ch-Ua-Platform': '"Windows"',
+    'Sec-Fetch-Dest': 'document',
+    'Sec-Fetch-Mode': 'navigate',
+    'Sec-Fetch-Site': 'none',
+    'Sec-Fetch-User': '?1',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+
+class TimedConnectionMixin:
+    """Mengukur DNS dan TCP connect saat koneksi baru dibuat (hanya jika timing aktif)"""
+    
+    def _new_conn(self):
+        timing: Optional[PageTiming] = getattr(_active, 'timing', None)
+        if timing is None:
+            return super()._new_conn()
+        
+        start = time.perf_counter()
+        try:
+            addresses = socket.getaddrinfo(self._dns_host, self.port, 0, socket.SOCK_STREAM)
+        except socket.gaierror:
+            # Biarkan urllib3 yang melempar NameResolutionError
+            return super()._new_conn()
+        resolved = time.perf_counter()
+        timing.dns += resolved - start
+        
+        # Connect ke alamat yang sudah di-resolve agar DNS tidak dihitung dua kali
+        dns_host = self._dns_host
+        last_error = None
+        try:
+            for address in addresses:
+                self._dns_host = address[4][0]
+                try:
+                    return super()._new_conn()
+                except (NewConnectionError, ConnectTimeoutError) as e:
+                    last_error = e
+            raise last_error
+        finally:
+            self._dns_host = dns_host
+            timing.connect += time.perf_counter() - resolved
+
+
+class TimedHTTPConnection(TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': TimedHTTPConnectionPool,
+            'https': TimedHTTPSConnectionPool,
+        }
+
+
+class _SharedPools:
+    """
+    Adapter (connection pool urllib3) yang dipakai bersama semua session.
+    PoolManager urllib3 thread-safe; yang tidak boleh dipakai bersama
+    antar crawl adalah state Session (cookie jar).
+    """
+    
+    def __init__(self, pool_maxsize: int):
+        self.pool_maxsize = pool_maxsize
+        self._adapters: Optional[dict] = None
+        self._lock = threading.Lock()
+    
+    def adapters(self) -> dict:
+        if self._adapters is None:
+            with self._lock:
+                if self._adapters is None:
+                    self._adapters = {
+                        'http://': TimedHTTPAdapter(pool_maxsize=self.pool_maxsize),
+                        'https://': TimedHTTPAdapter(pool_maxsize=self.pool_maxsize),
+                    }
+        return self._adapters
+
 
 class RequestsHttpClient(IHttpClient):
-    def __init__(self):
-        self.session = requests.Session()
-        # Set default headers yang lebih lengkap untuk bypass blocking
-        self.session.headers.update({
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9,id;q=0.8',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Cache-Control': 'no-cache',
-            'Pragma': 'no-cache',
-            'Sec-Ch-Ua': '"Not_A Brand";v="8", "Chromium";v="120", "Google Chrome";v="120"',
-            'Sec-Ch-Ua-Mobile': '?0',
-            'Sec-Ch-Ua-Platform': '"Windows"',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'none',
-            'Sec-Fetch-User': '?1',
-            'Upgrade-Insecure-Requests': '1',
-        })
+    def __init__(self, pool_maxsize: int = 10, pools: Optional[_SharedPools] = None):
+        # Session (dan connection pool) baru dibuat saat request pertama
+        self.pool_maxsize = pool_maxsize
+        self._pools = pools or _SharedPools(pool_maxsize)
+        self._session: Optional[requests.Session] = None
+        self._session_lock = threading.Lock()
+    
+    @property
+    def session(self) -> requests.Session:
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    session = requests.Session()
+                    for prefix, adapter in self._pools.adapters().items():
+                        session.mount(prefix, adapter)
+                    # Set default headers yang lebih lengkap untuk bypass blocking
+                    session.headers.update(DEFAULT_HEADERS)
+                    self._session = session
+        return self._session
+    
+    def scoped(self) -> 'RequestsHttpClient':
+        """Session (cookie jar) sendiri per crawl, connection pool dipakai bersama"""
+        return RequestsHttpClient(self.pool_maxsize, pools=self._pools)
     
     def get(
         self, 
@@ -39,8 +153,9 @@ class RequestsHttpClient(IHttpClient):
         verify_ssl: bool = True,
         retry_count: int = 1,
         retry_delay: float = 1.0,
-        follow_redirects: bool = True
-    ) -> Optional[str]:
+        follow_redirects: bool = True,
+        timing: Optional[PageTiming] = None
+    ) -> Optional[HttpResponse]:
         """
         Melakukan HTTP GET request dengan opsi bypass yang lebih lengkap.
         
@@ -52,32 +167,79 @@ class RequestsHttpClient(IHttpClient):
             retry_count: Jumlah percobaan ulang
             retry_delay: Delay antara retry
             follow_redirects: Apakah follow redirect
+            timing: Jika diberikan, diisi dengan DNS/connect/TTFB/download
+        
+        Returns:
+            HttpResponse dengan URL akhir dan redirect chain, atau None jika
+            tidak ada response (timeout, connection error, dsb.)
         """
+        if timing is None:
+            return self._get(url, timeout, headers, verify_ssl, retry_count, retry_delay, follow_redirects, None)
+        
+        _active.timing = timing
+        try:
+            return self._get(url, timeout, headers, verify_ssl, retry_count, retry_delay, follow_redirects, timing)
+        finally:
+            _active.timing = None
+    
+    def _sleep(self, seconds: float, timing: Optional[PageTiming]):
+        time.sleep(seconds)
+        if timing is not None:
+            timing.retry_sleep += seconds
+    
+    def _get(
+        self,
+        url: str,
+        timeout: int,
+        headers: dict,
+        verify_ssl: bool,
+        retry_count: int,
+        retry_delay: float,
+        follow_redirects: bool,
+        timing: Optional[PageTiming]
+    ) -> Optional[HttpResponse]:
         merged_headers = {**self.session.headers, **headers}
+        last_response = None
         
         for attempt in range(retry_count):
+            request_start = time.perf_counter()
+            if timing is not None:
+                timing.retries = attempt
+                connect_before = timing.dns + timing.connect
+            
             try:
                 response = self.session.get(
                     url, 
                     timeout=timeout, 
                     headers=merged_headers,
                     verify=verify_ssl,
-                    allow_redirects=follow_redirects
+                    allow_redirects=follow_redirects,
+                    stream=timing is not None
                 )
                 
+                # Dengan stream=True body dibaca di sini, supaya TTFB dan download terukur terpisah
+                if timing is not None:
+                    headers_at = time.perf_counter()
+                    timing.ttfb += (headers_at - request_start) - (timing.dns + timing.connect - connect_before)
+                    timing.bytes += len(response.content)
+                    timing.download += time.perf_counter() - headers_at
+                
+                last_response = response
+                elapsed = time.perf_counter() - request_start
+                
                 # Handle berbagai status code
                 if response.status_code == 200:
                     content_type = response.headers.get('Content-Type', '').lower()
                     if 'text/html' not in content_type:
                         logger.info(f"Skipping non-HTML content type {content_type} for: {url}")
-                        return None
-                    return response.text
+                        return self._to_response(url, response, None, attempt + 1, elapsed)
+                    return self._to_response(url, response, response.text, attempt + 1, elapsed)
                 
                 elif response.status_code == 403:
                     logger.warning(f"403 Forbidden untuk {url}, mencoba dengan headers berbeda...")
                     # Coba dengan headers yang berbeda
                     if attempt < retry_count - 1:
-                        time.sleep(retry_delay)
+                        self._sleep(retry_delay, timing)
                         continue
                 
                 elif response.status_code == 429:
@@ -85,24 +247,24 @@ class RequestsHttpClient(IHttpClient):
                     wait_time = retry_delay * (attempt + 2)
                     logger.warning(f"429 Rate Limited untuk {url}, menunggu {wait_time}s...")
                     if attempt < retry_count - 1:
-                        time.sleep(wait_time)
+                        self._sleep(wait_time, timing)
                         continue
                 
                 elif response.status_code in [301, 302, 307, 308]:
                     # Redirect yang tidak di-follow
                     logger.info(f"Redirect {response.status_code} untuk {url}")
-                    return None
+                    return self._to_response(url, response, None, attempt + 1, elapsed)
                 
                 elif response.status_code >= 500:
                     # Server error, coba lagi
                     logger.warning(f"Server error {response.status_code} untuk {url}")
                     if attempt < retry_count - 1:
-                        time.sleep(retry_delay)
+                        self._sleep(retry_delay, timing)
                         continue
                 
                 else:
                     logger.warning(f"Status code {response.status_code} saat mengakses: {url}")
-                    return None
+                    return self._to_response(url, response, None, attempt + 1, elapsed)
             
             except requests.exceptions.SSLError as e:
                 logger.warning(f"SSL Error untuk {url}: {e}")
@@ -110,21 +272,21 @@ class RequestsHttpClient(IHttpClient):
                     # Coba tanpa SSL verification pada retry berikutnya
                     logger.info(f"Retrying {url} tanpa SSL verification...")
                     verify_ssl = False
-                    time.sleep(retry_delay)
+                    self._sleep(retry_delay, timing)
                     continue
                 return None
             
             except requests.exceptions.Timeout:
                 logger.warning(f"Timeout saat mengakses: {url} (attempt {attempt + 1}/{retry_count})")
                 if attempt < retry_count - 1:
-                    time.sleep(retry_delay)
+                    self._sleep(retry_delay, timing)
                     continue
                 return None
             
             except requests.exceptions.ConnectionError as e:
                 logger.error(f"Connection error saat mengakses: {url}")
                 if attempt < retry_count - 1:
-                    time.sleep(retry_delay)
+                    self._sleep(retry_delay, timing)
                     continue
                 return None
             
@@ -135,7 +297,7 @@ class RequestsHttpClient(IHttpClient):
             except requests.exceptions.RequestException as e:
                 logger.error(f"Request error untuk {url}: {e}")
                 if attempt < retry_count - 1:
-                    time.sleep(retry_delay)
+                    self._sleep(retry_delay, timing)
                     continue
                 return None
             
@@ -143,4 +305,21 @@ class RequestsHttpClient(IHttpClient):
                 logger.exception(f"Unexpected error untuk {url}: {e}")
                 return None
         
+        # Retry habis (403/429/5xx): kembalikan status terakhir tanpa body
+        if last_response is not None:
+            return self._to_response(url, last_response, None, attempt + 1, elapsed)
         return None
+    
+    @staticmethod
+    def _to_response(url: str, response: requests.Response, text: Optional[str], attempts: int, elapsed: float) -> HttpResponse:
+        return HttpResponse(
+            url=url,
+            final_url=response.url,
+            status_code=response.status_code,
+            headers=dict(response.headers),
+            text=text,
+            redirect_chain=[hop.url for hop in response.history],
+            http_version='HTTP/1.1',
+            attempts=attempts,
+            elapsed=elapsed
+        )
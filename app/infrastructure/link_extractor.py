@@ -1,24 +1,84 @@
 import logging
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
-from typing import List
+from typing import List, Sequence
+from app.domain.entities import ExtractedPage
 from app.domain.interfaces import ILinkExtractor
 
 logger = logging.getLogger(__name__)
 
+# Metadata yang dibaca dari tag <title>/<meta>, di traversal yang sama dengan <a>/<link>
+_TAG_FIELDS = frozenset({'title', 'description', 'robots', 'lang'})
+
+
 class BeautifulSoupLinkExtractor(ILinkExtractor):
     def extract_links(self, html: str, current_url: str) -> List[str]:
-        links = []
-        
+        return self.extract_page(html, current_url).links
+
+    def extract_page(self, html: str, current_url: str, metadata: Sequence[str] = ()) -> ExtractedPage:
+        page = ExtractedPage()
+        found = {}
+
         try:
             soup = BeautifulSoup(html, 'html.parser')
-            
-            for link in soup.find_all('a', href=True):
-                href = link['href']
-                absolute_url = urljoin(current_url, href)
-                links.append(absolute_url)
-        
+
+            # Satu traversal untuk <a href> dan <link rel=canonical> (plus <title>/<meta> jika diminta)
+            if _TAG_FIELDS.intersection(metadata):
+                tags = soup.find_all(['a', 'link', 'meta', 'title'])
+            else:
+                tags = soup.find_all(['a', 'link'], href=True)
+            for tag in tags:
+                name = tag.name
+                if name == 'a':
+                    href = tag.get('href')
+                    if href is not None:
+                        page.links.append(urljoin(current_url, href))
+                elif name == 'link':
+                    if page.canonical is None and tag.get('href') and 'canonical' in (tag.get('rel') or []):
+                        page.canonical = urljoin(current_url, tag['href'])
+                elif name == 'meta':
+                    self._read_meta(tag, found)
+                elif 'title' not in found:
+                    found['title'] = ' '.join(tag.get_text().split())
+
+            if metadata:
+                page.metadata = self._metadata(soup, page, found, metadata)
+
         except Exception as e:
             logger.error(f"Error saat extract links dari {current_url}: {e}")
-        
-        return links
+
+        return page
+
+    @staticmethod
+    def _read_meta(tag, found: dict):
+        content = tag.get('content')
+        if content is None:
+            return
+        name = (tag.get('name') or '').lower()
+        if name in ('description', 'robots') and name not in found:
+            found[name] = content
+        elif (tag.get('http-equiv') or '').lower() == 'content-language':
+            found.setdefault('content_language', content)
+
+    @staticmethod
+    def _metadata(soup: BeautifulSoup, page: ExtractedPage, found: dict, fields: Sequence[str]) -> dict:
+        metadata = {}
+        for field in fields:
+            if field == 'title':
+                metadata['title'] = found.get('title')
+            elif field == 'description':
+                description = found.get('description')
+                metadata['description'] = ' '.join(description.split()) if description is not None else None
+            elif field == 'canonical':
+                metadata['canonical'] = page.canonical
+            elif field == 'robots':
+                robots = found.get('robots')
+                metadata['robots'] = [d.strip().lower() for d in robots.split(',') if d.strip()] if robots is not None else None
+            elif field == 'lang':
+                root = soup.html
+                lang = (root.get('lang') if root is not None else None) or found.get('content_language')
+                metadata['lang'] = lang.strip() if lang else None
+            elif field == 'word_count':
+                # get_text melewati isi <script>/<style>/<template> dan komentar
+                metadata['word_count'] = len((soup.body or soup).get_text(' ').split())
+        return metadata
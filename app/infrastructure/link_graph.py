@@ -0,0 +1,233 @@
+import importlib.util
+from array import array
+from typing import Any, Dict, List, Optional
+
+# NumPy opsional (pip install -r requirements-graph.txt); di-import saat graph dibangun,
+# supaya tidak menambah cold start crawl biasa
+NUMPY_AVAILABLE = importlib.util.find_spec('numpy') is not None
+
+
+def _capped(routes: List[str], sample: int) -> Dict[str, Any]:
+    # Situs besar bisa punya ribuan orphan; result cukup jumlah + contoh
+    return {'count': len(routes), 'sample': routes[:sample]}
+
+
+class LinkGraphBuilder:
+    """
+    Mengumpulkan semua edge intra-site selama crawl.
+
+    Route di-intern menjadi ID int32; edge disimpan di dua array('i')
+    (src, dst), bukan dict string, sehingga satu edge = 8 bytes. Alias
+    (redirect/canonical) di-resolve ke route tujuannya saat build().
+    """
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self.routes: List[str] = []
+        self._src = array('i')
+        self._dst = array('i')
+        self._fetched = array('b')
+        self._aliases: Dict[int, int] = {}
+
+    def node(self, route: str) -> int:
+        node_id = self._ids.get(route)
+        if node_id is None:
+            node_id = self._ids[route] = len(self.routes)
+            self.routes.append(route)
+            self._fetched.append(0)
+        return node_id
+
+    def add_edge(self, src: int, dst_route: str) -> None:
+        self._src.append(src)
+        self._dst.append(self.node(dst_route))
+
+    def mark_fetched(self, route: str) -> int:
+        node_id = self.node(route)
+        self._fetched[node_id] = 1
+        return node_id
+
+    def add_alias(self, alias_route: str, target_route: str) -> None:
+        self._aliases[self.node(alias_route)] = self.node(target_route)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self._src)
+
+    def build(self, root_route: Optional[str] = None) -> 'LinkGraph':
+        """Bangun LinkGraph (CSR) dari edge yang terkumpul. Butuh NumPy."""
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("Link graph butuh NumPy: pip install -r requirements-graph.txt")
+        import numpy as np
+
+        n = len(self.routes)
+        src = np.frombuffer(self._src, dtype=np.int32) if len(self._src) else np.empty(0, dtype=np.int32)
+        dst = np.frombuffer(self._dst, dtype=np.int32) if len(self._dst) else np.empty(0, dtype=np.int32)
+
+        # Alias -> route tujuan (redirect/canonical), termasuk rantai alias
+        resolve = np.arange(n, dtype=np.int32)
+        for alias, target in self._aliases.items():
+            seen = {alias}
+            while target in self._aliases and target not in seen:
+                seen.add(target)
+                target = self._aliases[target]
+            resolve[alias] = target
+        src, dst = resolve[src], resolve[dst]
+
+        # Dedup edge dan buang self-loop, lalu urutkan per src untuk CSR
+        keep = src != dst
+        keys = src[keep].astype(np.int64) * n + dst[keep]
+        keys.sort()
+        if keys.size:
+            keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+        src = (keys // n).astype(np.int32)
+        dst = (keys % n).astype(np.int32)
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+
+        alias_mask = np.zeros(n, dtype=bool)
+        if self._aliases:
+            alias_mask[list(self._aliases)] = True
+        fetched = np.frombuffer(self._fetched, dtype=np.int8).astype(bool) if n else np.zeros(0, dtype=bool)
+        root = self._ids.get(root_route) if root_route is not None else (0 if n else None)
+        if root is not None:
+            root = int(resolve[root])
+        return LinkGraph(self.routes, indptr, dst, fetched, alias_mask, root)
+
+
+class LinkGraph:
+    """
+    Graph link dalam format CSR: edge dari node i adalah
+    indices[indptr[i]:indptr[i + 1]]. Semua analytics di-vectorize dengan NumPy.
+    """
+
+    def __init__(self, routes: List[str], indptr, indices, fetched, aliases, root: Optional[int]):
+        import numpy as np
+        self._np = np
+        self.routes = routes
+        self.indptr = indptr
+        self.indices = indices
+        self.fetched = fetched
+        self.aliases = aliases
+        self.root = root
+        self._rank = None
+        self._depth = None
+
+    @property
+    def node_count(self) -> int:
+        return len(self.routes)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.indices)
+
+    def out_degree(self):
+        return self._np.diff(self.indptr)
+
+    def in_degree(self):
+        return self._np.bincount(self.indices, minlength=self.node_count)
+
+    def _neighbors(self, nodes):
+        """Semua tetangga dari sekumpulan node sekaligus (gather range CSR tanpa loop Python)"""
+        np = self._np
+        starts = self.indptr[nodes]
+        counts = self.indptr[nodes + 1] - starts
+        total = int(counts.sum())
+        if not total:
+            return np.empty(0, dtype=self.indices.dtype)
+        offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+        return self.indices[offsets + np.arange(total)]
+
+    def click_depth(self):
+        """Jarak klik terpendek dari root (BFS per level), -1 jika tidak terjangkau"""
+        if self._depth is not None:
+            return self._depth
+        np = self._np
+        depth = np.full(self.node_count, -1, dtype=np.int32)
+        if self.root is not None:
+            frontier = np.array([self.root], dtype=np.int64)
+            depth[self.root] = 0
+            level = 0
+            while frontier.size:
+                level += 1
+                neighbors = self._neighbors(frontier)
+                neighbors = np.unique(neighbors[depth[neighbors] < 0])
+                depth[neighbors] = level
+                frontier = neighbors.astype(np.int64)
+        self._depth = depth
+        return depth
+
+    def pagerank(self, damping: float = 0.85, tol: float = 1e-6, max_iter: int = 100):
+        """PageRank power iteration; massa dari node tanpa out-link dibagi rata"""
+        if self._rank is not None:
+            return self._rank
+        np = self._np
+        n = self.node_count
+        if not n:
+            self._rank = np.empty(0)
+            return self._rank
+        out_degree = self.out_degree()
+        sources = np.repeat(np.arange(n), out_degree)
+        dangling = out_degree == 0
+        inv_out = np.zeros(n)
+        inv_out[~dangling] = 1.0 / out_degree[~dangling]
+
+        rank = np.full(n, 1.0 / n)
+        for _ in range(max_iter):
+            spread = np.bincount(self.indices, weights=(rank * inv_out)[sources], minlength=n)
+            new_rank = (1.0 - damping) / n + damping * (spread + rank[dangling].sum() / n)
+            converged = np.abs(new_rank - rank).sum() < tol
+            rank = new_rank
+            if converged:
+                break
+        self._rank = rank
+        return rank
+
+    def _real_nodes(self):
+        return ~self.aliases
+
+    def unreachable(self) -> List[str]:
+        """Route yang dikenal (bukan alias) tetapi tidak terjangkau dari root lewat link"""
+        np = self._np
+        mask = (self.click_depth() < 0) & self._real_nodes()
+        return [self.routes[i] for i in np.flatnonzero(mask)]
+
+    def orphans(self) -> List[str]:
+        """Halaman yang di-fetch tetapi tidak di-link dari halaman lain (selain root)"""
+        np = self._np
+        mask = (self.in_degree() == 0) & self.fetched & self._real_nodes()
+        if self.root is not None:
+            mask[self.root] = False
+        return [self.routes[i] for i in np.flatnonzero(mask)]
+
+    def top(self, scores, limit: int) -> List[Dict[str, Any]]:
+        np = self._np
+        real = np.flatnonzero(self._real_nodes())
+        order = real[np.argsort(-scores[real], kind='stable')[:limit]]
+        return [{'route': self.routes[i], 'score': round(float(scores[i]), 6)} for i in order]
+
+    def summary(self, limit: int = 10, sample: int = 50) -> Dict[str, Any]:
+        """Ringkasan untuk result; orphan/unreachable hanya jumlah + contoh (list lengkap lewat orphans()/unreachable())"""
+        np = self._np
+        depth = self.click_depth()
+        in_degree = self.in_degree()
+        out_degree = self.out_degree()
+        real = self._real_nodes()
+        reachable = depth[(depth >= 0) & real]
+        return {
+            'nodes': int(real.sum()),
+            'edges': self.edge_count,
+            'fetched': int((self.fetched & real).sum()),
+            'max_click_depth': int(reachable.max()) if reachable.size else 0,
+            'click_depth_histogram': {
+                str(level): int(count) for level, count in enumerate(np.bincount(reachable)) if count
+            },
+            'mean_in_degree': round(float(in_degree[real].mean()), 3) if real.any() else 0.0,
+            'mean_out_degree': round(float(out_degree[self.fetched].mean()), 3) if self.fetched.any() else 0.0,
+            'top_in_degree': [
+                {'route': item['route'], 'in_degree': int(item['score'])}
+                for item in self.top(in_degree.astype(float), limit)
+            ],
+            'top_pagerank': self.top(self.pagerank(), limit),
+            'orphans': _capped(self.orphans(), sample),
+            'unreachable': _capped(self.unreachable(), sample),
+        }
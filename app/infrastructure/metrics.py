@@ -0,0 +1,95 @@
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Sequence
+from app.domain.entities import PageTiming
+from app.domain.interfaces import IMetricsSink
+
+
+# Bucket (detik) untuk stage timing, dari sub-ms sampai timeout default
+SECONDS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BYTES_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+TIMING_STAGES = ('dns', 'connect', 'ttfb', 'download', 'fetch', 'parse', 'normalize', 'sleep', 'retry_sleep')
+
+
+class Histogram:
+    """Histogram kumulatif sederhana dengan format Prometheus"""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts: List[int] = [0] * (len(self.buckets) + 1)  # slot terakhir = +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str, labels: str = '') -> List[str]:
+        lines = []
+        cumulative = 0
+        sep = ',' if labels else ''
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels}{sep}le="{bound}"}} {cumulative}')
+        cumulative += self.counts[-1]
+        lines.append(f'{name}_bucket{{{labels}{sep}le="+Inf"}} {cumulative}')
+        suffix = f'{{{labels}}}' if labels else ''
+        lines.append(f'{name}_sum{suffix} {self.sum}')
+        lines.append(f'{name}_count{suffix} {self.count}')
+        return lines
+
+
+class CrawlMetrics(IMetricsSink):
+    """Agregasi PageTiming dari semua crawl, di-expose di /metrics"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stage_seconds: Dict[str, Histogram] = {stage: Histogram(SECONDS_BUCKETS) for stage in TIMING_STAGES}
+        self.page_bytes = Histogram(BYTES_BUCKETS)
+        self.pages_total = {'true': 0, 'false': 0}
+        self.retries_total = 0
+
+    def observe_page(self, timing: PageTiming, is_valid: bool) -> None:
+        values = {
+            'dns': timing.dns,
+            'connect': timing.connect,
+            'ttfb': timing.ttfb,
+            'download': timing.download,
+            'fetch': timing.fetch,
+            'parse': timing.parse,
+            'normalize': timing.normalize,
+            'sleep': timing.sleep,
+            'retry_sleep': timing.retry_sleep,
+        }
+        with self._lock:
+            for stage, value in values.items():
+                self.stage_seconds[stage].observe(value)
+            self.page_bytes.observe(timing.bytes)
+            self.pages_total['true' if is_valid else 'false'] += 1
+            self.retries_total += timing.retries
+
+    def render_prometheus(self) -> str:
+        with self._lock:
+            lines = [
+                '# HELP crawler_stage_seconds Waktu per stage untuk setiap page yang di-crawl',
+                '# TYPE crawler_stage_seconds histogram',
+            ]
+            for stage, histogram in self.stage_seconds.items():
+                lines.extend(histogram.render('crawler_stage_seconds', f'stage="{stage}"'))
+
+            lines.append('# HELP crawler_page_bytes Ukuran body response per page')
+            lines.append('# TYPE crawler_page_bytes histogram')
+            lines.extend(self.page_bytes.render('crawler_page_bytes'))
+
+            lines.append('# HELP crawler_pages_total Jumlah page yang di-crawl')
+            lines.append('# TYPE crawler_pages_total counter')
+            for valid, count in self.pages_total.items():
+                lines.append(f'crawler_pages_total{{valid="{valid}"}} {count}')
+
+            lines.append('# HELP crawler_retries_total Jumlah retry HTTP')
+            lines.append('# TYPE crawler_retries_total counter')
+            lines.append(f'crawler_retries_total {self.retries_total}')
+
+        return '\n'.join(lines) + '\n'
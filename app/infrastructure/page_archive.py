@@ -0,0 +1,266 @@
+import glob
+import logging
+import mmap
+import os
+import queue
+import threading
+import uuid
+import zlib
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from http import HTTPStatus
+from typing import Dict, Iterator, List, Optional, Tuple
+from app.domain.entities import HttpResponse
+from app.domain.interfaces import IPageSink
+
+logger = logging.getLogger(__name__)
+
+# Header yang tidak lagi sesuai karena body disimpan sebagai teks yang sudah di-decode
+_DROPPED_HEADERS = frozenset({'content-encoding', 'transfer-encoding', 'content-length'})
+_STOP = object()
+
+
+def index_path(archive_path: str) -> str:
+    return archive_path + '.idx'
+
+
+def encode_record(response: HttpResponse, date: Optional[datetime] = None) -> bytes:
+    """Satu record WARC/1.1 'response' sebagai member gzip tersendiri (seperti .warc.gz)"""
+    body = response.text.encode('utf-8') if response.text is not None else b''
+    try:
+        reason = HTTPStatus(response.status_code).phrase
+    except ValueError:
+        reason = ''
+    http_lines = [f'HTTP/1.1 {response.status_code} {reason}']
+    http_lines += [f'{name}: {value}' for name, value in response.headers.items() if name.lower() not in _DROPPED_HEADERS]
+    http_lines.append(f'Content-Length: {len(body)}')
+    http_block = ('\r\n'.join(http_lines) + '\r\n\r\n').encode('utf-8') + body
+
+    date = date or datetime.now(timezone.utc)
+    warc_header = (
+        'WARC/1.1\r\n'
+        'WARC-Type: response\r\n'
+        f'WARC-Target-URI: {response.final_url or response.url}\r\n'
+        f'WARC-Date: {date.strftime("%Y-%m-%dT%H:%M:%SZ")}\r\n'
+        f'WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>\r\n'
+        'Content-Type: application/http;msgtype=response\r\n'
+        f'Content-Length: {len(http_block)}\r\n'
+        '\r\n'
+    ).encode('utf-8')
+
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    return compressor.compress(warc_header + http_block + b'\r\n\r\n') + compressor.flush()
+
+
+@dataclass
+class ArchivedPage:
+    url: str
+    status_code: int
+    headers: Dict[str, str] = field(default_factory=dict)
+    body: str = ''
+    date: str = ''
+
+
+def decode_record(data: bytes) -> ArchivedPage:
+    raw = zlib.decompress(data, 31)
+    warc_header, _, rest = raw.partition(b'\r\n\r\n')
+    warc = _parse_headers(warc_header.decode('utf-8').split('\r\n')[1:])
+    http_header, _, body = rest.partition(b'\r\n\r\n')
+    http_lines = http_header.decode('utf-8').split('\r\n')
+    headers = _parse_headers(http_lines[1:])
+    length = int(headers.get('Content-Length', len(body)))
+    return ArchivedPage(
+        url=warc.get('WARC-Target-URI', ''),
+        status_code=int(http_lines[0].split(' ', 2)[1]),
+        headers=headers,
+        body=body[:length].decode('utf-8'),
+        date=warc.get('WARC-Date', '')
+    )
+
+
+def _parse_headers(lines) -> Dict[str, str]:
+    headers = {}
+    for line in lines:
+        name, sep, value = line.partition(':')
+        if sep:
+            headers[name.strip()] = value.strip()
+    return headers
+
+
+class WarcArchiveWriter(IPageSink):
+    """
+    Page sink yang menulis response ke archive .warc.gz append-only.
+
+    Kompresi dan I/O dijalankan di satu thread background: crawler hanya
+    memasukkan response ke queue (bounded, jadi disk yang lambat memberi
+    back-pressure alih-alih memori tak terbatas). Setiap record dicatat di
+    index `<archive>.idx` (offset, panjang, status, URL) setelah record-nya
+    di-flush, sehingga index tidak pernah menunjuk ke record yang belum lengkap.
+    Aman dipakai beberapa crawl sekaligus.
+    """
+
+    def __init__(self, path: str, max_queue: int = 1024):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._archive = open(path, 'ab')
+        self._index = open(index_path(path), 'a', encoding='utf-8')
+        self._queue: 'queue.Queue' = queue.Queue(maxsize=max_queue)
+        self.records = 0
+        self._thread = threading.Thread(target=self._run, name='warc-writer', daemon=True)
+        self._thread.start()
+
+    def write(self, response: HttpResponse) -> None:
+        self._queue.put(response)
+
+    def _run(self):
+        while True:
+            response = self._queue.get()
+            try:
+                if response is _STOP:
+                    return
+                self._append(response)
+            except Exception as e:
+                logger.warning(f"Gagal menulis archive untuk {getattr(response, 'url', '?')}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _append(self, response: HttpResponse):
+        record = encode_record(response)
+        offset = self._archive.tell()
+        self._archive.write(record)
+        self._archive.flush()
+        # URL yang diminta dan URL akhir redirect menunjuk ke record yang sama
+        for url in dict.fromkeys((response.final_url or response.url, response.url)):
+            self._index.write(f'{offset}\t{len(record)}\t{response.status_code}\t{url}\n')
+        self._index.flush()
+        self.records += 1
+
+    def flush(self) -> None:
+        """Tunggu sampai semua response di queue tertulis"""
+        self._queue.join()
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+        self._archive.close()
+        self._index.close()
+
+
+class WarcArchiveReader:
+    """
+    Random access ke archive lewat mmap: hanya index yang dibaca ke memori,
+    record di-decompress saat diminta. Untuk URL yang di-capture lebih dari
+    sekali, record terakhir yang dipakai.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        self._offsets: Dict[str, Tuple[int, int]] = {}
+        self._load_index(size)
+
+    def _load_index(self, size: int):
+        try:
+            with open(index_path(self.path), encoding='utf-8') as f:
+                for line in f:
+                    parts = line.rstrip('\n').split('\t', 3)
+                    if len(parts) != 4:
+                        continue  # baris terakhir yang terpotong
+                    offset, length = int(parts[0]), int(parts[1])
+                    # Record yang ditulis setelah archive di-mmap belum terlihat
+                    if offset + length <= size:
+                        self._offsets[parts[3]] = (offset, length)
+        except FileNotFoundError:
+            pass
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def urls(self) -> Iterator[str]:
+        return iter(self._offsets)
+
+    def get(self, url: str) -> Optional[ArchivedPage]:
+        entry = self._offsets.get(url)
+        if entry is None or self._mmap is None:
+            return None
+        offset, length = entry
+        return decode_record(self._mmap[offset:offset + length])
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+        self._file.close()
+
+    def __enter__(self) -> 'WarcArchiveReader':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class WarcArchiveSet:
+    """
+    Lookup URL di archive semua worker: `{pid}` di pattern ARCHIVE_PATH
+    dicocokkan dengan archive yang ada di disk. Reader per archive di-cache
+    per proses dan hanya dibuka ulang (index dibaca lagi) jika ukuran index-nya
+    berubah. Untuk URL yang di-capture di beberapa archive, record dengan
+    WARC-Date terbaru yang dipakai.
+    """
+
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        self._readers: Dict[str, Tuple[int, WarcArchiveReader]] = {}
+        self._lock = threading.Lock()
+
+    def paths(self) -> List[str]:
+        if '{pid}' not in self.pattern:
+            return [self.pattern]
+        matches = glob.glob(glob.escape(self.pattern).replace('{pid}', '*'))
+        return sorted(path for path in matches if not path.endswith('.idx'))
+
+    def _reader(self, path: str) -> Optional[WarcArchiveReader]:
+        try:
+            size = os.stat(index_path(path)).st_size
+        except FileNotFoundError:
+            size = -1
+        cached = self._readers.get(path)
+        if cached is not None:
+            if cached[0] == size:
+                return cached[1]
+            cached[1].close()
+            del self._readers[path]
+        if size < 0:
+            return None
+        try:
+            reader = WarcArchiveReader(path)
+        except FileNotFoundError:
+            return None
+        self._readers[path] = (size, reader)
+        return reader
+
+    def get(self, url: str) -> Optional[ArchivedPage]:
+        pages = []
+        with self._lock:
+            paths = self.paths()
+            # Archive yang sudah dihapus dari disk
+            for path in set(self._readers) - set(paths):
+                self._readers.pop(path)[1].close()
+            for path in paths:
+                reader = self._reader(path)
+                page = reader.get(url) if reader is not None else None
+                if page is not None:
+                    pages.append(page)
+        return max(pages, key=lambda page: page.date) if pages else None
+
+    def close(self):
+        with self._lock:
+            for _, reader in self._readers.values():
+                reader.close()
+            self._readers.clear()
@@ -0,0 +1,210 @@
+import os
+import sys
+import threading
+import time
+import logging
+from collections import Counter
+from typing import Any, Callable, Dict, Generator, Iterator, List, Optional
+from app.domain.interfaces import IProfiler
+
+logger = logging.getLogger(__name__)
+
+
+def _native_thread_class():
+    """Thread OS asli, juga ketika gevent sudah melakukan monkey patching"""
+    try:
+        from gevent import monkey
+        if monkey.is_module_patched('threading'):
+            return monkey.get_original('threading', 'Thread')
+    except ImportError:
+        pass
+    return threading.Thread
+
+
+def _current_greenlet():
+    try:
+        from gevent import monkey
+        if monkey.is_module_patched('threading'):
+            import greenlet
+            return greenlet.getcurrent()
+    except ImportError:
+        pass
+    return None
+
+
+class SamplingProfiler(IProfiler):
+    """
+    Sampling profiler wall-clock untuk satu crawl job.
+
+    Thread sampler terpisah mengambil stack dari thread (atau greenlet) yang
+    menjalankan crawl setiap `interval` detik, hanya selama crawl aktif,
+    ditambah thread worker yang sedang menjalankan fungsi dari track()
+    (fetch paralel, hedge). Setiap stack thread dihitung sebagai satu sample.
+    Crawl lain yang berjalan bersamaan tidak disampling dan tidak melambat.
+    Hasilnya berupa collapsed stacks (siap untuk flamegraph.pl/speedscope)
+    dan daftar fungsi teratas berdasarkan waktu kumulatif.
+    """
+
+    def __init__(self, interval: float = 0.005, max_stack_depth: int = 64):
+        self.interval = interval
+        self.max_stack_depth = max_stack_depth
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.duration = 0.0
+        self._thread_id: Optional[int] = None
+        self._greenlet = None
+        # ident thread worker -> greenlet (jika gevent), selama menjalankan fungsi track()
+        self._workers: Dict[int, Any] = {}
+        self._workers_lock = threading.Lock()
+        self._active = False
+        self._stopped = threading.Event()
+        self._sampler = None
+        self._started_at = 0.0
+
+    def _start(self):
+        self._thread_id = threading.get_ident()
+        self._greenlet = _current_greenlet()
+        self._stopped.clear()
+        self._started_at = time.perf_counter()
+        self._sampler = _native_thread_class()(target=self._sample_loop, daemon=True)
+        self._sampler.start()
+
+    def _stop(self):
+        self._active = False
+        self._stopped.set()
+        if self._sampler is not None:
+            self._sampler.join()
+            self._sampler = None
+        self.duration = time.perf_counter() - self._started_at
+
+    @staticmethod
+    def _frame_of(thread_id: Optional[int], greenlet, frames: Dict[int, Any]):
+        # Greenlet yang sedang menunggu I/O punya gr_frame; jika sedang berjalan, pakai frame thread
+        if greenlet is not None and greenlet.gr_frame is not None:
+            return greenlet.gr_frame
+        return frames.get(thread_id)
+
+    def _sample_loop(self):
+        while not self._stopped.wait(self.interval):
+            if not self._active:
+                continue
+            frames = sys._current_frames()
+            with self._workers_lock:
+                targets = [(self._thread_id, self._greenlet)] + list(self._workers.items())
+            for thread_id, greenlet in targets:
+                frame = self._frame_of(thread_id, greenlet, frames)
+                if frame is not None:
+                    self._record(frame)
+
+    def _record(self, frame):
+        # Berhenti di frame profiler, sehingga stack server/WSGI (atau executor) di atasnya tidak ikut
+        stack = []
+        while frame is not None and len(stack) < self.max_stack_depth:
+            code = frame.f_code
+            if code in _ENTRY_CODES:
+                break
+            stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}:{code.co_firstlineno}")
+            frame = frame.f_back
+        self.stacks[';'.join(reversed(stack))] += 1
+        self.samples += 1
+
+    def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Profile satu pemanggilan sinkron (mis. crawl non-streaming)"""
+        self._start()
+        self._active = True
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self._stop()
+
+    def profile_stream(self, events: Iterator[Dict[str, Any]]) -> Generator[Dict[str, Any], None, None]:
+        """
+        Profile generator crawl_stream. Sampling hanya aktif selama generator
+        berjalan, bukan ketika server sedang menulis event ke client.
+        """
+        self._start()
+        try:
+            while True:
+                self._active = True
+                try:
+                    event = next(events)
+                except StopIteration:
+                    break
+                finally:
+                    self._active = False
+                yield event
+        finally:
+            self._stop()
+
+    def track(self, func: Callable[..., Any]) -> Callable[..., Any]:
+        """
+        Bungkus fungsi yang disubmit crawler ke executor: selama berjalan, thread
+        worker ikut disampling. Dipanggil di thread crawl itu sendiri, tidak
+        didaftarkan dua kali.
+        """
+        def tracked(*args, **kwargs):
+            thread_id = threading.get_ident()
+            with self._workers_lock:
+                owned = thread_id != self._thread_id and thread_id not in self._workers
+                if owned:
+                    self._workers[thread_id] = _current_greenlet()
+            if not owned:
+                return func(*args, **kwargs)
+            try:
+                return _run_worker(func, args, kwargs)
+            finally:
+                with self._workers_lock:
+                    self._workers.pop(thread_id, None)
+        return tracked
+
+    def collapsed(self) -> str:
+        """Collapsed stack format: 'frame;frame;frame count' per baris"""
+        return '\n'.join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+    def top_functions(self, limit: int = 20) -> List[Dict[str, Any]]:
+        cumulative: Counter = Counter()
+        own: Counter = Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(';')
+            own[frames[-1]] += count
+            # Urutan stack (caller dulu): cumulative yang sama diurutkan caller sebelum callee
+            for name in dict.fromkeys(frames):
+                cumulative[name] += count
+
+        return [
+            {
+                'function': name,
+                'cumulative_samples': count,
+                'self_samples': own.get(name, 0),
+                'cumulative_seconds': round(count * self.interval, 4),
+                'cumulative_percent': round(100.0 * count / self.samples, 2) if self.samples else 0.0
+            }
+            for name, count in cumulative.most_common(limit)
+        ]
+
+    def report(self, limit: int = 20, output_dir: Optional[str] = None) -> Dict[str, Any]:
+        report = {
+            'interval': self.interval,
+            'samples': self.samples,
+            'duration': round(self.duration, 4),
+            'top_functions': self.top_functions(limit),
+            'collapsed': self.collapsed()
+        }
+
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+            path = os.path.join(output_dir, f"crawl-{time.strftime('%Y%m%d-%H%M%S')}-{id(self):x}.collapsed")
+            with open(path, 'w') as f:
+                f.write(report['collapsed'])
+            report['collapsed_file'] = path
+            logger.info(f"Profile crawl disimpan di {path}")
+
+        return report
+
+
+def _run_worker(func: Callable[..., Any], args, kwargs) -> Any:
+    # Frame batas stack thread worker (lihat _ENTRY_CODES)
+    return func(*args, **kwargs)
+
+
+_ENTRY_CODES = {SamplingProfiler.run.__code__, SamplingProfiler.profile_stream.__code__, _run_worker.__code__}
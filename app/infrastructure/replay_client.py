@@ -0,0 +1,182 @@
+import gzip
+import json
+import threading
+import time
+from collections import defaultdict
+from dataclasses import fields
+from typing import Any, Dict, Iterator, List, Optional
+from app.domain.entities import HttpResponse, PageTiming
+from app.domain.interfaces import IHttpClient
+
+# Stage jaringan yang direkam; parse/normalize selalu diukur ulang saat replay
+_NETWORK_STAGES = ('dns', 'connect', 'ttfb', 'download', 'retry_sleep', 'bytes', 'retries')
+_RESPONSE_FIELDS = tuple(f.name for f in fields(HttpResponse))
+
+
+def encode_fixture(url: str, response: Optional[HttpResponse], elapsed: float, timing: PageTiming) -> str:
+    """Satu baris fixture (JSON): URL yang diminta, response (None jika gagal total), latency dan timing jaringan"""
+    record: Dict[str, Any] = {
+        'url': url,
+        'elapsed': round(elapsed, 6),
+        'timing': {stage: getattr(timing, stage) for stage in _NETWORK_STAGES},
+        'response': None,
+    }
+    if response is not None:
+        record['response'] = {name: getattr(response, name) for name in _RESPONSE_FIELDS}
+    return json.dumps(record, separators=(',', ':'), ensure_ascii=False)
+
+
+def load_fixtures(path: str) -> Dict[str, List[dict]]:
+    """URL -> record sesuai urutan rekaman (URL yang di-fetch ulang punya beberapa record)"""
+    fixtures: Dict[str, List[dict]] = defaultdict(list)
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        try:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break  # baris terakhir yang terpotong
+                fixtures[record['url']].append(record)
+        except EOFError:
+            pass  # rekaman tidak di-close: stream gzip tanpa trailer, record yang lengkap tetap dipakai
+    return dict(fixtures)
+
+
+class _Cassette:
+    """File fixture yang dipakai bersama oleh RecordingHttpClient dan client hasil scoped()"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = gzip.open(path, 'wt', encoding='utf-8')
+        self._lock = threading.Lock()
+        self.records = 0
+
+    def write(self, line: str) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.write(line + '\n')
+                self.records += 1
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class RecordingHttpClient(IHttpClient):
+    """
+    Wrapper IHttpClient yang meneruskan setiap GET ke client asli dan merekam
+    response (status, headers, body, redirect) beserta latency dan timing
+    jaringannya ke fixture `.jsonl.gz`. Aman untuk fetch paralel.
+    """
+
+    def __init__(self, inner: IHttpClient, path: str, cassette: Optional[_Cassette] = None):
+        self.inner = inner
+        self.path = path
+        self._cassette = cassette or _Cassette(path)
+
+    @property
+    def records(self) -> int:
+        return self._cassette.records
+
+    def scoped(self) -> 'RecordingHttpClient':
+        """State per crawl (cookie) dari client asli, fixture tetap satu file"""
+        return RecordingHttpClient(self.inner.scoped(), self.path, self._cassette)
+
+    def get(
+        self,
+        url: str,
+        timeout: int,
+        headers: dict,
+        verify_ssl: bool = True,
+        retry_count: int = 1,
+        retry_delay: float = 1.0,
+        follow_redirects: bool = True,
+        timing: Optional[PageTiming] = None
+    ) -> Optional[HttpResponse]:
+        recorded = timing if timing is not None else PageTiming()
+        start = time.perf_counter()
+        response = self.inner.get(
+            url, timeout, headers,
+            verify_ssl=verify_ssl,
+            retry_count=retry_count,
+            retry_delay=retry_delay,
+            follow_redirects=follow_redirects,
+            timing=recorded
+        )
+        self._cassette.write(encode_fixture(url, response, time.perf_counter() - start, recorded))
+        return response
+
+    def close(self) -> None:
+        self._cassette.close()
+
+    def __enter__(self) -> 'RecordingHttpClient':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ReplayHttpClient(IHttpClient):
+    """
+    IHttpClient yang menjawab dari fixture hasil RecordingHttpClient, tanpa jaringan.
+
+    `latency_scale` = 1.0 menunggu selama latency yang direkam (perilaku
+    crawl asli), 0.0 menjawab secepat mungkin (untuk profiling CPU parse,
+    normalize dan tree building). URL yang di-fetch beberapa kali dijawab
+    sesuai urutan rekaman, lalu record terakhir diulang. URL yang tidak ada
+    di fixture dijawab None (seperti request yang gagal) dan dihitung di `misses`.
+    """
+
+    def __init__(self, path: str, latency_scale: float = 0.0):
+        self.path = path
+        self.latency_scale = latency_scale
+        self._fixtures = load_fixtures(path)
+        self._served: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._fixtures)
+
+    def urls(self) -> Iterator[str]:
+        """URL yang direkam, sesuai urutan fetch pertama"""
+        return iter(self._fixtures)
+
+    def get(
+        self,
+        url: str,
+        timeout: int,
+        headers: dict,
+        verify_ssl: bool = True,
+        retry_count: int = 1,
+        retry_delay: float = 1.0,
+        follow_redirects: bool = True,
+        timing: Optional[PageTiming] = None
+    ) -> Optional[HttpResponse]:
+        records = self._fixtures.get(url)
+        with self._lock:
+            if not records:
+                self.misses.append(url)
+                return None
+            index = min(self._served[url], len(records) - 1)
+            self._served[url] += 1
+            self.hits += 1
+        record = records[index]
+
+        if self.latency_scale > 0:
+            time.sleep(record['elapsed'] * self.latency_scale)
+        if timing is not None:
+            for stage, value in record['timing'].items():
+                setattr(timing, stage, value * self.latency_scale if isinstance(value, float) else value)
+
+        data = record['response']
+        if data is None:
+            return None
+        # Salinan baru setiap kali: crawler boleh mengubah response tanpa merusak fixture
+        return HttpResponse(**{
+            **data,
+            'headers': dict(data['headers']),
+            'redirect_chain': list(data['redirect_chain']),
+            'elapsed': data.get('elapsed', 0.0) * self.latency_scale
+        })
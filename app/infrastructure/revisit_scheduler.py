@@ -0,0 +1,438 @@
+import heapq
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, fields, replace
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from app.domain.entities import CrawlConfig, HttpResponse
+from app.domain.interfaces import IHttpClient, ILinkExtractor, IPageSink, IUrlParser
+from app.infrastructure.concurrency import HostPacer
+from app.infrastructure.content_fingerprint import exact_hash
+from app.infrastructure.crawl_history import site_key
+from app.infrastructure.dfs_crawler import DFSWebCrawler, pick_user_agent
+
+logger = logging.getLogger(__name__)
+
+POLICIES = ('change_rate', 'uniform')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS revisit_sites (
+    start_url TEXT PRIMARY KEY,
+    last_discovery REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS revisit_routes (
+    url TEXT PRIMARY KEY,
+    site TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_fetch REAL NOT NULL,
+    last_check REAL NOT NULL,
+    last_change REAL NOT NULL,
+    checks INTEGER NOT NULL,
+    changes INTEGER NOT NULL,
+    observed REAL NOT NULL,
+    errors INTEGER NOT NULL,
+    status INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    etag TEXT NOT NULL,
+    last_modified TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS revisit_ticks (
+    at REAL NOT NULL,
+    fetches INTEGER NOT NULL,
+    changes INTEGER NOT NULL,
+    not_modified INTEGER NOT NULL,
+    errors INTEGER NOT NULL,
+    discovered INTEGER NOT NULL,
+    estimated_freshness REAL NOT NULL
+);
+"""
+
+
+def _header(headers: Dict[str, str], name: str) -> str:
+    # requests mempertahankan kapitalisasi server, httpx lowercase
+    name = name.lower()
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return ''
+
+
+@dataclass
+class RouteState:
+    """History perubahan satu URL yang dipantau"""
+    url: str
+    site: str
+    first_seen: float
+    last_fetch: float = 0.0  # fetch terakhir (termasuk yang gagal)
+    last_check: float = 0.0  # observasi terakhir yang berhasil (0 = belum punya baseline)
+    last_change: float = 0.0
+    checks: int = 0  # observasi yang dibandingkan dengan observasi sebelumnya
+    changes: int = 0  # observasi yang berbeda dari sebelumnya
+    observed: float = 0.0  # total detik interval yang diobservasi
+    errors: int = 0
+    status: int = 0
+    content_hash: str = ''
+    etag: str = ''
+    last_modified: str = ''
+
+    def change_rate(self, prior_interval: float) -> float:
+        """
+        Estimasi laju perubahan (per detik), estimator Cho & Garcia-Molina
+        -ln(1 - p) / I: p = peluang berubah dalam satu interval check (dihaluskan
+        supaya tidak pernah 0 atau 1), I = rata-rata interval. Satu check hanya
+        melihat "berubah atau tidak", bukan berapa kali; -ln(1 - p) mengoreksi
+        perubahan beruntun yang terlewat di halaman yang sering berubah.
+        """
+        mean_interval = self.observed / self.checks if self.checks else prior_interval
+        p = (self.changes + 0.5) / (self.checks + 1.0)
+        return -math.log(1.0 - p) / max(mean_interval, 1e-9)
+
+    def change_probability(self, now: float, prior_interval: float) -> float:
+        """Peluang halaman sudah berubah sejak observasi terakhir (Poisson)"""
+        if not self.last_check:
+            return 1.0
+        return 1.0 - math.exp(-self.change_rate(prior_interval) * max(0.0, now - self.last_check))
+
+    def observe(self, response: HttpResponse, now: float) -> Optional[bool]:
+        """
+        Catat hasil fetch. Return True jika berubah, False jika sama (termasuk
+        304 Not Modified), None jika bukan observasi (gagal, 429/5xx) atau baseline.
+        """
+        self.last_fetch = now
+        status = response.status_code if response is not None else 0
+        if status == 0 or status == 429 or status >= 500:
+            self.errors += 1
+            return None
+
+        if status == 304:
+            changed = False
+        else:
+            content_hash = exact_hash(response.text) if response.text is not None else ''
+            etag = _header(response.headers, 'ETag')
+            last_modified = _header(response.headers, 'Last-Modified')
+            if status != self.status:
+                changed = True
+            elif content_hash or self.content_hash:
+                changed = content_hash != self.content_hash
+            else:
+                # Bukan HTML: hanya validator yang bisa dibandingkan
+                changed = (etag, last_modified) != (self.etag, self.last_modified)
+            self.status = status
+            self.content_hash = content_hash
+            self.etag = etag
+            self.last_modified = last_modified
+
+        if not self.last_check:
+            self.last_check = now
+            return None
+        self.checks += 1
+        self.observed += max(0.0, now - self.last_check)
+        self.last_check = now
+        if changed:
+            self.changes += 1
+            self.last_change = now
+        return changed
+
+    def validators(self) -> Dict[str, str]:
+        """Header conditional GET: server boleh menjawab 304 tanpa body"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class RevisitStore:
+    """State scheduler di SQLite (WAL): route, waktu discovery per site dan log tick"""
+
+    _COLUMNS = tuple(f.name for f in fields(RouteState))
+
+    def __init__(self, path: str):
+        self.path = path
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30.0, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(_SCHEMA)
+
+    def load_routes(self) -> Dict[str, RouteState]:
+        with self._lock:
+            rows = self._conn.execute(f"SELECT {', '.join(self._COLUMNS)} FROM revisit_routes").fetchall()
+        return {row[0]: RouteState(*row) for row in rows}
+
+    def save_routes(self, states: Iterable[RouteState]) -> None:
+        rows = [tuple(asdict(state).values()) for state in states]
+        if not rows:
+            return
+        placeholders = ', '.join('?' * len(self._COLUMNS))
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                self._conn.executemany(
+                    f"INSERT OR REPLACE INTO revisit_routes({', '.join(self._COLUMNS)}) VALUES ({placeholders})", rows
+                )
+                self._conn.execute('COMMIT')
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    def last_discovery(self, start_url: str) -> float:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT last_discovery FROM revisit_sites WHERE start_url = ?', (start_url,)
+            ).fetchone()
+        return row[0] if row else 0.0
+
+    def set_last_discovery(self, start_url: str, at: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                'INSERT INTO revisit_sites(start_url, last_discovery) VALUES (?, ?)'
+                ' ON CONFLICT(start_url) DO UPDATE SET last_discovery = excluded.last_discovery',
+                (start_url, at)
+            )
+
+    def record_tick(self, tick: dict) -> None:
+        with self._lock:
+            self._conn.execute(
+                'INSERT INTO revisit_ticks(at, fetches, changes, not_modified, errors, discovered, estimated_freshness)'
+                ' VALUES (:at, :fetches, :changes, :not_modified, :errors, :discovered, :estimated_freshness)',
+                tick
+            )
+
+    def totals(self, since: float = 0.0) -> dict:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(fetches), 0), COALESCE(SUM(changes), 0),'
+                ' COALESCE(SUM(not_modified), 0), COALESCE(SUM(errors), 0) FROM revisit_ticks WHERE at >= ?',
+                (since,)
+            ).fetchone()
+        return dict(zip(('ticks', 'fetches', 'changes', 'not_modified', 'errors'), row))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class _BaselineSink(IPageSink):
+    """Menangkap response crawl discovery: setiap halaman yang di-crawl sekaligus jadi observasi"""
+
+    def __init__(self):
+        self.responses: List[HttpResponse] = []
+        self._lock = threading.Lock()
+
+    def write(self, response: HttpResponse) -> None:
+        with self._lock:
+            self.responses.append(response)
+
+
+class RevisitScheduler:
+    """
+    Scheduler revisit untuk monitoring situs secara kontinu.
+
+    Route ditemukan lewat crawl DFSWebCrawler (diulang setiap
+    `rediscover_interval`), lalu setiap route di-fetch ulang satu per satu
+    lewat IHttpClient dengan conditional GET (ETag/Last-Modified) dan content
+    hash. Budget `fetches_per_hour` (token bucket, termasuk halaman crawl
+    discovery) dialokasikan setiap tick ke route dengan peluang berubah
+    tertinggi menurut laju perubahan yang diestimasi dari history route.
+    Discovery yang jatuh tempo dibayar di muka: revisit ditunda sampai token
+    cukup untuk `max_pages`, dan crawl-nya tidak pernah melebihi token yang ada.
+    Revisit ke host yang sama mengikuti politeness delay config (HostPacer).
+    Policy 'uniform' (route yang paling lama tidak di-fetch lebih dulu)
+    setara cron tetap, untuk pembanding. State disimpan di RevisitStore.
+    """
+
+    def __init__(
+        self,
+        store: RevisitStore,
+        http_client: IHttpClient,
+        url_parser: IUrlParser,
+        link_extractor: ILinkExtractor,
+        config: CrawlConfig,
+        sites: Iterable[str] = (),
+        fetches_per_hour: float = 600,
+        tick_seconds: float = 60.0,
+        rediscover_interval: float = 24 * 3600,
+        prior_interval: float = 3600.0,
+        policy: str = 'change_rate',
+        clock: Callable[[], float] = time.time
+    ):
+        if policy not in POLICIES:
+            raise ValueError(f"policy harus salah satu dari {', '.join(POLICIES)}, bukan {policy!r}")
+        self.store = store
+        self.http_client = http_client
+        self.url_parser = url_parser
+        self.link_extractor = link_extractor
+        self.config = config
+        self.sites = list(sites)
+        self.fetches_per_hour = fetches_per_hour
+        self.tick_seconds = tick_seconds
+        self.rediscover_interval = rediscover_interval
+        self.prior_interval = prior_interval
+        self.policy = policy
+        self.clock = clock
+        self.routes = store.load_routes()
+        # Token bucket: sisa budget bisa dipakai sampai dua tick ke depan, tidak lebih
+        self._tokens = 0.0
+        self._last_tick: Optional[float] = None
+        # Politeness per host juga antar tick, seperti crawl biasa
+        self._pacer = HostPacer(config.delay) if config.delay > 0 else None
+
+    def _burst(self) -> float:
+        return max(1.0, 2 * self.fetches_per_hour * self.tick_seconds / 3600)
+
+    def priority(self, state: RouteState, now: float) -> float:
+        if self.policy == 'uniform':
+            return now - state.last_fetch
+        return state.change_probability(now, self.prior_interval)
+
+    def add_routes(self, urls: Iterable[str], now: Optional[float] = None) -> int:
+        """Daftarkan URL tanpa baseline (fetch pertama menjadi baseline); return jumlah URL baru"""
+        now = self.clock() if now is None else now
+        added = 0
+        for url in urls:
+            if url not in self.routes:
+                self.routes[url] = RouteState(url=url, site=site_key(url), first_seen=now)
+                added += 1
+        return added
+
+    def discover(self, start_url: str, now: Optional[float] = None, max_pages: Optional[int] = None) -> Tuple[int, int]:
+        """
+        Crawl situs untuk menemukan route baru; return (route baru, halaman yang di-fetch).
+        max_pages membatasi crawl di bawah max_pages config (mis. token yang tersedia).
+        """
+        now = self.clock() if now is None else now
+        sink = _BaselineSink()
+        config = self.config
+        if max_pages is not None and max_pages < config.max_pages:
+            config = replace(config, max_pages=max_pages)
+        crawler = DFSWebCrawler(
+            http_client=self.http_client,
+            url_parser=self.url_parser,
+            link_extractor=self.link_extractor,
+            config=config,
+            page_sink=sink
+        )
+        result = crawler.crawl(start_url)
+        added = 0
+        for response in sink.responses:
+            state = self.routes.get(response.url)
+            if state is None:
+                state = self.routes[response.url] = RouteState(url=response.url, site=site_key(response.url), first_seen=now)
+                added += 1
+            state.observe(response, now)
+        self.store.set_last_discovery(start_url, now)
+        self.store.save_routes(self.routes.values())
+        logger.info(f"Discovery {start_url}: {added} route baru, {result.pages_crawled} halaman")
+        return added, result.pages_crawled
+
+    def _fetch(self, http_client: IHttpClient, state: RouteState) -> Optional[HttpResponse]:
+        if self._pacer is not None:
+            self._pacer.wait(self.url_parser.get_domain(state.url))
+        return http_client.get(
+            url=state.url,
+            timeout=self.config.timeout,
+            headers={'User-Agent': pick_user_agent(self.config), **state.validators()},
+            verify_ssl=self.config.verify_ssl,
+            retry_count=self.config.retry_count,
+            retry_delay=self.config.retry_delay,
+            follow_redirects=self.config.follow_redirects
+        )
+
+    def tick(self, now: Optional[float] = None) -> dict:
+        """Satu putaran: discovery yang jatuh tempo, lalu revisit sebanyak budget yang tersedia"""
+        now = self.clock() if now is None else now
+        elapsed = self.tick_seconds if self._last_tick is None else max(0.0, now - self._last_tick)
+        self._last_tick = now
+        due = [
+            start_url for start_url in self.sites
+            if now - self.store.last_discovery(start_url) >= self.rediscover_interval
+        ]
+        # Selama discovery tertunda, token ditabung sampai cukup untuk satu crawl discovery
+        capacity = max(self._burst(), self.config.max_pages) if due else self._burst()
+        self._tokens = min(capacity, self._tokens + self.fetches_per_hour * elapsed / 3600)
+
+        tick = {'at': now, 'fetches': 0, 'changes': 0, 'not_modified': 0, 'errors': 0, 'discovered': 0}
+        while due and self._tokens >= capacity:
+            added, pages = self.discover(due.pop(0), now, max_pages=int(self._tokens))
+            tick['discovered'] += added
+            tick['fetches'] += pages
+            self._tokens -= pages
+        if due:
+            count = 0
+        else:
+            # Sisa tabungan (situs lebih kecil dari max_pages) tidak jadi burst revisit
+            self._tokens = min(self._burst(), self._tokens)
+            count = int(self._tokens) if self._tokens >= 1 else 0
+        chosen = heapq.nlargest(count, self.routes.values(), key=lambda state: self.priority(state, now))
+        if chosen:
+            http_client = self.http_client.scoped()
+            workers = max(1, min(self.config.max_concurrency, len(chosen)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                responses = list(executor.map(lambda state: self._fetch(http_client, state), chosen))
+            for state, response in zip(chosen, responses):
+                if state.observe(response, now):
+                    tick['changes'] += 1
+                if response is None or response.status_code == 429 or response.status_code >= 500:
+                    tick['errors'] += 1
+                elif response.status_code == 304:
+                    tick['not_modified'] += 1
+            tick['fetches'] += len(chosen)
+            self._tokens -= len(chosen)
+            self.store.save_routes(chosen)
+
+        tick['estimated_freshness'] = self.estimated_freshness(now)
+        self.store.record_tick(tick)
+        return tick
+
+    def estimated_freshness(self, now: Optional[float] = None) -> float:
+        """Perkiraan fraksi route yang salinannya masih sama dengan versi live"""
+        now = self.clock() if now is None else now
+        if not self.routes:
+            return 1.0
+        stale = sum(state.change_probability(now, self.prior_interval) for state in self.routes.values())
+        return 1.0 - stale / len(self.routes)
+
+    def report(self, since: float = 0.0) -> dict:
+        """Freshness dan perubahan yang terdeteksi per fetch yang dipakai"""
+        now = self.clock()
+        totals = self.store.totals(since)
+        fetches = totals['fetches']
+        rates = sorted((state.change_rate(self.prior_interval) * 3600, state.url) for state in self.routes.values())
+        return {
+            **totals,
+            'policy': self.policy,
+            'fetches_per_hour': self.fetches_per_hour,
+            'routes': len(self.routes),
+            'changes_per_fetch': round(totals['changes'] / fetches, 4) if fetches else 0.0,
+            'estimated_freshness': round(self.estimated_freshness(now), 4),
+            'fastest_changing': [
+                {'url': url, 'changes_per_hour': round(rate, 4)} for rate, url in reversed(rates[-10:])
+            ],
+        }
+
+    def run(self, stop: Optional[threading.Event] = None) -> None:
+        """Loop service: tick setiap `tick_seconds` sampai `stop` di-set"""
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            started = time.monotonic()
+            try:
+                tick = self.tick()
+                logger.info(
+                    f"Revisit tick: {tick['fetches']} fetch, {tick['changes']} berubah, "
+                    f"{tick['not_modified']} 304, freshness {tick['estimated_freshness']:.3f}"
+                )
+            except Exception:
+                logger.exception("Revisit tick gagal")
+            stop.wait(max(0.0, self.tick_seconds - (time.monotonic() - started)))
+
+    def close(self) -> None:
+        self.store.save_routes(self.routes.values())
+        self.store.close()
@@ -0,0 +1,163 @@
+import re
+from fnmatch import translate
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+from app.domain.entities import ScopeRules
+
+
+_DEFAULT_PORTS = {'http': 80, 'https': 443}
+_GLOB_CHARS = set('*?[')
+
+
+class PrefixTrie:
+    """
+    Trie per segmen path. Prefix '/blog' cocok dengan '/blog' dan '/blog/2024/x',
+    tetapi tidak dengan '/blogger'. Lookup O(jumlah segmen), tidak tergantung
+    jumlah prefix.
+    """
+
+    _END = object()
+
+    def __init__(self, prefixes: Iterable[str] = ()):
+        self._root: Dict = {}
+        self.size = 0
+        for prefix in prefixes:
+            self.add(prefix)
+
+    @staticmethod
+    def _segments(path: str) -> List[str]:
+        return [segment for segment in path.split('/') if segment]
+
+    def add(self, prefix: str) -> None:
+        node = self._root
+        for segment in self._segments(prefix):
+            node = node.setdefault(segment, {})
+        node[self._END] = True
+        self.size += 1
+
+    def matches(self, path: str) -> bool:
+        node = self._root
+        if self._END in node:
+            return True
+        for segment in self._segments(path):
+            node = node.get(segment)
+            if node is None:
+                return False
+            if self._END in node:
+                return True
+        return False
+
+    def __bool__(self) -> bool:
+        return self.size > 0
+
+
+def _combine(patterns: List[str]) -> Optional['re.Pattern']:
+    """Semua pattern digabung ke satu regex alternation, jadi satu pemanggilan match per URL"""
+    if not patterns:
+        return None
+    return re.compile('|'.join(f'(?:{pattern})' for pattern in patterns))
+
+
+def split_rules(rules: Iterable[str]) -> Tuple[List[str], List[str]]:
+    """
+    Pisahkan rule menjadi (prefixes, regex):
+    - 're:<regex>' -> regex (dicocokkan dengan re.match terhadap path)
+    - mengandung * ? [ -> glob, diterjemahkan ke regex full match
+    - lainnya -> path prefix
+    """
+    prefixes, patterns = [], []
+    for rule in rules:
+        rule = rule.strip()
+        if not rule:
+            continue
+        if rule.startswith('re:'):
+            patterns.append(rule[3:])
+        elif _GLOB_CHARS & set(rule):
+            patterns.append(translate(rule))
+        else:
+            prefixes.append(rule)
+    return prefixes, patterns
+
+
+class ScopeMatcher:
+    """
+    Rule scope yang sudah dikompilasi untuk satu crawl.
+
+    Host: domain start URL (tanpa 'www.') plus subdomain sesuai
+    `allowed_subdomains` (None = semua subdomain, [] = tidak ada, atau
+    daftar label/glob seperti 'blog', '*.docs'). Port: `allowed_ports`, atau
+    port eksplisit start URL (80/443 jika tidak ada) jika None.
+    Path: ditolak jika cocok exclude (prefix, pattern, atau ekstensi); jika
+    ada rule include, harus cocok salah satunya.
+    """
+
+    def __init__(self, start_url: str, rules: Optional[ScopeRules] = None):
+        rules = rules or ScopeRules()
+        start = urlsplit(start_url)
+        self.base_host = self._strip_www((start.hostname or '').lower())
+
+        if rules.allowed_ports is not None:
+            self.ports = frozenset(rules.allowed_ports)
+        elif start.port is not None:
+            self.ports = frozenset({start.port})
+        else:
+            # Tanpa port eksplisit, link http:// dan https:// ke host yang sama tetap in scope
+            self.ports = frozenset(_DEFAULT_PORTS.values())
+
+        self.any_subdomain = rules.allowed_subdomains is None
+        self.subdomains = _combine([
+            translate(label.lower()) for label in (rules.allowed_subdomains or [])
+        ])
+
+        include_prefixes, include_patterns = split_rules(rules.include)
+        exclude_prefixes, exclude_patterns = split_rules(rules.exclude)
+        self.include_prefixes = PrefixTrie(include_prefixes)
+        self.include_patterns = _combine(include_patterns)
+        self.exclude_prefixes = PrefixTrie(exclude_prefixes)
+        self.exclude_patterns = _combine(exclude_patterns)
+        self.exclude_extensions = tuple(
+            ext.lower() if ext.startswith('.') else f'.{ext.lower()}' for ext in rules.exclude_extensions
+        )
+        self.has_include = bool(self.include_prefixes) or self.include_patterns is not None
+
+    @staticmethod
+    def _strip_www(host: str) -> str:
+        return host[4:] if host.startswith('www.') else host
+
+    def allows_host(self, host: str, port: int) -> bool:
+        if port not in self.ports:
+            return False
+        host = self._strip_www(host)
+        if host == self.base_host:
+            return True
+        if not host.endswith('.' + self.base_host):
+            return False
+        if self.any_subdomain:
+            return True
+        subdomain = host[:-len(self.base_host) - 1]
+        return self.subdomains is not None and self.subdomains.match(subdomain) is not None
+
+    def allows_path(self, path: str) -> bool:
+        path = path or '/'
+        if self.exclude_extensions and path.lower().endswith(self.exclude_extensions):
+            return False
+        if self.exclude_prefixes and self.exclude_prefixes.matches(path):
+            return False
+        if self.exclude_patterns is not None and self.exclude_patterns.match(path):
+            return False
+        if not self.has_include:
+            return True
+        return (
+            (bool(self.include_prefixes) and self.include_prefixes.matches(path))
+            or (self.include_patterns is not None and self.include_patterns.match(path) is not None)
+        )
+
+    def allows(self, url: str) -> bool:
+        try:
+            parts = urlsplit(url)
+            if parts.scheme not in _DEFAULT_PORTS or not parts.hostname:
+                return False
+            port = parts.port or _DEFAULT_PORTS[parts.scheme]
+        except ValueError:
+            return False
+        return self.allows_host(parts.hostname, port) and self.allows_path(parts.path)
@@ -0,0 +1,150 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError as FutureTimeout, wait
+from typing import Callable, Deque, Dict, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+def percentile(values, pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+class LatencyTracker:
+    """
+    Latency fetch terakhir per host (ring buffer) untuk timeout adaptif.
+
+    Timeout = p99 * `timeout_multiplier`, dibatasi antara `min_timeout` dan
+    timeout config. Sebelum `min_samples` tercatat, timeout config dipakai.
+    Di-update dari loop crawl dan dibaca dari thread fetch, jadi memakai lock.
+    """
+
+    def __init__(self, window: int = 200, min_samples: int = 20, timeout_multiplier: float = 3.0, min_timeout: float = 1.0):
+        self.window = window
+        self.min_samples = min_samples
+        self.timeout_multiplier = timeout_multiplier
+        self.min_timeout = min_timeout
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, host: str, latency: float) -> None:
+        with self._lock:
+            samples = self._samples.get(host)
+            if samples is None:
+                samples = self._samples[host] = deque(maxlen=self.window)
+            samples.append(latency)
+
+    def percentile(self, host: str, pct: float) -> Optional[float]:
+        with self._lock:
+            samples = self._samples.get(host)
+            if not samples or len(samples) < self.min_samples:
+                return None
+            values = list(samples)
+        return percentile(values, pct)
+
+    def timeout_for(self, host: str, default: float) -> float:
+        p99 = self.percentile(host, 99)
+        if p99 is None:
+            return default
+        return max(self.min_timeout, min(default, p99 * self.timeout_multiplier))
+
+    def stats(self, default_timeout: float) -> Dict[str, dict]:
+        result = {}
+        for host in list(self._samples):
+            p50, p95, p99 = (self.percentile(host, pct) for pct in (50, 95, 99))
+            result[host] = {
+                'samples': len(self._samples[host]),
+                'p50_ms': round(p50 * 1000, 2) if p50 is not None else None,
+                'p95_ms': round(p95 * 1000, 2) if p95 is not None else None,
+                'p99_ms': round(p99 * 1000, 2) if p99 is not None else None,
+                'timeout': round(self.timeout_for(host, default_timeout), 3),
+            }
+        return result
+
+
+class Hedger:
+    """
+    Hedged request untuk GET (idempotent): jika attempt pertama belum selesai
+    setelah p95 latency host, attempt kedua dikirim dan hasil yang pertama
+    selesai yang dipakai, kecuali hasil itu gagal dan attempt lain berhasil.
+    Jumlah hedge dibatasi `max_ratio` dari total fetch.
+
+    Attempt yang kalah tidak bisa dibatalkan di tengah request; hasilnya
+    dibuang. Waktu yang dihemat dihitung saat attempt pertama yang kalah selesai.
+    """
+
+    def __init__(self, tracker: LatencyTracker, max_ratio: float = 0.1, max_workers: int = 4):
+        self.tracker = tracker
+        self.max_ratio = max_ratio
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.time_saved = 0.0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='hedge')
+
+    def _take_budget(self) -> bool:
+        with self._lock:
+            if self.hedged + 1 > self.max_ratio * self.requests:
+                return False
+            self.hedged += 1
+            return True
+
+    def _record_saved(self, winner_done: float):
+        def callback(_future):
+            with self._lock:
+                self.time_saved += time.perf_counter() - winner_done
+        return callback
+
+    def fetch(self, host: str, attempt: Callable[[bool], T], failed: Callable[[T], bool]) -> T:
+        """
+        attempt(is_hedge) menjalankan satu fetch; failed(result) True jika hasilnya
+        gagal, sehingga attempt lain yang masih berjalan ditunggu.
+        """
+        with self._lock:
+            self.requests += 1
+
+        threshold = self.tracker.percentile(host, 95)
+        if threshold is None:
+            return attempt(False)
+
+        primary = self._executor.submit(attempt, False)
+        try:
+            return primary.result(timeout=threshold)
+        except FutureTimeout:
+            pass
+
+        if not self._take_budget():
+            return primary.result()
+
+        hedge = self._executor.submit(attempt, True)
+        done, _ = wait([primary, hedge], return_when=FIRST_COMPLETED)
+        winner = primary if primary in done else hedge
+        loser = hedge if winner is primary else primary
+        result = winner.result()
+        # Attempt yang selesai duluan gagal: tunggu attempt lain (juga jika sudah selesai) dan pakai jika berhasil
+        if failed(result):
+            other = loser.result()
+            if not failed(other):
+                winner, loser, result = loser, winner, other
+
+        if winner is hedge and not failed(result):
+            with self._lock:
+                self.hedge_wins += 1
+            loser.add_done_callback(self._record_saved(time.perf_counter()))
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'hedged': self.hedged,
+                'hedge_wins': self.hedge_wins,
+                'time_saved': round(self.time_saved, 4),
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,96 @@
+import re
+from collections import Counter
+from typing import Optional, Set
+from urllib.parse import urlparse
+
+
+_NUMBER = re.compile(r'\d+')
+# Token opaque di path: hash/hex, UUID, atau token base64 (huruf besar+kecil+angka, tanpa
+# tanda hubung). Slug kata yang dipisah '-' (python-tips-for-2024) bukan ID.
+_OPAQUE_ID = re.compile(
+    r'^[0-9a-fA-F]{16,}$'
+    r'|^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$'
+    r'|^(?=[^\d]*\d)(?=[^a-z]*[a-z])(?=[^A-Z]*[A-Z])[a-zA-Z0-9_]{16,}$'
+)
+
+SKIP_TEMPLATE_CAP = 'template_cap'
+SKIP_REPEATING_SEGMENTS = 'repeating_segments'
+
+
+def path_template(path: str) -> str:
+    """
+    Mengelompokkan path ke template, mis.
+    /product/123 -> /product/{n}, /2024/01/02/post -> /{n}/{n}/{n}/post,
+    /s/9f8e7d6c5b4a39281706/cart -> /s/{id}/cart
+    """
+    segments = []
+    for segment in path.split('/'):
+        if _OPAQUE_ID.match(segment):
+            segments.append('{id}')
+        else:
+            segments.append(_NUMBER.sub('{n}', segment))
+    return '/'.join(segments) or '/'
+
+
+def has_repeating_segments(path: str, repeats: int, max_block: int = 4) -> bool:
+    """True jika ada blok segmen (panjang 1..max_block) yang berulang `repeats` kali berturut-turut"""
+    segments = [s for s in path.split('/') if s]
+    for block in range(1, max_block + 1):
+        needed = block * repeats
+        for start in range(0, len(segments) - needed + 1):
+            pattern = segments[start:start + block]
+            if all(segments[start + i * block:start + (i + 1) * block] == pattern for i in range(1, repeats)):
+                return True
+    return False
+
+
+class TrapDetector:
+    """
+    Deteksi crawler trap selama crawl berjalan (state per crawl).
+
+    - Membatasi jumlah fetch per path template (`max_pages_per_template`, 0 = tanpa batas)
+    - Menolak path dengan segmen berulang (/a/b/a/b/a/b) (`loop_repeats`, 0 = nonaktif)
+
+    Setiap URL yang dilewati dicatat sekali per template untuk laporan di CrawlResult.
+    """
+
+    def __init__(self, max_pages_per_template: int = 0, loop_repeats: int = 3):
+        self.max_pages_per_template = max_pages_per_template
+        self.loop_repeats = loop_repeats
+        self.fetches_per_template: Counter = Counter()
+        self.skipped_by_template: Counter = Counter()
+        self.skipped_loops = 0
+        self._skipped_urls: Set[str] = set()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_pages_per_template > 0 or self.loop_repeats > 0
+
+    def check(self, url: str) -> Optional[str]:
+        """Return alasan skip, atau None jika URL boleh di-fetch"""
+        path = urlparse(url).path or '/'
+
+        if self.loop_repeats and has_repeating_segments(path, self.loop_repeats):
+            self._record_skip(url, None)
+            return SKIP_REPEATING_SEGMENTS
+
+        if self.max_pages_per_template:
+            template = path_template(path)
+            if self.fetches_per_template[template] >= self.max_pages_per_template:
+                self._record_skip(url, template)
+                return SKIP_TEMPLATE_CAP
+
+        return None
+
+    def record_fetch(self, url: str) -> None:
+        if self.max_pages_per_template:
+            self.fetches_per_template[path_template(urlparse(url).path or '/')] += 1
+
+    def _record_skip(self, url: str, template: Optional[str]) -> None:
+        if url in self._skipped_urls:
+            return
+        self._skipped_urls.add(url)
+        if template is None:
+            self.skipped_loops += 1
+        else:
+            self.skipped_by_template[template] += 1
@@ -7,12 +7,19 @@ from app.domain.interfaces import IUrlParser
 logger = logging.getLogger(__name__)
 
 class UrlParser(IUrlParser):
+    def __init__(self, allow_private_hosts: bool = False):
+        # Hanya untuk benchmark/load test terhadap server lokal
+        self.allow_private_hosts = allow_private_hosts
+
     def is_safe_url(self, url: str) -> bool:
         try:
             parsed = urlparse(url)
             hostname = parsed.hostname
             if not hostname:
                 return False
+            
+            if self.allow_private_hosts:
+                return True
                 
             # Allow localhost only in debug/dev mode? No, safe by default means NO localhost.
             # Convert hostname to IP(s)
@@ -38,29 +45,6 @@ class UrlParser(IUrlParser):
             logger.error(f"Error checking url safety: {e}")
             return False
 
-    def is_valid_url(self, url: str, domain: str) -> bool:
-        try:
-            parsed = urlparse(url)
-            
-            if not parsed.scheme or not parsed.netloc:
-                return False
-            
-            # Allow subdomains
-            # Remove 'www.' for comparison
-            url_domain = parsed.netloc.replace('www.', '')
-            base_domain = domain.replace('www.', '')
-            
-            if url_domain != base_domain and not url_domain.endswith('.' + base_domain):
-                return False
-            
-            if parsed.scheme not in ['http', 'https']:
-                return False
-            
-            return True
-        
-        except Exception:
-            return False
-    
     def normalize_url(self, url: str) -> str:
         url, _ = urldefrag(url)
         
@@ -1,7 +1,9 @@
-import json
 from flask import Blueprint, request, jsonify, Response, stream_with_context, render_template
 from app.presentation.schemas import CrawlRequest, ErrorResponse
-from app.domain.exceptions import InvalidUrlError, DomainException
+from app.presentation.sse import SSEEventStream
+from app.domain.entities import CrawlConfig
+from app.domain.exceptions import InvalidUrlError, DomainException, OverloadedError
+from app.infrastructure.admission import tenant_from_request
 from app.container.service_container import get_container
 from flask import current_app
 
@@ -36,6 +38,39 @@ def api_info():
             "/health": {
                 "method": "GET",
                 "description": "Health check endpoint"
+            },
+            "/metrics": {
+                "method": "GET",
+                "description": "Histogram timing per stage (format Prometheus)"
+            },
+            "/archive": {
+                "method": "GET",
+                "description": "HTML mentah halaman yang sudah di-crawl (butuh ARCHIVE_PATH)",
+                "query": {"url": "https://example.com/page"}
+            },
+            "/history/sites": {
+                "method": "GET",
+                "description": "Site yang pernah di-crawl (butuh HISTORY_PATH)"
+            },
+            "/history/sites/<host>": {
+                "method": "GET",
+                "description": "Ringkasan crawl terbaru sebuah site",
+                "query": {"limit": 20}
+            },
+            "/history/sites/<host>/routes": {
+                "method": "GET",
+                "description": "Route yang terlihat sejak waktu tertentu",
+                "query": {"status": "valid|invalid", "since": "2024-05-01 atau unix timestamp", "limit": 1000}
+            },
+            "/history/sites/<host>/route": {
+                "method": "GET",
+                "description": "History satu route (pertama/terakhir terlihat, status per crawl)",
+                "query": {"route": "/about"}
+            },
+            "/history/diff": {
+                "method": "GET",
+                "description": "Route yang muncul, hilang dan berubah status antara dua crawl",
+                "query": {"from": 1, "to": 2}
             }
         }
     }), 200
@@ -50,15 +85,222 @@ def health_check():
     }), 200
 
 
+def _make_profiler(crawl_request: CrawlRequest, container):
+    if not crawl_request.profile:
+        return None
+    return container.create_profiler(current_app.config['PROFILER_INTERVAL'])
+
+
+def _crawl_config(crawl_request: CrawlRequest, container) -> CrawlConfig:
+    """Config crawl per request: field request, sisanya default dari config container"""
+    return CrawlConfig(
+        max_pages=crawl_request.max_pages,
+        max_depth=crawl_request.max_depth,
+        frontier_strategy=crawl_request.strategy or container.config.frontier_strategy,
+        frontier_memory_limit=container.config.frontier_memory_limit,
+        frontier_spill_dir=container.config.frontier_spill_dir,
+        deadline=crawl_request.deadline if crawl_request.deadline is not None else container.config.deadline,
+        max_bytes=crawl_request.max_bytes if crawl_request.max_bytes is not None else container.config.max_bytes,
+        budget_focus=container.config.budget_focus,
+        link_graph=crawl_request.link_graph or container.config.link_graph,
+        page_metadata=crawl_request.metadata if crawl_request.metadata is not None else container.config.page_metadata,
+        scope=crawl_request.scope or container.config.scope,
+        max_pages_per_template=container.config.max_pages_per_template,
+        trap_loop_repeats=container.config.trap_loop_repeats,
+        content_dedup=crawl_request.content_dedup or container.config.content_dedup,
+        near_duplicate_distance=container.config.near_duplicate_distance,
+        timeout=crawl_request.timeout,
+        delay=crawl_request.delay,
+        max_concurrency=container.config.max_concurrency,
+        adaptive_concurrency=container.config.adaptive_concurrency,
+        initial_concurrency=container.config.initial_concurrency,
+        adaptive_timeouts=container.config.adaptive_timeouts,
+        hedge_requests=container.config.hedge_requests,
+        hedge_max_ratio=container.config.hedge_max_ratio,
+        verify_ssl=container.config.verify_ssl,
+        retry_count=container.config.retry_count,
+        retry_delay=container.config.retry_delay,
+        follow_redirects=container.config.follow_redirects,
+        user_agent=container.config.user_agent,
+        user_agents=container.config.user_agents,
+        rotate_user_agent=container.config.rotate_user_agent,
+        allow_private_hosts=container.config.allow_private_hosts,
+        collect_timings=crawl_request.timings
+    )
+
+
+def _admit(fetches: int):
+    """Ambil slot admission control untuk satu crawl (None jika nonaktif)"""
+    admission = get_container().get_admission()
+    if admission is None:
+        return None
+    tenant = tenant_from_request(
+        request.headers,
+        request.remote_addr,
+        current_app.config['ADMISSION_TENANT_HEADER'],
+        trust_header=current_app.config['ADMISSION_TRUST_TENANT_HEADER']
+    )
+    return admission.acquire(tenant, fetches)
+
+
+def _overloaded(e: OverloadedError):
+    response = jsonify(ErrorResponse(error="Too many crawls", details=str(e)).to_dict())
+    response.headers['Retry-After'] = str(e.retry_after)
+    return response, 429
+
+
+@bp.route('/metrics', methods=['GET'])
+def metrics():
+    container = get_container()
+    crawl_metrics = container.get_metrics()
+    admission = container.get_admission()
+    if crawl_metrics is None and admission is None:
+        return Response("# metrics disabled\n", mimetype='text/plain'), 404
+    # Histogram stage hanya jika METRICS_ENABLED; gauge admission selalu murah
+    body = crawl_metrics.render_prometheus() if crawl_metrics is not None else ''
+    if admission is not None:
+        body += admission.render_prometheus()
+    return Response(body, mimetype='text/plain; version=0.0.4')
+
+
+@bp.route('/archive', methods=['GET'])
+def archive():
+    """HTML mentah halaman yang sudah di-crawl, dari archive WARC semua worker (?url=...)"""
+    archive = get_container().get_archive()
+    url = request.args.get('url')
+    if archive is None:
+        return jsonify(ErrorResponse(error="Archive nonaktif", details="Set ARCHIVE_PATH").to_dict()), 404
+    if not url:
+        return jsonify(ErrorResponse(error="Invalid request", details="Parameter 'url' wajib ada").to_dict()), 400
+    
+    page = archive.get(url)
+    if page is None:
+        return jsonify(ErrorResponse(error="Halaman tidak ada di archive", details=url).to_dict()), 404
+    
+    return Response(page.body, mimetype='text/html', headers={
+        'X-Archive-Status': str(page.status_code),
+        'X-Archive-Date': page.date
+    })
+
+
+def _history_or_error():
+    history = get_container().get_history()
+    if history is None:
+        return None, (jsonify(ErrorResponse(error="History nonaktif", details="Set HISTORY_PATH").to_dict()), 404)
+    return history, None
+
+
+def _not_found(what: str, details: str):
+    return jsonify(ErrorResponse(error=f"{what} tidak ada di history", details=details).to_dict()), 404
+
+
+def _bad_request(e: ValueError):
+    return jsonify(ErrorResponse(error="Invalid request", details=str(e)).to_dict()), 400
+
+
+@bp.route('/history/sites', methods=['GET'])
+def history_sites():
+    history, error = _history_or_error()
+    if error:
+        return error
+    return jsonify({'sites': history.sites()}), 200
+
+
+@bp.route('/history/sites/<host>', methods=['GET'])
+def history_site(host):
+    history, error = _history_or_error()
+    if error:
+        return error
+    try:
+        summary = history.site_summary(host, limit=request.args.get('limit', 20, type=int))
+    except ValueError as e:
+        return _bad_request(e)
+    if summary is None:
+        return _not_found("Site", host)
+    return jsonify(summary), 200
+
+
+@bp.route('/history/sites/<host>/routes', methods=['GET'])
+def history_routes(host):
+    history, error = _history_or_error()
+    if error:
+        return error
+    from app.infrastructure.crawl_history import parse_since
+    status = request.args.get('status')
+    try:
+        if status not in (None, 'valid', 'invalid'):
+            raise ValueError("status harus 'valid' atau 'invalid'")
+        routes = history.routes(
+            host,
+            valid=None if status is None else status == 'valid',
+            since=parse_since(request.args.get('since')),
+            limit=request.args.get('limit', 1000, type=int)
+        )
+    except ValueError as e:
+        return _bad_request(e)
+    if routes is None:
+        return _not_found("Site", host)
+    return jsonify({'host': host.lower(), 'routes': routes}), 200
+
+
+@bp.route('/history/sites/<host>/route', methods=['GET'])
+def history_route(host):
+    history, error = _history_or_error()
+    if error:
+        return error
+    route = request.args.get('route')
+    if not route:
+        return _bad_request(ValueError("Parameter 'route' wajib ada"))
+    entry = history.route_history(host, route, limit=request.args.get('limit', 100, type=int))
+    if entry is None:
+        return _not_found("Route", f"{host}{route}")
+    return jsonify(entry), 200
+
+
+@bp.route('/history/diff', methods=['GET'])
+def history_diff():
+    history, error = _history_or_error()
+    if error:
+        return error
+    from_crawl = request.args.get('from', type=int)
+    to_crawl = request.args.get('to', type=int)
+    if from_crawl is None or to_crawl is None:
+        return _bad_request(ValueError("Parameter 'from' dan 'to' (ID crawl) wajib ada"))
+    diff = history.diff(from_crawl, to_crawl)
+    if diff is None:
+        return _not_found("Crawl", f"{from_crawl}, {to_crawl}")
+    return jsonify(diff), 200
+
+
 @bp.route('/crawl', methods=['POST'])
 def crawl():
     try:
         crawl_request = CrawlRequest.from_dict(request.get_json())
         container = get_container()
+        container.get_crawl_use_case()._validate_url(crawl_request.url)
         crawler_service = container.get_crawler_service()
-        result = crawler_service.crawl_website(crawl_request.url)
+        profiler = _make_profiler(crawl_request, container)
+        crawl_config = _crawl_config(crawl_request, container)
+        permit = _admit(crawl_config.max_concurrency)
+        if permit is not None:
+            crawl_config.max_concurrency = permit.fetches
+        try:
+            # Crawler per request dengan config request; pool dan parser tetap bersama
+            crawler = container.create_crawler(crawl_config, profiler=profiler)
+            result = crawler_service.crawl_website(
+                crawl_request.url,
+                profiler=profiler,
+                profile_dir=current_app.config['PROFILER_OUTPUT_DIR'],
+                crawler=crawler
+            )
+        finally:
+            if permit is not None:
+                permit.release()
         return jsonify(result), 200
     
+    except OverloadedError as e:
+        return _overloaded(e)
+    
     except ValueError as e:
         error = ErrorResponse(error="Invalid request", details=str(e))
         return jsonify(error.to_dict()), 400
@@ -111,46 +353,47 @@ def crawl_stream():
         container = get_container()
         
         # Validate URL first
-        url_parser = container.get_url_parser()
-        from app.use_cases.crawl_website import CrawlWebsiteUseCase
-        use_case = CrawlWebsiteUseCase(container.get_crawler(), url_parser)
-        use_case._validate_url(crawl_request.url)
+        container.get_crawl_use_case()._validate_url(crawl_request.url)
         
         # Create custom config from request
-        from app.domain.entities import CrawlConfig
-        custom_config = CrawlConfig(
-            max_pages=crawl_request.max_pages,
-            max_depth=crawl_request.max_depth,
-            timeout=crawl_request.timeout,
-            delay=crawl_request.delay,
-            verify_ssl=container.config.verify_ssl,
-            retry_count=container.config.retry_count,
-            retry_delay=container.config.retry_delay,
-            rotate_user_agent=container.config.rotate_user_agent
-        )
+        custom_config = _crawl_config(crawl_request, container)
         
-        # Create a new crawler with custom config
-        from app.infrastructure.dfs_crawler import DFSWebCrawler
-        custom_crawler = DFSWebCrawler(
-            http_client=container.get_http_client(),
-            url_parser=container.get_url_parser(),
-            link_extractor=container.get_link_extractor(),
-            config=custom_config
+        profiler = _make_profiler(crawl_request, container)
+        profile_dir = current_app.config['PROFILER_OUTPUT_DIR']
+        
+        # Crawler per request dengan config sendiri, di atas resource bersama container
+        custom_crawler = container.create_crawler(custom_config, profiler=profiler)
+        
+        event_stream = SSEEventStream(
+            flush_interval=current_app.config['STREAM_FLUSH_INTERVAL'],
+            max_batch_events=current_app.config['STREAM_MAX_BATCH_EVENTS'],
+            result_chunk_size=current_app.config['STREAM_RESULT_CHUNK_SIZE']
         )
         
+        history = container.get_history()
+        
+        def crawl_events():
+            stream = custom_crawler.crawl_stream(crawl_request.url)
+            return history.recording(stream) if history is not None else stream
+        
+        def events():
+            if profiler is None:
+                yield from crawl_events()
+                return
+            yield from profiler.profile_stream(crawl_events())
+            yield {'type': 'profile', 'profile': profiler.report(output_dir=profile_dir)}
+        
         def generate():
-            for event in custom_crawler.crawl_stream(crawl_request.url):
-                if event['type'] == 'complete':
-                    # Convert CrawlResult to dict for JSON serialization
-                    event = {
-                        'type': 'complete',
-                        'result': event['result'].to_dict()
-                    }
-                
-                # Format as SSE
-                yield f"data: {json.dumps(event)}\n\n"
+            # Frames di-yield satu per satu; crawler baru lanjut setelah server
+            # selesai menulis frame sebelumnya (backpressure dari socket)
+            yield from event_stream.stream(events())
+        
+        # Slot dipegang selama stream berjalan; crawl memakai concurrency yang diberikan
+        permit = _admit(custom_config.max_concurrency)
+        if permit is not None:
+            custom_config.max_concurrency = permit.fetches
         
-        return Response(
+        response = Response(
             stream_with_context(generate()),
             mimetype='text/event-stream',
             headers={
@@ -160,6 +403,13 @@ def crawl_stream():
                 'Access-Control-Allow-Origin': '*'
             }
         )
+        if permit is not None:
+            # Dipanggil saat stream selesai atau client disconnect
+            response.call_on_close(permit.release)
+        return response
+    
+    except OverloadedError as e:
+        return _overloaded(e)
     
     except ValueError as e:
         error = ErrorResponse(error="Invalid request", details=str(e))
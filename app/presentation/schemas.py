@@ -1,5 +1,13 @@
+import re
 from dataclasses import dataclass
-from typing import Optional
+from typing import List, Optional
+from app.domain.entities import PAGE_METADATA_FIELDS, ScopeRules
+from app.infrastructure.frontier import FRONTIER_STRATEGIES
+from app.infrastructure.scope import ScopeMatcher
+
+# Rule scope dari client dijalankan untuk setiap link: jumlah dan panjangnya dibatasi
+_MAX_SCOPE_RULES = 1000
+_MAX_SCOPE_RULE_LENGTH = 256
 
 
 @dataclass
@@ -9,6 +17,15 @@ class CrawlRequest:
     max_depth: int = 10
     timeout: float = 10.0
     delay: float = 0.1
+    strategy: Optional[str] = None  # frontier strategy, default dari config
+    timings: bool = False  # sertakan timing per stage di event 'page'
+    profile: bool = False  # jalankan sampling profiler untuk crawl ini
+    scope: Optional[ScopeRules] = None  # include/exclude rules, default dari config
+    deadline: Optional[float] = None  # batas waktu crawl (detik), default dari config
+    max_bytes: Optional[int] = None  # batas total bytes body, default dari config
+    link_graph: bool = False  # rekam link graph lengkap + analytics (butuh NumPy)
+    content_dedup: bool = False  # halaman duplikat/near-duplicate tidak di-expand
+    metadata: Optional[List[str]] = None  # metadata halaman di event 'page' dan tree, default dari config
     
     @classmethod
     def from_dict(cls, data: dict) -> 'CrawlRequest':
@@ -22,13 +39,92 @@ class CrawlRequest:
         if not isinstance(url, str):
             raise ValueError("Field 'url' harus berupa string")
         
+        strategy = data.get('strategy')
+        if strategy is not None and strategy not in FRONTIER_STRATEGIES:
+            raise ValueError(f"Field 'strategy' harus salah satu dari: {', '.join(FRONTIER_STRATEGIES)}")
+        
+        scope = cls._parse_scope(url.strip(), data.get('scope'))
+        
+        deadline = data.get('deadline')
+        if deadline is not None:
+            deadline = float(deadline)
+            if deadline < 0:
+                raise ValueError("Field 'deadline' tidak boleh negatif")
+        
+        metadata = cls._parse_metadata(data.get('metadata'))
+        
+        max_bytes = data.get('max_bytes')
+        if max_bytes is not None:
+            max_bytes = int(max_bytes)
+            if max_bytes < 0:
+                raise ValueError("Field 'max_bytes' tidak boleh negatif")
+        
         return cls(
             url=url.strip(),
             max_pages=int(data.get('max_pages', 100)),
             max_depth=int(data.get('max_depth', 10)),
             timeout=float(data.get('timeout', 10.0)),
-            delay=float(data.get('delay', 0.1))
+            delay=float(data.get('delay', 0.1)),
+            strategy=strategy,
+            timings=bool(data.get('timings', False)),
+            profile=bool(data.get('profile', False)),
+            scope=scope,
+            deadline=deadline,
+            max_bytes=max_bytes,
+            link_graph=bool(data.get('link_graph', False)),
+            content_dedup=bool(data.get('content_dedup', False)),
+            metadata=metadata
         )
+    
+    @staticmethod
+    def _parse_metadata(data) -> Optional[List[str]]:
+        """true = semua field, false = hanya links, atau list nama field"""
+        if data is None:
+            return None
+        if isinstance(data, bool):
+            return list(PAGE_METADATA_FIELDS) if data else []
+        if not (isinstance(data, list) and all(isinstance(v, str) for v in data)):
+            raise ValueError("Field 'metadata' harus berupa boolean atau list string")
+        unknown = [name for name in data if name not in PAGE_METADATA_FIELDS]
+        if unknown:
+            raise ValueError(
+                f"Field 'metadata' berisi field tidak dikenal: {', '.join(unknown)} "
+                f"(pilihan: {', '.join(PAGE_METADATA_FIELDS)})"
+            )
+        return list(dict.fromkeys(data))
+    
+    @staticmethod
+    def _parse_scope(url: str, data) -> Optional[ScopeRules]:
+        if data is None:
+            return None
+        if not isinstance(data, dict):
+            raise ValueError("Field 'scope' harus berupa object")
+        
+        for key in ('include', 'exclude', 'exclude_extensions', 'subdomains'):
+            value = data.get(key)
+            if value is None:
+                continue
+            if not (isinstance(value, list) and all(isinstance(v, str) for v in value)):
+                raise ValueError(f"Field 'scope.{key}' harus berupa list string")
+            if len(value) > _MAX_SCOPE_RULES:
+                raise ValueError(f"Field 'scope.{key}' maksimal {_MAX_SCOPE_RULES} rule")
+            if any(len(v) > _MAX_SCOPE_RULE_LENGTH for v in value):
+                raise ValueError(f"Rule 'scope.{key}' maksimal {_MAX_SCOPE_RULE_LENGTH} karakter")
+            # Regex dari client bisa backtracking eksponensial (ReDoS); glob/prefix selalu linear
+            if key in ('include', 'exclude') and any(v.strip().startswith('re:') for v in value):
+                raise ValueError(
+                    f"Field 'scope.{key}': rule regex ('re:') hanya boleh dari config server, gunakan prefix atau glob"
+                )
+        
+        try:
+            scope = ScopeRules.from_dict(data)
+            # Kompilasi sekali untuk validasi regex/glob sebelum crawl dimulai
+            ScopeMatcher(url, scope)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Field 'scope' tidak valid: {e}")
+        except re.error as e:
+            raise ValueError(f"Field 'scope' berisi regex tidak valid: {e}")
+        return scope
 
 
 @dataclass
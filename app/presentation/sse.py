@@ -0,0 +1,179 @@
+import json
+import queue
+import threading
+import time
+from typing import Iterable, Iterator, Dict, Any, List
+
+try:
+    import orjson
+except ImportError:  # orjson opsional, fallback ke json standar
+    orjson = None
+
+
+_compact_encoder = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False)
+
+# Penanda akhir stream dari thread producer
+_DONE = object()
+
+
+class _ProducerError:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def encode_event(event: Dict[str, Any]) -> str:
+    """Encode satu event menjadi SSE frame dengan JSON compact"""
+    if orjson is not None:
+        payload = orjson.dumps(event).decode('utf-8')
+    else:
+        payload = _compact_encoder.encode(event)
+    return f"data: {payload}\n\n"
+
+
+def iter_result_chunks(result: Dict[str, Any], chunk_size: int) -> Iterator[str]:
+    """
+    Memecah JSON result menjadi potongan string berukuran <= chunk_size.
+
+    Menggunakan iterencode sehingga JSON lengkap tidak pernah dibangun
+    sebagai satu string besar di memori.
+    """
+    buffer: List[str] = []
+    buffered = 0
+
+    for fragment in _compact_encoder.iterencode(result):
+        while fragment:
+            take = chunk_size - buffered
+            buffer.append(fragment[:take])
+            buffered += len(fragment[:take])
+            fragment = fragment[take:]
+
+            if buffered >= chunk_size:
+                yield ''.join(buffer)
+                buffer = []
+                buffered = 0
+
+    if buffer:
+        yield ''.join(buffer)
+
+
+class SSEEventStream:
+    """
+    Mengubah event crawler menjadi SSE frames dengan batching dan backpressure.
+
+    - Event 'page' dikumpulkan dan di-flush bersama setiap `flush_interval`
+      detik atau ketika batch mencapai `max_batch_events`. Event crawler
+      dibaca di thread producer, sehingga batch tetap di-flush tepat waktu
+      meskipun fetch berikutnya lambat (timeout x retry).
+    - Event 'complete' dikirim sebagai beberapa 'result_chunk' lalu satu
+      'complete' kecil, sehingga tidak ada frame raksasa.
+    - Antrian ke producer dibatasi `max_batch_events`: jika socket client
+      penuh, write di server blocking, antrian penuh dan crawl ikut berhenti.
+      Buffer tidak pernah melebihi 2 x `max_batch_events` event.
+    - Jika client disconnect, producer berhenti dan generator crawl ditutup.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = 0.25,
+        max_batch_events: int = 50,
+        result_chunk_size: int = 64 * 1024
+    ):
+        self.flush_interval = flush_interval
+        self.max_batch_events = max(1, max_batch_events)
+        self.result_chunk_size = max(1, result_chunk_size)
+
+    def stream(self, events: Iterable[Dict[str, Any]]) -> Iterator[str]:
+        pending: queue.Queue = queue.Queue(maxsize=self.max_batch_events)
+        stop = threading.Event()
+        producer = threading.Thread(target=self._produce, args=(events, pending, stop), daemon=True)
+        producer.start()
+
+        batch: List[str] = []
+        last_flush = time.monotonic()
+        try:
+            while True:
+                timeout = max(0.0, last_flush + self.flush_interval - time.monotonic()) if batch else None
+                try:
+                    event = pending.get(timeout=timeout)
+                except queue.Empty:
+                    # Crawler sedang menunggu fetch: page yang sudah selesai dikirim sekarang
+                    yield ''.join(batch)
+                    batch = []
+                    last_flush = time.monotonic()
+                    continue
+
+                if event is _DONE:
+                    break
+                if isinstance(event, _ProducerError):
+                    raise event.error
+
+                if event['type'] == 'complete':
+                    if batch:
+                        yield ''.join(batch)
+                        batch = []
+                    yield from self._complete_frames(event)
+                    continue
+
+                batch.append(encode_event(event))
+
+                now = time.monotonic()
+                if (
+                    event['type'] != 'page'
+                    or len(batch) >= self.max_batch_events
+                    or now - last_flush >= self.flush_interval
+                ):
+                    yield ''.join(batch)
+                    batch = []
+                    last_flush = now
+
+            if batch:
+                yield ''.join(batch)
+        finally:
+            # Client disconnect (GeneratorExit) atau error: hentikan producer
+            stop.set()
+
+    @staticmethod
+    def _produce(events: Iterable[Dict[str, Any]], pending: queue.Queue, stop: threading.Event):
+        """Thread producer: iterasi generator crawl, berhenti saat consumer berhenti"""
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    pending.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        iterator = iter(events)
+        try:
+            for event in iterator:
+                if not put(event):
+                    break
+        except Exception as e:
+            put(_ProducerError(e))
+            return
+        finally:
+            # Generator crawl ditutup di thread yang menjalankannya (cleanup executor/profiler)
+            close = getattr(iterator, 'close', None)
+            if close is not None:
+                close()
+        put(_DONE)
+
+    def _complete_frames(self, event: Dict[str, Any]) -> Iterator[str]:
+        result = event['result']
+        result_dict = result.to_dict() if hasattr(result, 'to_dict') else result
+
+        chunks = 0
+        for chunk in iter_result_chunks(result_dict, self.result_chunk_size):
+            yield encode_event({'type': 'result_chunk', 'index': chunks, 'data': chunk})
+            chunks += 1
+
+        complete = {
+            'type': 'complete',
+            'chunked': True,
+            'chunks': chunks,
+            'stop_reason': event.get('stop_reason', result_dict.get('stop_reason'))
+        }
+        if 'history_crawl_id' in event:
+            complete['history_crawl_id'] = event['history_crawl_id']
+        yield encode_event(complete)
@@ -1,16 +1,41 @@
-from typing import Dict, Any
+import time
+from typing import Dict, Any, Optional, TYPE_CHECKING
 from app.domain.entities import CrawlResult
 from app.domain.exceptions import InvalidUrlError, DomainException
+from app.domain.interfaces import ICrawler, IProfiler
 from app.use_cases.crawl_website import CrawlWebsiteUseCase
 
+if TYPE_CHECKING:
+    from app.infrastructure.crawl_history import CrawlHistoryStore
+
 
 class CrawlerService:
-    def __init__(self, crawl_use_case: CrawlWebsiteUseCase):
+    def __init__(self, crawl_use_case: CrawlWebsiteUseCase, history: Optional['CrawlHistoryStore'] = None):
         self.crawl_use_case = crawl_use_case
+        self.history = history
+    
+    def crawl_website(
+        self,
+        url: str,
+        profiler: Optional[IProfiler] = None,
+        profile_dir: Optional[str] = None,
+        crawler: Optional[ICrawler] = None
+    ) -> Dict[str, Any]:
+        started_at = time.time()
+        if profiler is None:
+            result: CrawlResult = self.crawl_use_case.execute(url, crawler=crawler)
+            return self._respond(result, started_at)
+        
+        result = profiler.run(self.crawl_use_case.execute, url, crawler=crawler)
+        response = self._respond(result, started_at)
+        response['profile'] = profiler.report(output_dir=profile_dir)
+        return response
     
-    def crawl_website(self, url: str) -> Dict[str, Any]:
-        result: CrawlResult = self.crawl_use_case.execute(url)
-        return result.to_dict()
+    def _respond(self, result: CrawlResult, started_at: float) -> Dict[str, Any]:
+        response = result.to_dict()
+        if self.history is not None:
+            response['history_crawl_id'] = self.history.record(result, started_at=started_at)
+        return response
     
     def validate_url(self, url: str) -> bool:
         try:
@@ -1,3 +1,4 @@
+from typing import Optional
 from app.domain.interfaces import ICrawler, IUrlParser
 from app.domain.entities import CrawlResult
 from app.domain.exceptions import InvalidUrlError
@@ -9,9 +10,10 @@ class CrawlWebsiteUseCase:
         self.crawler = crawler
         self.url_parser = url_parser
     
-    def execute(self, url: str) -> CrawlResult:
+    def execute(self, url: str, crawler: Optional[ICrawler] = None) -> CrawlResult:
+        """crawler: crawler per request (config sendiri), default crawler bersama"""
         self._validate_url(url)
-        result = self.crawler.crawl(url)
+        result = (crawler or self.crawler).crawl(url)
         return result
     
     def _validate_url(self, url: str) -> None:
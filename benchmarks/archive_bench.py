@@ -0,0 +1,96 @@
+"""
+Benchmark archive WARC: overhead capture saat crawl dan random access lewat mmap.
+
+Crawl website sintetis dijalankan tanpa dan dengan WarcArchiveWriter,
+lalu setiap URL dibaca ulang dalam urutan acak dari WarcArchiveReader.
+Dilaporkan pages/sec kedua crawl, ukuran archive vs total body, dan
+latency baca per halaman.
+
+    python -m benchmarks.archive_bench --pages 1000 --page-size 16384
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import List, Optional
+
+sys.path.insert(0, '.')
+
+from app.domain.entities import CrawlConfig
+from app.infrastructure.dfs_crawler import DFSWebCrawler
+from app.infrastructure.http_client import RequestsHttpClient
+from app.infrastructure.link_extractor import BeautifulSoupLinkExtractor
+from app.infrastructure.page_archive import WarcArchiveReader, WarcArchiveWriter
+from app.infrastructure.url_parser import UrlParser
+from benchmarks.load_test import percentile
+from benchmarks.synthetic_site import SiteSpec, SyntheticSite, SyntheticServer
+
+
+def crawl(base_url: str, pages: int, page_sink=None) -> float:
+    crawler = DFSWebCrawler(
+        http_client=RequestsHttpClient(),
+        url_parser=UrlParser(allow_private_hosts=True),
+        link_extractor=BeautifulSoupLinkExtractor(),
+        config=CrawlConfig(
+            max_pages=pages, max_depth=10, delay=0.0, retry_count=1,
+            rotate_user_agent=False, allow_private_hosts=True
+        ),
+        page_sink=page_sink
+    )
+    start = time.perf_counter()
+    result = crawler.crawl(base_url + '/')
+    return result.pages_crawled / (time.perf_counter() - start)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=1000)
+    parser.add_argument('--page-size', type=int, default=16384)
+    parser.add_argument('--output', help='Simpan hasil sebagai JSON')
+    args = parser.parse_args(argv)
+
+    site = SyntheticSite(SiteSpec(pages=args.pages, fanout=8, depth=5, page_size=args.page_size))
+    archive_path = os.path.join(tempfile.mkdtemp(), 'bench.warc.gz')
+
+    with SyntheticServer(site) as server:
+        plain_pps = crawl(server.base_url, args.pages)
+        writer = WarcArchiveWriter(archive_path)
+        capture_pps = crawl(server.base_url, args.pages, writer)
+        start = time.perf_counter()
+        writer.close()
+        drain_ms = (time.perf_counter() - start) * 1000
+
+    body_bytes = sum(len(site.render(path)) for path in site.paths)
+    read_ms = []
+    with WarcArchiveReader(archive_path) as reader:
+        urls = list(reader.urls())
+        random.Random(0).shuffle(urls)
+        for url in urls:
+            start = time.perf_counter()
+            reader.get(url)
+            read_ms.append((time.perf_counter() - start) * 1000)
+
+    report = {
+        'pages': len(urls),
+        'crawl_pages_per_second': round(plain_pps, 1),
+        'crawl_with_archive_pages_per_second': round(capture_pps, 1),
+        'writer_drain_ms': round(drain_ms, 2),
+        'body_bytes': body_bytes,
+        'archive_bytes': os.path.getsize(archive_path),
+        'index_bytes': os.path.getsize(archive_path + '.idx'),
+        'read_p50_ms': round(percentile(read_ms, 50), 3),
+        'read_p99_ms': round(percentile(read_ms, 99), 3),
+    }
+    for key, value in report.items():
+        print(f"{key:<38} {value}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""
+Simulasi adaptive concurrency terhadap server sintetis dengan kapasitas terbatas.
+
+Server melayani `--capacity` request paralel tanpa melambat; di atasnya
+latency naik sebanding beban, dan di atas capacity * 2 request ditolak
+dengan 503. Setiap mode crawl dibandingkan dari pages/sec, jumlah page
+gagal (503) dan beban puncak di server.
+
+    python -m benchmarks.concurrency_bench --capacity 4 --latency 0.02
+
+Mode: fixed-<n> (window tetap n) dan adaptive (AIMD, maksimum --max-concurrency).
+"""
+import argparse
+import json
+import sys
+import time
+from typing import Dict, List, Optional
+
+sys.path.insert(0, '.')
+
+from app.domain.entities import CrawlConfig
+from app.infrastructure.dfs_crawler import DFSWebCrawler
+from app.infrastructure.http_client import RequestsHttpClient
+from app.infrastructure.link_extractor import BeautifulSoupLinkExtractor
+from app.infrastructure.url_parser import UrlParser
+from benchmarks.synthetic_site import SiteSpec, SyntheticSite, SyntheticServer
+
+
+def run_mode(mode: str, spec: SiteSpec, max_concurrency: int, retry_count: int) -> Dict:
+    if mode == 'adaptive':
+        concurrency, adaptive = max_concurrency, True
+    else:
+        concurrency, adaptive = int(mode.split('-', 1)[1]), False
+
+    site = SyntheticSite(spec)
+    config = CrawlConfig(
+        max_pages=spec.pages,
+        max_depth=spec.depth,
+        delay=0.0,
+        retry_count=retry_count,
+        retry_delay=0.05,
+        rotate_user_agent=False,
+        allow_private_hosts=True,
+        frontier_strategy='bfs',
+        max_concurrency=concurrency,
+        adaptive_concurrency=adaptive
+    )
+    crawler = DFSWebCrawler(
+        http_client=RequestsHttpClient(pool_maxsize=concurrency * 2),
+        url_parser=UrlParser(allow_private_hosts=True),
+        link_extractor=BeautifulSoupLinkExtractor(),
+        config=config
+    )
+
+    windows: List[int] = []
+    with SyntheticServer(site) as server:
+        start = time.perf_counter()
+        for event in crawler.crawl_stream(server.base_url + '/'):
+            if event['type'] == 'page' and 'concurrency' in event:
+                windows.append(event['concurrency'])
+            elif event['type'] == 'complete':
+                result = event['result']
+        elapsed = time.perf_counter() - start
+
+    return {
+        'mode': mode,
+        'pages': result.pages_crawled,
+        'failed_pages': len(result.invalid_routes),
+        'seconds': round(elapsed, 3),
+        'pages_per_second': round(result.pages_crawled / elapsed, 1) if elapsed else 0.0,
+        'server_max_in_flight': site.max_in_flight,
+        'server_rejected': site.overloaded,
+        'mean_window': round(sum(windows) / len(windows), 2) if windows else concurrency,
+        'concurrency': result.concurrency,
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--modes', default='fixed-1,fixed-4,fixed-16,adaptive')
+    parser.add_argument('--capacity', type=int, default=4)
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--pages', type=int, default=300)
+    parser.add_argument('--max-concurrency', type=int, default=16)
+    parser.add_argument('--retry-count', type=int, default=1)
+    parser.add_argument('--output', help='Simpan hasil sebagai JSON')
+    args = parser.parse_args(argv)
+
+    spec = SiteSpec(pages=args.pages, fanout=8, depth=5, cross_links=1, latency=args.latency, capacity=args.capacity)
+    report = {'site': spec.to_dict(), 'runs': []}
+
+    for mode in args.modes.split(','):
+        run = run_mode(mode, spec, args.max_concurrency, args.retry_count)
+        report['runs'].append(run)
+        print(
+            f"{mode:<9} pages/s={run['pages_per_second']:<7} failed={run['failed_pages']:<4} "
+            f"server_peak={run['server_max_in_flight']:<3} rejected={run['server_rejected']:<4} "
+            f"mean_window={run['mean_window']}"
+        )
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+"""
+Benchmark end-to-end DFSWebCrawler terhadap website sintetis lokal.
+
+Setiap skenario menjalankan crawl penuh dan melaporkan pages/sec,
+bytes/sec, CPU time, peak RSS dan waktu per stage (fetch, parse,
+normalize, event emission). Hasil disimpan sebagai JSON sehingga bisa
+dibandingkan dengan run sebelumnya:
+
+    python -m benchmarks.crawl_bench --output benchmarks/results/base.json
+    python -m benchmarks.crawl_bench --compare benchmarks/results/base.json
+"""
+import argparse
+import json
+import platform
+import resource
+import sys
+import time
+from typing import Dict, List, Optional
+
+sys.path.insert(0, '.')
+
+from app.domain.entities import CrawlConfig
+from app.infrastructure.dfs_crawler import DFSWebCrawler
+from app.infrastructure.http_client import RequestsHttpClient
+from app.infrastructure.link_extractor import BeautifulSoupLinkExtractor
+from app.infrastructure.url_parser import UrlParser
+from app.presentation.sse import SSEEventStream
+from benchmarks.synthetic_site import SiteSpec, SyntheticServerProcess
+
+
+SCENARIOS: Dict[str, SiteSpec] = {
+    'small': SiteSpec(pages=100, fanout=5, depth=4),
+    'wide': SiteSpec(pages=500, fanout=40, depth=2),
+    'deep': SiteSpec(pages=500, fanout=2, depth=12),
+    'large-pages': SiteSpec(pages=200, fanout=5, depth=5, page_size=64 * 1024),
+    'slow': SiteSpec(pages=100, fanout=5, depth=4, latency=0.01, latency_jitter=0.01),
+    'flaky': SiteSpec(pages=200, fanout=5, depth=5, error_rate=0.1),
+}
+
+# Metrik di mana nilai lebih besar berarti lebih baik
+HIGHER_IS_BETTER = {'pages_per_sec', 'bytes_per_sec'}
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux melaporkan kB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_scenario(name: str, spec: SiteSpec, max_pages: Optional[int] = None) -> dict:
+    config = CrawlConfig(
+        max_pages=max_pages or spec.pages,
+        max_depth=spec.depth + 1,
+        timeout=10,
+        delay=0.0,
+        retry_count=1,
+        retry_delay=0.0,
+        rotate_user_agent=False,
+        allow_private_hosts=True,
+        collect_timings=True
+    )
+    crawler = DFSWebCrawler(
+        http_client=RequestsHttpClient(),
+        url_parser=UrlParser(allow_private_hosts=True),
+        link_extractor=BeautifulSoupLinkExtractor(),
+        config=config
+    )
+    event_stream = SSEEventStream(flush_interval=0.0)
+    state = {'crawl_time': 0.0, 'result': None}
+    totals = {'fetch': 0.0, 'parse': 0.0, 'normalize': 0.0, 'bytes': 0}
+
+    with SyntheticServerProcess(spec) as server:
+        crawl_events = crawler.crawl_stream(server.base_url + '/')
+
+        def timed_events():
+            # Pisahkan waktu di dalam crawler dari waktu encode SSE
+            while True:
+                start = time.perf_counter()
+                event = next(crawl_events, None)
+                state['crawl_time'] += time.perf_counter() - start
+                if event is None:
+                    return
+                if event['type'] == 'page':
+                    for key in totals:
+                        totals[key] += event['timings'][key]
+                elif event['type'] == 'complete':
+                    state['result'] = event['result']
+                yield event
+
+        sse_bytes = 0
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        for frame in event_stream.stream(timed_events()):
+            sse_bytes += len(frame)
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+
+    stages = {stage: round(totals[stage], 4) for stage in ('fetch', 'parse', 'normalize')}
+    measured = sum(stages.values())
+    stages['event_emission'] = round(max(0.0, wall - state['crawl_time']), 4)
+    stages['other'] = round(max(0.0, state['crawl_time'] - measured), 4)
+    pages = state['result'].pages_crawled if state['result'] else 0
+
+    return {
+        'scenario': name,
+        'site': spec.to_dict(),
+        'pages': pages,
+        'bytes': totals['bytes'],
+        'wall_time': round(wall, 4),
+        'cpu_time': round(cpu, 4),
+        'pages_per_sec': round(pages / wall, 2) if wall else 0.0,
+        'bytes_per_sec': round(totals['bytes'] / wall, 2) if wall else 0.0,
+        'peak_rss_mb': round(peak_rss_mb(), 2),
+        'stages': stages,
+        'sse_bytes': sse_bytes,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> List[str]:
+    """Bandingkan dua hasil benchmark, return daftar regresi"""
+    regressions = []
+    baseline_runs = {run['scenario']: run for run in baseline['runs']}
+
+    for run in current['runs']:
+        base = baseline_runs.get(run['scenario'])
+        if base is None:
+            continue
+        for metric in ('pages_per_sec', 'bytes_per_sec', 'cpu_time', 'peak_rss_mb'):
+            old, new = base[metric], run[metric]
+            if not old:
+                continue
+            change = (new - old) / old
+            worse = -change if metric in HIGHER_IS_BETTER else change
+            marker = 'REGRESSION' if worse > threshold else ''
+            print(f"  {run['scenario']:<12} {metric:<14} {old:>12} -> {new:>12} ({change:+.1%}) {marker}")
+            if marker:
+                regressions.append(f"{run['scenario']}.{metric}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS), help='Daftar skenario, dipisah koma')
+    parser.add_argument('--max-pages', type=int, help='Override max_pages crawler')
+    parser.add_argument('--output', help='Simpan hasil sebagai JSON')
+    parser.add_argument('--compare', help='File JSON hasil sebelumnya untuk dibandingkan')
+    parser.add_argument('--threshold', type=float, default=0.10, help='Batas regresi relatif (default 10%%)')
+    args = parser.parse_args(argv)
+
+    report = {
+        'version': 1,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'runs': [],
+    }
+
+    for name in args.scenarios.split(','):
+        run = run_scenario(name, SCENARIOS[name], args.max_pages)
+        report['runs'].append(run)
+        stages = ' '.join(f"{k}={v:.3f}s" for k, v in run['stages'].items())
+        print(
+            f"{name:<12} pages={run['pages']:<5} {run['pages_per_sec']:>8.1f} pages/s "
+            f"{run['bytes_per_sec'] / 1024:>9.1f} KiB/s cpu={run['cpu_time']:.3f}s "
+            f"rss={run['peak_rss_mb']:.1f}MB | {stages}"
+        )
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"\nPerbandingan dengan {args.compare}:")
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regresi: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
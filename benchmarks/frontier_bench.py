@@ -0,0 +1,103 @@
+"""
+Benchmark frontier strategy (dfs, bfs, best_first) pada website sintetis.
+
+Dengan budget max_pages yang lebih kecil dari ukuran site, diukur berapa
+banyak route unik yang ditemukan (di-fetch atau ter-link dari halaman yang
+di-fetch) per halaman yang di-fetch, dan berapa persen section level atas
+yang tersentuh.
+
+    python -m benchmarks.frontier_bench --max-pages 100
+"""
+import argparse
+import json
+import sys
+from typing import Dict, List, Optional
+
+sys.path.insert(0, '.')
+
+from app.domain.entities import CrawlConfig
+from app.infrastructure.dfs_crawler import DFSWebCrawler
+from app.infrastructure.frontier import FRONTIER_STRATEGIES
+from app.infrastructure.http_client import RequestsHttpClient
+from app.infrastructure.link_extractor import BeautifulSoupLinkExtractor
+from app.infrastructure.url_parser import UrlParser
+from benchmarks.synthetic_site import SiteSpec, SyntheticSite, SyntheticServer
+
+
+SCENARIOS: Dict[str, SiteSpec] = {
+    'archive': SiteSpec(pages=400, fanout=8, depth=4, archive_pages=500),
+    'wide': SiteSpec(pages=600, fanout=20, depth=3, cross_links=4),
+    'deep': SiteSpec(pages=600, fanout=3, depth=10, cross_links=1),
+}
+
+
+def section_of(path: str) -> str:
+    return path.strip('/').split('/', 1)[0]
+
+
+def run_strategy(site: SyntheticSite, base_url: str, strategy: str, max_pages: int) -> dict:
+    config = CrawlConfig(
+        max_pages=max_pages,
+        max_depth=10_000,
+        delay=0.0,
+        retry_count=1,
+        retry_delay=0.0,
+        rotate_user_agent=False,
+        allow_private_hosts=True,
+        frontier_strategy=strategy
+    )
+    crawler = DFSWebCrawler(
+        http_client=RequestsHttpClient(),
+        url_parser=UrlParser(allow_private_hosts=True),
+        link_extractor=BeautifulSoupLinkExtractor(),
+        config=config
+    )
+    result = crawler.crawl(base_url + '/')
+
+    fetched = set(result.found_routes) | set(result.invalid_routes)
+    discovered = set(fetched)
+    for route in result.found_routes:
+        discovered.update(site.children.get(route, []))
+
+    sections = {section_of(path) for path in site.paths if path != '/'}
+    touched = {section_of(path) for path in fetched if path != '/'}
+
+    return {
+        'strategy': strategy,
+        'pages_fetched': result.pages_crawled,
+        'routes_discovered': len(discovered),
+        'discovered_per_fetch': round(len(discovered) / result.pages_crawled, 3) if result.pages_crawled else 0.0,
+        'section_coverage': round(len(touched & sections) / len(sections), 3) if sections else 0.0,
+        'max_depth_reached': result.max_depth_reached,
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS))
+    parser.add_argument('--strategies', default=','.join(FRONTIER_STRATEGIES))
+    parser.add_argument('--max-pages', type=int, default=100)
+    parser.add_argument('--output', help='Simpan hasil sebagai JSON')
+    args = parser.parse_args(argv)
+
+    report = {'max_pages': args.max_pages, 'runs': []}
+    for name in args.scenarios.split(','):
+        site = SyntheticSite(SCENARIOS[name])
+        with SyntheticServer(site) as server:
+            for strategy in args.strategies.split(','):
+                run = run_strategy(site, server.base_url, strategy, args.max_pages)
+                run['scenario'] = name
+                report['runs'].append(run)
+                print(
+                    f"{name:<8} {strategy:<11} fetched={run['pages_fetched']:<5} "
+                    f"discovered={run['routes_discovered']:<5} per_fetch={run['discovered_per_fetch']:<7} "
+                    f"sections={run['section_coverage']:.0%} max_depth={run['max_depth_reached']}"
+                )
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark frontier dengan budget memori (spill ke disk) vs frontier biasa.
+
+Crawl disimulasikan tanpa HTTP: setiap halaman yang di-pop mem-push
+--fanout link baru (URL unik seperti situs besar dengan banyak link), sehingga
+frontier jauh lebih besar dari jumlah halaman yang di-fetch. Setiap kombinasi
+strategy x budget dijalankan di proses terpisah supaya peak RSS bisa
+dibandingkan; digest urutan pop harus sama untuk semua budget.
+
+    python -m benchmarks.frontier_spill_bench --pages 20000 --fanout 30 --limits 0,8000000,1000000
+"""
+import argparse
+import hashlib
+import json
+import subprocess
+import sys
+import time
+from typing import List, Optional
+
+sys.path.insert(0, '.')
+
+from app.infrastructure.frontier import create_frontier
+from benchmarks.crawl_bench import peak_rss_mb
+
+
+def simulate(strategy: str, limit: int, pages: int, fanout: int) -> dict:
+    baseline_rss = peak_rss_mb()
+    frontier = create_frontier(strategy, limit)
+    digest = hashlib.sha1()
+    frontier.push('https://big.example/', 0, None)
+    start = time.perf_counter()
+    for page in range(pages):
+        if not frontier:
+            break
+        url, depth, _ = frontier.pop()
+        digest.update(url.encode())
+        for i in range(fanout):
+            frontier.push(f'https://big.example/catalog/item-{page}-{i}/details?ref=listing&page={depth}', depth + 1, url)
+    elapsed = time.perf_counter() - start
+    stats = frontier.stats() if hasattr(frontier, 'stats') else {}
+    return {
+        'strategy': strategy,
+        'memory_limit': limit,
+        'pending': len(frontier),
+        'seconds': round(elapsed, 3),
+        'rss_growth_mb': round(peak_rss_mb() - baseline_rss, 1),
+        'spill_mb': round(stats.get('spill_bytes', 0) / 1e6, 1),
+        'order_digest': digest.hexdigest()[:16],
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=20000)
+    parser.add_argument('--fanout', type=int, default=30)
+    parser.add_argument('--strategies', default='dfs,bfs')
+    parser.add_argument('--limits', default='0,8000000,1000000', help='Budget memori (bytes), 0 = tanpa batas')
+    parser.add_argument('--run', nargs=2, metavar=('STRATEGY', 'LIMIT'), help=argparse.SUPPRESS)
+    parser.add_argument('--output', help='Simpan hasil sebagai JSON')
+    args = parser.parse_args(argv)
+
+    if args.run:
+        print(json.dumps(simulate(args.run[0], int(args.run[1]), args.pages, args.fanout)))
+        return
+
+    report = {'pages': args.pages, 'fanout': args.fanout, 'runs': []}
+    for strategy in args.strategies.split(','):
+        digests = set()
+        for limit in (int(value) for value in args.limits.split(',')):
+            output = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.frontier_spill_bench', '--pages', str(args.pages),
+                 '--fanout', str(args.fanout), '--run', strategy, str(limit)],
+                capture_output=True, text=True, check=True
+            ).stdout
+            run = json.loads(output.strip().splitlines()[-1])
+            digests.add(run['order_digest'])
+            report['runs'].append(run)
+            print(
+                f"{strategy:<4} limit={limit / 1e6:>5.1f}MB pending={run['pending']:<9} "
+                f"rss+={run['rss_growth_mb']:>7.1f}MB spill={run['spill_mb']:>6.1f}MB "
+                f"time={run['seconds']:.2f}s order={run['order_digest']}"
+            )
+        if len(digests) != 1:
+            print(f"PERINGATAN: urutan traversal {strategy} berbeda antar budget")
+            sys.exit(1)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+"""
+Server HTTP/2 cleartext (h2c, prior knowledge) untuk SyntheticSite.
+
+Setiap koneksi dilayani satu thread pembaca; setiap stream dijawab di
+thread sendiri setelah latency sintetis, sehingga banyak request bisa
+berjalan bersamaan di atas satu koneksi. Server mencatat jumlah koneksi
+dan jumlah stream aktif maksimum untuk benchmark.
+
+Butuh paket `h2` (requirements-http2.txt).
+"""
+import socket
+import threading
+import time
+from typing import Optional
+
+import h2.config
+import h2.connection
+import h2.events
+import h2.exceptions
+
+from benchmarks.synthetic_site import SyntheticSite
+
+
+class H2SyntheticServer:
+    def __init__(self, site: SyntheticSite, port: int = 0):
+        self.site = site
+        self.connections = 0
+        self.max_concurrent_streams = 0
+        self._active_streams = 0
+        self._stats_lock = threading.Lock()
+        self._sock = socket.create_server(('127.0.0.1', port))
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._sock.getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'H2SyntheticServer':
+        self._running = True
+        self._thread = threading.Thread(target=self._accept_loop, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._running = False
+        self._sock.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _accept_loop(self):
+        while self._running:
+            try:
+                client, _ = self._sock.accept()
+            except OSError:
+                break
+            client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            with self._stats_lock:
+                self.connections += 1
+            threading.Thread(target=self._serve_connection, args=(client,), daemon=True).start()
+
+    def _serve_connection(self, client: socket.socket):
+        conn = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False, header_encoding='utf-8'))
+        # Condition melindungi state h2 dan socket; writer menunggu di sini saat flow-control window habis
+        lock = threading.Condition()
+        with lock:
+            conn.initiate_connection()
+            client.sendall(conn.data_to_send())
+
+        try:
+            while True:
+                data = client.recv(65535)
+                if not data:
+                    break
+                with lock:
+                    try:
+                        events = conn.receive_data(data)
+                    except h2.exceptions.ProtocolError:
+                        # Bukan client h2c (mis. HTTP/1.1)
+                        client.sendall(conn.data_to_send())
+                        break
+                    for event in events:
+                        if isinstance(event, h2.events.RequestReceived):
+                            path = dict(event.headers).get(':path', '/')
+                            threading.Thread(
+                                target=self._respond, args=(conn, lock, client, event.stream_id, path), daemon=True
+                            ).start()
+                        elif isinstance(event, (h2.events.WindowUpdated, h2.events.StreamReset)):
+                            lock.notify_all()
+                        elif isinstance(event, h2.events.ConnectionTerminated):
+                            return
+                    pending = conn.data_to_send()
+                    if pending:
+                        client.sendall(pending)
+        except OSError:
+            pass
+        finally:
+            client.close()
+
+    def _respond(self, conn, lock: threading.Condition, client: socket.socket, stream_id: int, path: str):
+        with self._stats_lock:
+            self._active_streams += 1
+            self.max_concurrent_streams = max(self.max_concurrent_streams, self._active_streams)
+        try:
+            delay = self.site.delay()
+            if delay:
+                time.sleep(delay)
+
+            location = self.site.redirect_target(path)
+            if location is not None:
+                status, payload, extra = 301, b'', [('location', location)]
+            else:
+                status, payload = self.site.handle(path)
+                extra = []
+
+            headers = [
+                (':status', str(status)),
+                ('content-type', 'text/html; charset=utf-8'),
+                ('content-length', str(len(payload))),
+            ] + extra
+
+            with lock:
+                conn.send_headers(stream_id, headers, end_stream=not payload)
+                client.sendall(conn.data_to_send())
+                offset = 0
+                while offset < len(payload):
+                    window = min(conn.local_flow_control_window(stream_id), conn.max_outbound_frame_size)
+                    if window <= 0:
+                        lock.wait(timeout=1.0)
+                        continue
+                    chunk = payload[offset:offset + window]
+                    offset += len(chunk)
+                    conn.send_data(stream_id, chunk, end_stream=offset >= len(payload))
+                    client.sendall(conn.data_to_send())
+        except (h2.exceptions.StreamClosedError, h2.exceptions.ProtocolError, OSError):
+            pass
+        finally:
+            with self._stats_lock:
+                self._active_streams -= 1
@@ -0,0 +1,105 @@
+"""
+Benchmark history crawl SQLite: ingest ribuan crawl, lalu latency query.
+
+Setiap crawl sintetis memuat --routes route dari satu site, dengan sebagian
+kecil route berganti (muncul/hilang) dan berubah status antar crawl, seperti
+crawl berulang pada situs yang hidup. Dilaporkan waktu ingest per crawl dan
+p50/p99 untuk history route, ringkasan site, route invalid minggu terakhir
+dan diff dua crawl.
+
+    python -m benchmarks.history_bench --crawls 2000 --routes 500
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Callable, List, Optional
+
+sys.path.insert(0, '.')
+
+from app.domain.entities import CrawlResult
+from app.infrastructure.crawl_history import CrawlHistoryStore
+from benchmarks.load_test import percentile
+
+
+def make_result(rng: random.Random, crawl: int, routes: int, churn: float) -> CrawlResult:
+    # Route bergeser pelan: route lama hilang, route baru muncul
+    offset = int(crawl * routes * churn)
+    found, invalid = [], []
+    for i in range(offset, offset + routes):
+        (invalid if rng.random() < 0.03 else found).append(f'/section-{i % 20}/page/{i}')
+    return CrawlResult(
+        start_url='https://bench.example/',
+        found_routes=found,
+        invalid_routes=invalid,
+        pages_crawled=routes,
+        route_depths={route: route.count('/') for route in found + invalid}
+    )
+
+
+def measure(fn: Callable, runs: int) -> dict:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {'p50_ms': round(percentile(samples, 50), 3), 'p99_ms': round(percentile(samples, 99), 3)}
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--crawls', type=int, default=2000)
+    parser.add_argument('--routes', type=int, default=500)
+    parser.add_argument('--churn', type=float, default=0.01, help='Fraksi route yang berganti per crawl')
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Simpan hasil sebagai JSON')
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    path = os.path.join(tempfile.mkdtemp(), 'history.db')
+    store = CrawlHistoryStore(path)
+
+    # Crawl disebar mundur satu jam per crawl, yang terbaru paling akhir
+    now = time.time()
+    ingest_ms = []
+    crawl_ids = []
+    for crawl in range(args.crawls):
+        result = make_result(rng, crawl, args.routes, args.churn)
+        start = time.perf_counter()
+        crawl_ids.append(store.record(result, started_at=now - (args.crawls - crawl) * 3600))
+        ingest_ms.append((time.perf_counter() - start) * 1000)
+
+    latest = make_result(random.Random(args.seed), args.crawls - 1, args.routes, args.churn)
+    sample_routes = latest.found_routes
+
+    report = {
+        'crawls': args.crawls,
+        'routes_per_crawl': args.routes,
+        'db_bytes': os.path.getsize(path),
+        'ingest_p50_ms': round(percentile(ingest_ms, 50), 3),
+        'ingest_p99_ms': round(percentile(ingest_ms, 99), 3),
+        'route_history': measure(
+            lambda: store.route_history('bench.example', rng.choice(sample_routes), limit=50), args.queries
+        ),
+        'site_summary': measure(lambda: store.site_summary('bench.example'), args.queries),
+        'invalid_last_week': measure(
+            lambda: store.routes('bench.example', valid=False, since=now - 7 * 24 * 3600), args.queries
+        ),
+        'diff': measure(lambda: store.diff(rng.choice(crawl_ids), crawl_ids[-1]), args.queries),
+    }
+    store.close()
+
+    for key, value in report.items():
+        print(f"{key:<20} {value}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+"""
+Benchmark transport HTTP: RequestsHttpClient (HTTP/1.1) vs Http2HttpClient.
+
+Sejumlah thread (mensimulasikan crawl yang berjalan bersamaan ke host yang
+sama) mengambil halaman dari website sintetis lokal. Dilaporkan latency
+p50/p99 per request, throughput, jumlah koneksi TCP yang dibuka server
+dan versi HTTP yang dipakai.
+
+    python -m benchmarks.http2_bench --concurrency 16 --requests 800 --latency 0.02
+
+Skenario:
+- http1:     RequestsHttpClient -> server HTTP/1.1
+- h2c:       Http2HttpClient (prior knowledge) -> server h2c lokal
+- fallback:  Http2HttpClient (prior knowledge) -> server HTTP/1.1
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+sys.path.insert(0, '.')
+
+from app.infrastructure.http_client import RequestsHttpClient
+from benchmarks.load_test import percentile
+from benchmarks.synthetic_site import SiteSpec, SyntheticSite, SyntheticServer
+
+SCENARIOS = ('http1', 'h2c', 'fallback')
+
+
+def run_load(client, base_url: str, paths: List[str], concurrency: int, total: int) -> Dict:
+    latencies: List[float] = []
+    versions: Counter = Counter()
+    failures = 0
+    lock = threading.Lock()
+    counter = iter(range(total))
+
+    def worker():
+        nonlocal failures
+        for i in counter:
+            start = time.perf_counter()
+            response = client.get(base_url + paths[i % len(paths)], timeout=10, headers={}, retry_count=1)
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                if response is None or not response.is_html:
+                    failures += 1
+                else:
+                    versions[response.http_version] += 1
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+
+    return {
+        'requests': len(latencies),
+        'failures': failures,
+        'wall_seconds': round(wall, 3),
+        'requests_per_second': round(len(latencies) / wall, 1) if wall else 0.0,
+        'latency_p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'latency_p99_ms': round(percentile(latencies, 99) * 1000, 2),
+        'http_versions': dict(versions),
+    }
+
+
+def run_scenario(name: str, spec: SiteSpec, concurrency: int, total: int) -> Dict:
+    from app.infrastructure.http2_client import Http2HttpClient
+
+    site = SyntheticSite(spec)
+    paths = [path for path in site.paths if path not in site.broken]
+
+    if name == 'h2c':
+        from benchmarks.h2_server import H2SyntheticServer
+        server = H2SyntheticServer(site)
+    else:
+        server = SyntheticServer(site)
+    client = RequestsHttpClient() if name == 'http1' else Http2HttpClient(prior_knowledge=True)
+
+    with server:
+        run = run_load(client, server.base_url, paths, concurrency, total)
+        run['server_connections'] = server.connections
+        if name == 'h2c':
+            run['max_concurrent_streams'] = server.max_concurrent_streams
+
+    if hasattr(client, 'close'):
+        client.close()
+    run['scenario'] = name
+    return run
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS))
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=800)
+    parser.add_argument('--latency', type=float, default=0.02, help='Latency server sintetis per request (detik)')
+    parser.add_argument('--page-size', type=int, default=16384)
+    parser.add_argument('--output', help='Simpan hasil sebagai JSON')
+    args = parser.parse_args(argv)
+
+    spec = SiteSpec(pages=200, fanout=5, depth=4, page_size=args.page_size, latency=args.latency)
+    report = {'concurrency': args.concurrency, 'site': spec.to_dict(), 'runs': []}
+
+    for name in args.scenarios.split(','):
+        run = run_scenario(name, spec, args.concurrency, args.requests)
+        report['runs'].append(run)
+        print(
+            f"{name:<9} req/s={run['requests_per_second']:<8} p50={run['latency_p50_ms']}ms "
+            f"p99={run['latency_p99_ms']}ms connections={run['server_connections']:<4} "
+            f"versions={run['http_versions']} failures={run['failures']}"
+        )
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+"""
+Load test untuk /crawl/stream terhadap website sintetis lokal.
+
+Menjalankan serve.py (gunicorn + gevent) sebagai subprocess, lalu membuka
+banyak stream SSE sekaligus pada beberapa level concurrency. Untuk setiap
+level dilaporkan jumlah stream yang selesai, yang ditolak admission control
+(429), p50/p99 time-to-first-event dan durasi stream. Capacity = level
+tertinggi di mana setiap stream selesai atau ditolak cepat (tanpa error) dan
+p99 time-to-first-event stream yang diterima di bawah --ttfe-slo.
+
+Stream dibagi rata ke --tenants tenant (header X-Tenant-ID).
+--admission off mematikan admission control untuk perbandingan.
+
+    python -m benchmarks.load_test --levels 10,50,100,200
+    python -m benchmarks.load_test --levels 10,50,100,200 --admission off
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from typing import List, Optional
+
+import requests
+
+sys.path.insert(0, '.')
+
+from benchmarks.synthetic_site import SiteSpec, SyntheticSite, SyntheticServer
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_stream(server_url: str, target_url: str, body: dict, out: dict, tenant: str):
+    start = time.perf_counter()
+    out['ttfe'] = None
+    out['completed'] = False
+    try:
+        with requests.post(
+            f"{server_url}/crawl/stream",
+            json={'url': target_url, **body},
+            headers={'X-Tenant-ID': tenant},
+            stream=True,
+            timeout=120
+        ) as response:
+            if response.status_code == 429:
+                out['rejected'] = True
+                out['duration'] = time.perf_counter() - start
+                return
+            for chunk in response.iter_content(chunk_size=None):
+                if out['ttfe'] is None and b'data: ' in chunk:
+                    out['ttfe'] = time.perf_counter() - start
+                if b'"type":"complete"' in chunk:
+                    out['completed'] = True
+    except requests.RequestException as e:
+        out['error'] = str(e)
+    out['duration'] = time.perf_counter() - start
+
+
+def run_level(server_url: str, target_url: str, streams: int, body: dict, tenants: int) -> dict:
+    results = [dict() for _ in range(streams)]
+    threads = [
+        threading.Thread(target=run_stream, args=(server_url, target_url, body, results[i], f'tenant-{i % tenants}'))
+        for i in range(streams)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    ttfes = [r['ttfe'] for r in results if r.get('ttfe') is not None]
+    durations = [r['duration'] for r in results if r.get('completed')]
+    rejections = [r['duration'] for r in results if r.get('rejected')]
+    return {
+        'streams': streams,
+        'completed': sum(1 for r in results if r.get('completed')),
+        'rejected': len(rejections),
+        'reject_p99': round(percentile(rejections, 99), 4),
+        'errors': sum(1 for r in results if 'error' in r),
+        'ttfe_p50': round(percentile(ttfes, 50), 4),
+        'ttfe_p99': round(percentile(ttfes, 99), 4),
+        'duration_p50': round(percentile(durations, 50), 4),
+        'duration_p99': round(percentile(durations, 99), 4),
+    }
+
+
+def wait_for_health(server_url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(f"{server_url}/health", timeout=1).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server {server_url} tidak siap dalam {timeout}s")
+
+
+def start_server(port: int, workers: int, admission: bool) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        'FLASK_ENV': 'production',
+        'HOST': '127.0.0.1',
+        'PORT': str(port),
+        'SERVER_WORKERS': str(workers),
+        'CRAWLER_ALLOW_PRIVATE_HOSTS': 'True',
+        'ADMISSION_ENABLED': str(admission),
+    }
+    return subprocess.Popen(
+        [sys.executable, 'serve.py'],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--server-url', help='Pakai server yang sudah berjalan (harus CRAWLER_ALLOW_PRIVATE_HOSTS=True)')
+    parser.add_argument('--port', type=int, default=5055)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--levels', default='10,50,100')
+    parser.add_argument('--pages', type=int, default=20, help='max_pages per crawl')
+    parser.add_argument('--site-latency', type=float, default=0.02)
+    parser.add_argument('--ttfe-slo', type=float, default=1.0, help='Batas p99 time-to-first-event (detik)')
+    parser.add_argument('--tenants', type=int, default=8)
+    parser.add_argument('--admission', choices=('on', 'off'), default='on')
+    parser.add_argument('--output', help='Simpan hasil sebagai JSON')
+    args = parser.parse_args(argv)
+
+    body = {'max_pages': args.pages, 'max_depth': 10, 'timeout': 5, 'delay': 0.01}
+    site = SyntheticSite(SiteSpec(pages=max(args.pages * 2, 50), fanout=5, latency=args.site_latency))
+
+    process = None
+    server_url = args.server_url
+    if not server_url:
+        server_url = f"http://127.0.0.1:{args.port}"
+        process = start_server(args.port, args.workers, args.admission == 'on')
+
+    report = {'levels': [], 'capacity': 0}
+    try:
+        wait_for_health(server_url)
+        with SyntheticServer(site) as site_server:
+            for level in [int(x) for x in args.levels.split(',')]:
+                stats = run_level(server_url, site_server.base_url + '/', level, body, args.tenants)
+                report['levels'].append(stats)
+                print(
+                    f"streams={stats['streams']:<5} completed={stats['completed']:<5} "
+                    f"rejected={stats['rejected']:<5} errors={stats['errors']:<3} "
+                    f"ttfe p50={stats['ttfe_p50']:.3f}s p99={stats['ttfe_p99']:.3f}s "
+                    f"duration p99={stats['duration_p99']:.3f}s"
+                )
+                if stats['completed'] + stats['rejected'] == level and stats['ttfe_p99'] <= args.ttfe_slo:
+                    report['capacity'] = level
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=10)
+
+    print(f"\nCapacity (semua stream selesai/ditolak, p99 TTFE <= {args.ttfe_slo}s): {report['capacity']} streams")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
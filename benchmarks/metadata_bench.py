@@ -0,0 +1,96 @@
+"""
+Benchmark biaya marginal metadata halaman di atas extract links saja.
+
+Setiap halaman korpus di-extract dengan BeautifulSoupLinkExtractor:
+links saja, links + satu field metadata, links + semua field (satu pass),
+dan links lalu parse kedua untuk metadata (seperti job downstream yang
+mem-parse ulang halaman). Korpus default: halaman website sintetis dengan
+<head> lengkap; --fixture memakai fixture rekaman replay_bench (halaman asli).
+
+    python -m benchmarks.metadata_bench --pages 200 --runs 5
+    python -m benchmarks.metadata_bench --fixture fixtures/example.jsonl.gz
+"""
+import argparse
+import json
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+sys.path.insert(0, '.')
+
+from app.domain.entities import PAGE_METADATA_FIELDS
+from app.infrastructure.link_extractor import BeautifulSoupLinkExtractor
+from app.infrastructure.replay_client import load_fixtures
+from benchmarks.synthetic_site import SiteSpec, SyntheticSite
+
+
+def synthetic_corpus(pages: int, page_size: int) -> List[Tuple[str, str]]:
+    site = SyntheticSite(SiteSpec(pages=pages, fanout=8, depth=6, page_size=page_size, cross_links=20, head_metadata=True))
+    return [(f'http://bench.test{path}', site.render(path).decode('utf-8')) for path in site.paths]
+
+
+def fixture_corpus(path: str) -> List[Tuple[str, str]]:
+    corpus = []
+    for url, records in load_fixtures(path).items():
+        response = records[-1]['response']
+        if response is not None and response['text']:
+            corpus.append((url, response['text']))
+    return corpus
+
+
+def measure(corpus: List[Tuple[str, str]], cases: List[Tuple[str, Callable]], runs: int) -> Dict[str, float]:
+    """
+    Waktu terbaik per case dalam ms per halaman. Case dijalankan bergantian di
+    setiap run, supaya drift (thermal, noisy neighbour) mengenai semua case sama rata.
+    """
+    best = {name: float('inf') for name, _ in cases}
+    for _ in range(runs):
+        for name, extract in cases:
+            start = time.perf_counter()
+            for url, html in corpus:
+                extract(html, url)
+            best[name] = min(best[name], time.perf_counter() - start)
+    return {name: seconds * 1000 / len(corpus) for name, seconds in best.items()}
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--fixture', help='Fixture .jsonl.gz (default: website sintetis)')
+    parser.add_argument('--pages', type=int, default=200)
+    parser.add_argument('--page-size', type=int, default=16384)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--output', help='Simpan hasil sebagai JSON')
+    args = parser.parse_args(argv)
+
+    corpus = fixture_corpus(args.fixture) if args.fixture else synthetic_corpus(args.pages, args.page_size)
+    extractor = BeautifulSoupLinkExtractor()
+
+    def with_fields(fields: Sequence[str]):
+        return lambda html, url: extractor.extract_page(html, url, fields)
+
+    def reparse(html: str, url: str):
+        extractor.extract_page(html, url)
+        return extractor.extract_page(html, url, PAGE_METADATA_FIELDS)
+
+    cases = [('links', with_fields(()))]
+    cases += [(f'links+{field}', with_fields((field,))) for field in PAGE_METADATA_FIELDS]
+    cases += [('links+all (satu pass)', with_fields(PAGE_METADATA_FIELDS)), ('links, lalu parse ulang', reparse)]
+
+    timings = measure(corpus, cases, args.runs)
+    baseline = timings['links']
+    results = []
+    for name, ms in timings.items():
+        results.append({'case': name, 'ms_per_page': round(ms, 3), 'overhead_pct': round((ms / baseline - 1) * 100, 1)})
+        print(f"{name:<26} {ms:>8.3f} ms/page  {results[-1]['overhead_pct']:>+7.1f}%")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'pages': len(corpus),
+                'avg_bytes': sum(len(html) for _, html in corpus) // len(corpus),
+                'results': results
+            }, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""
+Benchmark crawl offline dari fixture HTTP rekaman (record/replay).
+
+Rekam crawl asli sekali (butuh jaringan), lalu replay berulang kali tanpa
+jaringan. Replay dengan --latency-scale 0 (default) mengukur murni biaya CPU
+DFSWebCrawler (parse, normalize, tree building); 1.0 memutar ulang latency
+rekaman. Tanpa --record dan tanpa fixture, fixture direkam dari website
+sintetis lokal.
+
+    python -m benchmarks.replay_bench --record https://example.com --fixture fixtures/example.jsonl.gz --max-pages 50
+    python -m benchmarks.replay_bench --fixture fixtures/example.jsonl.gz --runs 5
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import List, Optional
+
+sys.path.insert(0, '.')
+
+from app.domain.entities import CrawlConfig
+from app.infrastructure.dfs_crawler import DFSWebCrawler
+from app.infrastructure.http_client import RequestsHttpClient
+from app.infrastructure.link_extractor import BeautifulSoupLinkExtractor
+from app.infrastructure.replay_client import RecordingHttpClient, ReplayHttpClient
+from app.infrastructure.url_parser import UrlParser
+from benchmarks.synthetic_site import SiteSpec, SyntheticSite, SyntheticServer
+
+
+def make_crawler(http_client, max_pages: int, allow_private: bool) -> DFSWebCrawler:
+    config = CrawlConfig(
+        max_pages=max_pages, max_depth=10, delay=0.0, retry_count=1, retry_delay=0.0,
+        rotate_user_agent=False, allow_private_hosts=allow_private, collect_timings=True
+    )
+    return DFSWebCrawler(
+        http_client=http_client,
+        url_parser=UrlParser(allow_private_hosts=allow_private),
+        link_extractor=BeautifulSoupLinkExtractor(),
+        config=config
+    )
+
+
+def record(url: str, fixture: str, max_pages: int, allow_private: bool) -> str:
+    """Crawl asli dengan RecordingHttpClient; return start URL"""
+    os.makedirs(os.path.dirname(os.path.abspath(fixture)), exist_ok=True)
+    with RecordingHttpClient(RequestsHttpClient(), fixture) as client:
+        make_crawler(client, max_pages, allow_private).crawl(url)
+        print(f"Direkam {client.records} response ke {fixture}")
+    return url
+
+
+def replay(fixture: str, url: str, max_pages: int, latency_scale: float) -> dict:
+    client = ReplayHttpClient(fixture, latency_scale=latency_scale)
+    crawler = make_crawler(client, max_pages, allow_private=True)
+    parse = normalize = 0.0
+    result = None
+    start_cpu = time.process_time()
+    start = time.perf_counter()
+    for event in crawler.crawl_stream(url):
+        if event['type'] == 'page' and 'timings' in event:
+            parse += event['timings']['parse']
+            normalize += event['timings']['normalize']
+        elif event['type'] == 'complete':
+            result = event['result']
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - start_cpu
+    digest = hashlib.sha1(json.dumps(
+        [sorted(result.found_routes), sorted(result.invalid_routes), result.get_tree_visual()]
+    ).encode()).hexdigest()[:16]
+    return {
+        'pages': result.pages_crawled,
+        'seconds': round(elapsed, 4),
+        'pages_per_second': round(result.pages_crawled / elapsed, 1) if elapsed else 0.0,
+        'cpu_seconds': round(cpu, 4),
+        'parse_seconds': round(parse, 4),
+        'normalize_seconds': round(normalize, 4),
+        'other_seconds': round(max(0.0, elapsed - parse - normalize), 4),
+        'misses': len(client.misses),
+        'result_digest': digest,
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--fixture', help='Path fixture .jsonl.gz (default: temp, direkam dari website sintetis)')
+    parser.add_argument('--record', metavar='URL', help='Rekam crawl asli URL ini ke --fixture')
+    parser.add_argument('--url', help='Start URL replay (default: URL pertama di fixture)')
+    parser.add_argument('--max-pages', type=int, default=200)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--latency-scale', type=float, default=0.0)
+    parser.add_argument('--output', help='Simpan hasil sebagai JSON')
+    args = parser.parse_args(argv)
+
+    fixture = args.fixture or os.path.join(tempfile.mkdtemp(), 'synthetic.jsonl.gz')
+    url = args.url
+    if args.record:
+        url = record(args.record, fixture, args.max_pages, allow_private=False)
+    elif not os.path.exists(fixture):
+        site = SyntheticSite(SiteSpec(pages=args.max_pages, fanout=6, depth=5, latency=0.005))
+        with SyntheticServer(site) as server:
+            url = record(server.base_url + '/', fixture, args.max_pages, allow_private=True)
+    if url is None:
+        url = next(ReplayHttpClient(fixture).urls())
+
+    runs = [replay(fixture, url, args.max_pages, args.latency_scale) for _ in range(args.runs)]
+    for run in runs:
+        print(
+            f"pages={run['pages']:<5} {run['pages_per_second']:>8.1f} pages/s cpu={run['cpu_seconds']:.3f}s "
+            f"parse={run['parse_seconds']:.3f}s normalize={run['normalize_seconds']:.3f}s "
+            f"other={run['other_seconds']:.3f}s misses={run['misses']} result={run['result_digest']}"
+        )
+    if len({run['result_digest'] for run in runs}) != 1:
+        print("PERINGATAN: hasil crawl berbeda antar replay")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'fixture': fixture, 'url': url, 'latency_scale': args.latency_scale, 'runs': runs}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
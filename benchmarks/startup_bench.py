@@ -0,0 +1,124 @@
+"""
+Benchmark cold start: import time per module, create_app() dan request pertama.
+
+Setiap run adalah proses Python baru dengan `-X importtime`, sehingga
+angka yang dilaporkan sama dengan cold start serverless (tanpa cache
+modul). Dilaporkan median dari beberapa run:
+
+- total import time dan waktu create_app + request pertama
+- modul dengan import time kumulatif terbesar
+- apakah crawler stack (requests, urllib3, bs4) ikut ter-import
+
+Skenario:
+- health: create_app() lalu GET /health
+- api:    create_app() lalu GET /api
+- crawl:  create_app() lalu membangun crawler (biaya yang ditunda ke crawl pertama)
+
+    python -m benchmarks.startup_bench --runs 5
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+CRAWLER_STACK = ('requests', 'urllib3', 'bs4', 'httpx')
+
+SNIPPET = '''
+import json, sys, time
+start = time.perf_counter()
+from app import create_app
+app = create_app()
+created = time.perf_counter()
+scenario = sys.argv[1]
+if scenario == 'crawl':
+    from app.container.service_container import get_container
+    get_container().get_crawler()
+else:
+    app.test_client().get('/' + scenario)
+done = time.perf_counter()
+print(json.dumps({
+    'create_app_ms': (created - start) * 1000,
+    'first_request_ms': (done - created) * 1000,
+    'loaded': [name for name in %r if name in sys.modules],
+}))
+''' % (CRAWLER_STACK,)
+
+_IMPORT_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def run_once(scenario: str) -> Dict:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', SNIPPET, scenario],
+        cwd=root, capture_output=True, text=True, check=True
+    )
+    modules: Dict[str, int] = {}
+    total_us = 0
+    for line in proc.stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if not match:
+            continue
+        own, cumulative, indent, name = match.groups()
+        modules[name] = int(cumulative)
+        total_us += int(own)
+
+    run = json.loads(proc.stdout.strip().splitlines()[-1])
+    run['import_total_ms'] = total_us / 1000
+    run['modules'] = modules
+    return run
+
+
+def summarize(scenario: str, runs: List[Dict], top: int) -> Dict:
+    cumulative: Dict[str, List[int]] = defaultdict(list)
+    for run in runs:
+        for name, value in run['modules'].items():
+            cumulative[name].append(value)
+
+    top_modules = sorted(
+        ((name, statistics.median(values) / 1000) for name, values in cumulative.items()),
+        key=lambda item: item[1], reverse=True
+    )[:top]
+
+    return {
+        'scenario': scenario,
+        'runs': len(runs),
+        'import_total_ms': round(statistics.median(run['import_total_ms'] for run in runs), 2),
+        'create_app_ms': round(statistics.median(run['create_app_ms'] for run in runs), 2),
+        'first_request_ms': round(statistics.median(run['first_request_ms'] for run in runs), 2),
+        'crawler_stack_loaded': runs[-1]['loaded'],
+        'top_modules': [{'module': name, 'cumulative_ms': round(ms, 2)} for name, ms in top_modules],
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scenarios', default='health,api,crawl')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--output', help='Simpan hasil sebagai JSON')
+    args = parser.parse_args(argv)
+
+    report = {'python': sys.version.split()[0], 'scenarios': []}
+    for scenario in args.scenarios.split(','):
+        summary = summarize(scenario, [run_once(scenario) for _ in range(args.runs)], args.top)
+        report['scenarios'].append(summary)
+
+        print(
+            f"{scenario:<7} imports={summary['import_total_ms']}ms create_app={summary['create_app_ms']}ms "
+            f"first_request={summary['first_request_ms']}ms crawler_stack={summary['crawler_stack_loaded'] or 'none'}"
+        )
+        for entry in summary['top_modules']:
+            print(f"    {entry['cumulative_ms']:>8.2f}ms  {entry['module']}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,369 @@
+"""
+Generator website sintetis lokal untuk benchmark dan load test.
+
+Halaman disusun sebagai tree dengan fan-out dan kedalaman tertentu
+(/, /<id>, /<id>/<id>, ...), ditambah cross-link acak yang deterministik
+(seed) dan opsional satu arsip berhalaman panjang (/archive/<n>). Ukuran
+halaman, latency dan error rate bisa diatur, sehingga hasil benchmark
+bisa direproduksi tanpa akses jaringan.
+"""
+import datetime
+import multiprocessing
+import random
+import sys
+import threading
+import time
+from dataclasses import dataclass, asdict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, List, Optional, Tuple
+
+
+_VOCABULARY = (
+    'alpha bravo charlie delta echo foxtrot golf hotel india juliet kilo lima mike november oscar papa '
+    'quebec romeo sierra tango uniform victor whiskey xray yankee zulu crawler route page index archive '
+    'section product category article review guide update release note report summary detail market '
+    'price stock order cart account profile search result filter sort tag topic author comment share'
+).split()
+
+
+@dataclass
+class SiteSpec:
+    pages: int = 200
+    fanout: int = 5
+    depth: int = 6
+    page_size: int = 4096  # target ukuran body dalam bytes
+    latency: float = 0.0  # latency dasar per request (detik)
+    latency_jitter: float = 0.0  # tambahan acak 0..jitter
+    tail_rate: float = 0.0  # fraksi request (acak per request) yang lambat
+    tail_latency: float = 0.0  # latency request lambat (detik)
+    error_rate: float = 0.0  # fraksi halaman yang mengembalikan 500
+    capacity: int = 0  # request paralel yang dilayani tanpa melambat (0 = tanpa batas)
+    overload_factor: float = 2.0  # di atas capacity * factor request in-flight, server menjawab 503
+    cross_links: int = 2  # link tambahan ke halaman acak
+    archive_pages: int = 0  # rantai pagination /archive/1 -> /archive/2 -> ... dari root
+    traps: bool = False  # tambahkan crawler trap tak terbatas: /calendar/<y>/<m>/<d> dan /loop/... (link relatif)
+    print_views: bool = False  # setiap halaman juga di-link ke /print/<path> dengan konten hampir sama
+    aliases: bool = False  # child juga di-link lewat /old/<path> (301) dan /amp/<path> (rel=canonical)
+    cookie: str = ''  # jika diisi (mis. 'site_a=1'), setiap response mengirim Set-Cookie ini
+    head_metadata: bool = False  # <html lang>, meta description/robots dan <script> di <head>
+    site_canonical: str = ''  # jika diisi (mis. '/'), semua halaman punya rel=canonical ke path ini (head template)
+    seed: int = 42
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class SyntheticSite:
+    def __init__(self, spec: SiteSpec):
+        self.spec = spec
+        self._rng = random.Random(spec.seed)
+        self.paths: List[str] = []
+        self.children: Dict[str, List[str]] = {}
+        self.depths: Dict[str, int] = {}
+        self.broken: set = set()
+        self._build()
+        self._bodies: Dict[str, bytes] = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.overloaded = 0
+        self.cookies_seen: set = set()  # header Cookie yang diterima ('' = tanpa cookie)
+        self._load_lock = threading.Lock()
+
+    def _build(self):
+        spec = self.spec
+        self.paths.append('/')
+        self.depths['/'] = 0
+        frontier = ['/']
+
+        # Tree BFS dengan fan-out tetap sampai batas jumlah halaman/kedalaman
+        while frontier and len(self.paths) < spec.pages:
+            next_frontier = []
+            for parent in frontier:
+                kids = []
+                for _ in range(spec.fanout):
+                    if len(self.paths) >= spec.pages or self.depths[parent] >= spec.depth:
+                        break
+                    path = f"{parent.rstrip('/')}/{len(self.paths)}"
+                    self.paths.append(path)
+                    self.depths[path] = self.depths[parent] + 1
+                    kids.append(path)
+                self.children[parent] = kids
+                next_frontier.extend(kids)
+            frontier = next_frontier
+
+        for path in self.paths:
+            links = list(self.children.get(path, []))
+            for _ in range(spec.cross_links):
+                links.append(self._rng.choice(self.paths))
+            self.children[path] = links
+
+        error_count = int(len(self.paths) * spec.error_rate)
+        candidates = self.paths[1:]
+        self.broken = set(self._rng.sample(candidates, min(error_count, len(candidates))))
+
+        # Arsip di-link terakhir dari root, jadi DFS akan menyelam ke sana lebih dulu
+        for n in range(1, spec.archive_pages + 1):
+            path = f"/archive/{n}"
+            self.paths.append(path)
+            self.depths[path] = n
+            self.children[path] = ['/'] + ([f"/archive/{n + 1}"] if n < spec.archive_pages else [])
+        if spec.archive_pages:
+            self.children['/'].append('/archive/1')
+
+        if spec.traps:
+            self.children['/'].extend(['/calendar/2024/01/01', '/loop/a/b'])
+
+        if spec.print_views:
+            for path in self.paths:
+                self.children[path].append('/print' + path.rstrip('/'))
+
+        # Alias di-link dari parent setelah link asli, jadi DFS mengunjungi alias lebih dulu
+        if spec.aliases:
+            for path in self.paths:
+                prefix = path.rstrip('/') + '/'
+                kids = [kid for kid in dict.fromkeys(self.children[path])
+                        if kid.startswith(prefix) and self.depths.get(kid) == self.depths[path] + 1]
+                self.children[path].extend(['/old' + kid for kid in kids] + ['/amp' + kid for kid in kids])
+
+    def render(self, path: str) -> bytes:
+        body = self._bodies.get(path)
+        if body is None:
+            body = self._render_links(path, self.children[path])
+            self._bodies[path] = body
+        return body
+
+    def _render_links(self, path: str, children: List[str]) -> bytes:
+        links = ''.join(f'<li><a href="{link}">{link}</a></li>\n' for link in children)
+        meta = ''
+        if self.spec.head_metadata:
+            meta = (
+                f'<meta name="description" content="Halaman {path}">'
+                '<meta name="robots" content="index, follow">'
+                f'<script>var page = "{path}";</script>'
+            )
+        if self.spec.site_canonical:
+            meta += f'<link rel="canonical" href="{self.spec.site_canonical}">'
+        html_tag = '<html lang="id">' if self.spec.head_metadata else '<html>'
+        head = f"{html_tag}<head><title>{path}</title>{meta}</head><body><h1>{path}</h1>\n<ul>\n{links}</ul>\n"
+        tail = "</body></html>"
+        filler_size = max(0, self.spec.page_size - len(head) - len(tail))
+        # Teks berbeda per halaman (deterministik), supaya halaman tidak terlihat duplikat
+        rng = random.Random(f"{self.spec.seed}:{path}")
+        words = []
+        length = 0
+        while length < filler_size:
+            sentence = ' '.join(rng.choice(_VOCABULARY) for _ in range(12))
+            words.append(f"<p>{sentence}</p>\n")
+            length += len(sentence) + 8
+        return (head + ''.join(words)[:filler_size] + tail).encode('utf-8')
+
+    def _render_trap(self, path: str) -> Optional[bytes]:
+        """Halaman dinamis (trap dan print view), tidak di-cache"""
+        if self.spec.traps and path.startswith('/calendar/'):
+            try:
+                day = datetime.date(*[int(part) for part in path.split('/')[2:5]])
+            except (TypeError, ValueError):
+                return None
+            following = day + datetime.timedelta(days=1)
+            return self._render_links(path, ['/', following.strftime('/calendar/%Y/%m/%d')])
+        if self.spec.print_views and path.startswith('/print'):
+            original = path[len('/print'):] or '/'
+            if original in self.depths and original not in self.broken:
+                return self.render(original).replace(b'<body>', b'<body><p>Print view</p>', 1)
+            return None
+        if self.spec.aliases and path.startswith('/amp'):
+            original = path[len('/amp'):] or '/'
+            if original in self.depths and original not in self.broken:
+                canonical = f'<head><link rel="canonical" href="{original}">'.encode('utf-8')
+                return self.render(original).replace(b'<head>', canonical, 1)
+            return None
+        if self.spec.traps and path.startswith('/loop/'):
+            # Link relatif yang terus memperpanjang path: /loop/a/b -> /loop/a/a/b -> ...
+            return self._render_links(path, ['/', 'a/b/'])
+        return None
+
+    def redirect_target(self, path: str) -> Optional[str]:
+        """Location untuk path alias /old/<path>, atau None"""
+        if self.spec.aliases and path.startswith('/old'):
+            original = path.split('?', 1)[0][len('/old'):].rstrip('/') or '/'
+            if original in self.depths:
+                return original
+        return None
+
+    def handle(self, path: str) -> Tuple[int, bytes]:
+        """Return (status, body) untuk path yang diminta"""
+        path = path.split('?', 1)[0].split('#', 1)[0]
+        if path != '/' and path.endswith('/'):
+            path = path.rstrip('/')
+        if path not in self.depths:
+            trap = self._render_trap(path)
+            if trap is not None:
+                return 200, trap
+            return 404, b'not found'
+        if path in self.broken:
+            return 500, b'server error'
+        return 200, self.render(path)
+
+    def delay(self) -> float:
+        spec = self.spec
+        if spec.tail_rate and random.random() < spec.tail_rate:
+            return spec.tail_latency
+        if spec.latency_jitter:
+            return spec.latency + random.random() * spec.latency_jitter
+        return spec.latency
+
+    def admit(self) -> Tuple[bool, float]:
+        """
+        Catat satu request masuk. Return (overloaded, delay): di atas capacity
+        latency naik sebanding beban (processor sharing), di atas
+        capacity * overload_factor request ditolak dengan 503.
+        """
+        with self._load_lock:
+            self.in_flight += 1
+            load = self.in_flight
+            self.max_in_flight = max(self.max_in_flight, load)
+        delay = self.delay()
+        capacity = self.spec.capacity
+        if not capacity:
+            return False, delay
+        if load > capacity * self.spec.overload_factor:
+            with self._load_lock:
+                self.overloaded += 1
+            return True, 0.0
+        return False, delay * max(1.0, load / capacity)
+
+    def release(self):
+        with self._load_lock:
+            self.in_flight -= 1
+
+    def saw_cookie(self, header: Optional[str]):
+        with self._load_lock:
+            self.cookies_seen.add(header or '')
+
+
+def make_handler(site: SyntheticSite):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            site.saw_cookie(self.headers.get('Cookie'))
+            overloaded, delay = site.admit()
+            try:
+                if delay:
+                    time.sleep(delay)
+                if overloaded:
+                    self._send(503, b'overloaded', [('Retry-After', '1')])
+                    return
+                self._respond()
+            finally:
+                site.release()
+
+        def _send(self, status: int, payload: bytes, headers=()):
+            self.send_response(status)
+            for name, value in headers:
+                self.send_header(name, value)
+            if site.spec.cookie:
+                self.send_header('Set-Cookie', f'{site.spec.cookie}; Path=/')
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _respond(self):
+            location = site.redirect_target(self.path)
+            if location is not None:
+                self._send(301, b'', [('Location', location)])
+                return
+            status, payload = site.handle(self.path)
+            self._send(status, payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+class CountingHTTPServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer yang menghitung jumlah koneksi TCP yang diterima"""
+    connections = 0
+
+    def process_request(self, request, client_address):
+        self.connections += 1
+        super().process_request(request, client_address)
+
+    def handle_error(self, request, client_address):
+        # Client yang menutup koneksi lebih dulu (timeout/hedge) bukan error server
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+
+class SyntheticServer:
+    """Menjalankan SyntheticSite di thread background pada 127.0.0.1"""
+
+    def __init__(self, site: SyntheticSite, port: int = 0):
+        self.site = site
+        self.httpd = CountingHTTPServer(('127.0.0.1', port), make_handler(site))
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def connections(self) -> int:
+        return self.httpd.connections
+
+    def start(self) -> 'SyntheticServer':
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def _serve_forever(spec: SiteSpec, port_queue):
+    server = SyntheticServer(SyntheticSite(spec))
+    port_queue.put(server.httpd.server_address[1])
+    server.httpd.serve_forever()
+
+
+class SyntheticServerProcess:
+    """
+    Menjalankan SyntheticSite di proses terpisah, agar CPU time dan RSS
+    server tidak tercampur dengan pengukuran crawler.
+    """
+
+    def __init__(self, spec: SiteSpec):
+        self.spec = spec
+        self._process = None
+        self.base_url = None
+
+    def start(self) -> 'SyntheticServerProcess':
+        port_queue = multiprocessing.Queue()
+        self._process = multiprocessing.Process(target=_serve_forever, args=(self.spec, port_queue), daemon=True)
+        self._process.start()
+        self.base_url = f"http://127.0.0.1:{port_queue.get(timeout=10)}"
+        return self
+
+    def stop(self):
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join(timeout=5)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,114 @@
+"""
+Benchmark tail latency: timeout statis vs timeout adaptif per host vs hedged request.
+
+Website sintetis melayani sebagian kecil request (acak per request,
+`--tail-rate`) dengan latency `--tail-latency`. Dilaporkan durasi crawl,
+pages/sec, jumlah hedge dan waktu yang dihemat.
+
+    # request lambat sesekali: hedging memotong tail
+    python -m benchmarks.tail_latency_bench --tail-rate 0.03 --tail-latency 0.5
+
+    # request yang "hang": timeout adaptif menggantikan timeout statis 10 detik
+    python -m benchmarks.tail_latency_bench --tail-rate 0.01 --tail-latency 15 --modes static,adaptive
+
+Mode:
+- static:   timeout = --timeout untuk semua fetch
+- adaptive: timeout per host = p99 * 3 (minimal 1 detik)
+- hedged:   adaptive + hedged GET setelah p95 host (maksimal --hedge-ratio extra request)
+"""
+import argparse
+import json
+import sys
+import time
+from typing import Dict, List, Optional
+
+sys.path.insert(0, '.')
+
+from app.domain.entities import CrawlConfig
+from app.infrastructure.dfs_crawler import DFSWebCrawler
+from app.infrastructure.http_client import RequestsHttpClient
+from app.infrastructure.link_extractor import BeautifulSoupLinkExtractor
+from app.infrastructure.url_parser import UrlParser
+from benchmarks.synthetic_site import SiteSpec, SyntheticSite, SyntheticServer
+
+MODES = ('static', 'adaptive', 'hedged')
+
+
+def run_mode(mode: str, spec: SiteSpec, timeout: float, hedge_ratio: float, concurrency: int) -> Dict:
+    site = SyntheticSite(spec)
+    config = CrawlConfig(
+        timeout=timeout,
+        max_pages=spec.pages,
+        max_depth=spec.depth,
+        delay=0.0,
+        retry_count=2,
+        retry_delay=0.0,
+        rotate_user_agent=False,
+        allow_private_hosts=True,
+        frontier_strategy='bfs',
+        max_concurrency=concurrency,
+        adaptive_timeouts=mode in ('adaptive', 'hedged'),
+        hedge_requests=mode == 'hedged',
+        hedge_max_ratio=hedge_ratio
+    )
+    crawler = DFSWebCrawler(
+        http_client=RequestsHttpClient(pool_maxsize=concurrency * 4),
+        url_parser=UrlParser(allow_private_hosts=True),
+        link_extractor=BeautifulSoupLinkExtractor(),
+        config=config
+    )
+
+    with SyntheticServer(site) as server:
+        start = time.perf_counter()
+        result = crawler.crawl(server.base_url + '/')
+        elapsed = time.perf_counter() - start
+
+    tail = result.tail_latency
+    return {
+        'mode': mode,
+        'pages': result.pages_crawled,
+        'failed_pages': len(result.invalid_routes),
+        'seconds': round(elapsed, 3),
+        'pages_per_second': round(result.pages_crawled / elapsed, 1) if elapsed else 0.0,
+        'hedged': tail.get('hedged', 0),
+        'hedge_wins': tail.get('hedge_wins', 0),
+        'time_saved': tail.get('time_saved', 0.0),
+        'tail_latency': tail,
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--modes', default=','.join(MODES))
+    parser.add_argument('--pages', type=int, default=300)
+    parser.add_argument('--latency', type=float, default=0.01)
+    parser.add_argument('--tail-rate', type=float, default=0.03)
+    parser.add_argument('--tail-latency', type=float, default=0.5)
+    parser.add_argument('--timeout', type=float, default=10.0)
+    parser.add_argument('--hedge-ratio', type=float, default=0.1)
+    parser.add_argument('--concurrency', type=int, default=1)
+    parser.add_argument('--output', help='Simpan hasil sebagai JSON')
+    args = parser.parse_args(argv)
+
+    spec = SiteSpec(
+        pages=args.pages, fanout=8, depth=5, cross_links=1,
+        latency=args.latency, tail_rate=args.tail_rate, tail_latency=args.tail_latency
+    )
+    report = {'site': spec.to_dict(), 'runs': []}
+
+    for mode in args.modes.split(','):
+        run = run_mode(mode, spec, args.timeout, args.hedge_ratio, args.concurrency)
+        report['runs'].append(run)
+        print(
+            f"{mode:<9} seconds={run['seconds']:<7} pages/s={run['pages_per_second']:<7} "
+            f"failed={run['failed_pages']:<4} hedged={run['hedged']:<4} wins={run['hedge_wins']:<4} "
+            f"saved={run['time_saved']}s"
+        )
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Service monitoring: revisit scheduler yang berjalan terus untuk situs di
+REVISIT_SITES (lihat app/config.py, REVISIT_*).
+
+Route ditemukan dengan crawl DFS, lalu budget fetch per jam dipakai untuk
+route yang paling mungkin sudah berubah. State (history perubahan per
+route) disimpan di REVISIT_STATE_PATH, sehingga restart melanjutkan
+estimasi yang sama.
+
+    REVISIT_SITES=https://example.com FLASK_ENV=production python monitor.py
+    python monitor.py --report
+"""
+import argparse
+import json
+import logging
+import os
+import signal
+import threading
+from app.config import config
+
+
+env = os.getenv('FLASK_ENV', 'production')
+config_class = config.get(env, config['default'])
+
+
+def build_scheduler(config_class):
+    from app import create_app
+    from app.container.service_container import get_container
+    from app.infrastructure.revisit_scheduler import RevisitScheduler, RevisitStore
+
+    # Container aplikasi: HTTP client, parser dan config crawl yang sama dengan API
+    create_app(config_class)
+    container = get_container()
+    return RevisitScheduler(
+        RevisitStore(config_class.REVISIT_STATE_PATH),
+        http_client=container.get_http_client(),
+        url_parser=container.get_url_parser(),
+        link_extractor=container.get_link_extractor(),
+        config=container.config,
+        sites=config_class.REVISIT_SITES,
+        fetches_per_hour=config_class.REVISIT_FETCHES_PER_HOUR,
+        tick_seconds=config_class.REVISIT_TICK_SECONDS,
+        rediscover_interval=config_class.REVISIT_REDISCOVER_HOURS * 3600,
+        policy=config_class.REVISIT_POLICY
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--report', action='store_true', help='Cetak freshness dan perubahan per fetch, lalu keluar')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    scheduler = build_scheduler(config_class)
+    if args.report:
+        print(json.dumps(scheduler.report(), indent=2))
+        scheduler.close()
+        return
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    try:
+        scheduler.run(stop)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        scheduler.close()
+
+
+if __name__ == '__main__':
+    main()
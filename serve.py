@@ -0,0 +1,51 @@
+"""
+Production entry point: gunicorn dengan worker gevent.
+
+Setiap stream SSE berjalan di greenlet, bukan thread OS, sehingga satu
+worker bisa menahan ratusan crawl stream yang berjalan lama sekaligus.
+Worker dan concurrency diatur lewat app/config.py (SERVER_*).
+
+    pip install -r requirements-server.txt
+    FLASK_ENV=production python serve.py
+"""
+import os
+from gunicorn.app.base import BaseApplication
+from app.config import config
+
+
+env = os.getenv('FLASK_ENV', 'production')
+config_class = config.get(env, config['default'])
+
+
+class CrawlerServer(BaseApplication):
+    def __init__(self, config_class, options: dict = None):
+        self.config_class = config_class
+        self.options = options or {}
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            if key in self.cfg.settings and value is not None:
+                self.cfg.set(key, value)
+
+    def load(self):
+        # Import app di dalam worker, setelah gevent melakukan monkey patching
+        from app import create_app
+        return create_app(self.config_class)
+
+
+def build_options(config_class) -> dict:
+    return {
+        'bind': f"{config_class.HOST}:{config_class.PORT}",
+        'workers': config_class.SERVER_WORKERS,
+        'worker_class': config_class.SERVER_WORKER_CLASS,
+        'worker_connections': config_class.SERVER_WORKER_CONNECTIONS,
+        'timeout': config_class.SERVER_TIMEOUT,
+        'graceful_timeout': config_class.SERVER_GRACEFUL_TIMEOUT,
+        'keepalive': config_class.SERVER_KEEPALIVE,
+        'accesslog': '-',
+    }
+
+
+if __name__ == '__main__':
+    CrawlerServer(config_class, build_options(config_class)).run()
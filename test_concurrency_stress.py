@@ -0,0 +1,196 @@
+"""
+Stress test crawl bersamaan: banyak crawl paralel di atas satu container
+(HTTP client, parser, metrics bersama) terhadap website sintetis lokal
+"""
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+sys.path.insert(0, '.')
+
+from app import create_app
+from app.config import Config
+from app.container.service_container import ServiceContainer
+from app.domain.entities import CrawlConfig
+from app.infrastructure.http_client import RequestsHttpClient
+from benchmarks.synthetic_site import SiteSpec, SyntheticSite, SyntheticServer
+
+SITES = 4
+CRAWLS_PER_SITE = 4
+
+
+def make_sites():
+    # Setiap site punya cookie sendiri; semua di 127.0.0.1, jadi cookie jar bersama akan mencampurnya
+    return [
+        SyntheticSite(SiteSpec(pages=30, fanout=3, depth=4, latency=0.01, error_rate=0.1, seed=i, cookie=f'site_{i}=1'))
+        for i in range(SITES)
+    ]
+
+
+def summarize(result) -> dict:
+    return {
+        'found': sorted(result.found_routes),
+        'invalid': sorted(result.invalid_routes),
+        'pages': result.pages_crawled,
+        'stop_reason': result.stop_reason,
+    }
+
+
+def assert_no_cookie_leak(sites):
+    for i, site in enumerate(sites):
+        # Request pertama setiap crawl tanpa cookie, sisanya hanya cookie site itu sendiri
+        assert site.cookies_seen <= {'', f'site_{i}=1'}, (i, site.cookies_seen)
+
+
+def test_scoped_http_client():
+    """Client scoped: cookie jar sendiri, connection pool bersama"""
+    shared = RequestsHttpClient()
+    first, second = shared.scoped(), shared.scoped()
+    assert first.session is not second.session
+    assert first.session.cookies is not second.session.cookies
+    assert first.session.get_adapter('http://x/') is second.session.get_adapter('http://x/')
+    assert first.session.get_adapter('https://x/') is shared.session.get_adapter('https://x/')
+
+    site = SyntheticSite(SiteSpec(pages=5, fanout=2, depth=2, cookie='scoped=1'))
+    with SyntheticServer(site) as server:
+        first.get(server.base_url + '/', 5, {})
+        first.get(server.base_url + '/1', 5, {})
+        second.get(server.base_url + '/', 5, {})
+    assert site.cookies_seen == {'', 'scoped=1'}
+    assert len(second.session.cookies) == 1 and len(shared.session.cookies) == 0
+
+
+def test_concurrent_crawls_shared_container():
+    """Crawl paralel menghasilkan hasil yang sama dengan crawl sendiri-sendiri, lebih cepat, tanpa cookie bocor"""
+    sites = make_sites()
+    servers = [SyntheticServer(site).start() for site in sites]
+    config = CrawlConfig(
+        max_pages=100, max_depth=10, delay=0.0, retry_count=1, retry_delay=0.0,
+        rotate_user_agent=False, allow_private_hosts=True, max_concurrency=2
+    )
+    container = ServiceContainer(config)
+    # Crawler per request dengan config berbeda (concurrency) di atas resource bersama
+    jobs = [(i % SITES, 1 + i % 3) for i in range(SITES * CRAWLS_PER_SITE)]
+
+    def run(job):
+        site_index, concurrency = job
+        crawler = container.create_crawler(replace(config, max_concurrency=concurrency))
+        return job, summarize(crawler.crawl(servers[site_index].base_url + '/'))
+
+    try:
+        # Baseline: setiap kombinasi site x concurrency dijalankan sendirian
+        start = time.perf_counter()
+        baseline = dict(run(job) for job in sorted(set(jobs)))
+        sequential = time.perf_counter() - start
+        assert all(summary['stop_reason'] == 'queue_empty' and summary['invalid'] for summary in baseline.values())
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+            results = list(executor.map(run, jobs))
+        concurrent = time.perf_counter() - start
+    finally:
+        for server in servers:
+            server.stop()
+        container.reset()
+
+    for job, summary in results:
+        assert summary == baseline[job], job
+    assert_no_cookie_leak(sites)
+    # Lebih banyak crawl dari baseline, tetap selesai lebih cepat dari baseline sekuensial
+    assert concurrent < sequential, (concurrent, sequential)
+    print(f"sequential={sequential:.2f}s concurrent({len(jobs)} crawls)={concurrent:.2f}s")
+
+
+def test_concurrent_crawl_requests():
+    """Request /crawl dan /crawl/stream bersamaan lewat Flask app memakai crawler per request"""
+    sites = make_sites()
+    servers = [SyntheticServer(site).start() for site in sites]
+
+    class StressConfig(Config):
+        CRAWLER_ALLOW_PRIVATE_HOSTS = True
+        CRAWLER_MAX_PAGES = 100
+        CRAWLER_DELAY = 0.0
+        CRAWLER_RETRY_DELAY = 0.0
+        CRAWLER_MAX_CONCURRENCY = 2
+        CRAWLER_ADAPTIVE_CONCURRENCY = False  # hasil deterministik: urutan batch tidak bergantung timing
+        # Semua request diterima; /crawl tetap lewat permit admission
+        ADMISSION_MAX_CRAWLS = ADMISSION_MAX_CRAWLS_PER_TENANT = SITES * CRAWLS_PER_SITE
+        ADMISSION_MAX_FETCHES = ADMISSION_MAX_FETCHES_PER_TENANT = 4 * SITES * CRAWLS_PER_SITE
+
+    app = create_app(StressConfig)
+    try:
+        def crawl(i):
+            url = servers[i % SITES].base_url + '/'
+            client = app.test_client()
+            if (i // SITES) % 2:
+                response = client.post('/crawl', json={'url': url})
+                assert response.status_code == 200
+                return i % SITES, response.get_json()['found_routes']
+            response = client.post('/crawl/stream', json={'url': url, 'max_pages': 100, 'max_depth': 10, 'delay': 0})
+            assert response.status_code == 200
+            assert b'"type":"complete"' in response.get_data()
+            return i % SITES, None
+
+        with ThreadPoolExecutor(max_workers=SITES * CRAWLS_PER_SITE) as executor:
+            results = list(executor.map(crawl, range(SITES * CRAWLS_PER_SITE)))
+    finally:
+        for server in servers:
+            server.stop()
+
+    found = {}
+    for site_index, routes in results:
+        if routes is not None:
+            assert found.setdefault(site_index, routes) == routes
+    assert len(found) == SITES
+    assert_no_cookie_leak(sites)
+
+
+def test_crawl_request_fields():
+    """/crawl memakai field request (max_pages, scope, metadata, ...) per request, juga saat bersamaan"""
+    site = SyntheticSite(SiteSpec(pages=40, fanout=3, depth=4, head_metadata=True))
+
+    class FieldsConfig(Config):
+        CRAWLER_ALLOW_PRIVATE_HOSTS = True
+        CRAWLER_MAX_PAGES = 100
+        CRAWLER_MAX_CONCURRENCY = 2
+        CRAWLER_ADAPTIVE_CONCURRENCY = False
+
+    app = create_app(FieldsConfig)
+    with SyntheticServer(site) as server:
+        def crawl(max_pages):
+            response = app.test_client().post('/crawl', json={
+                'url': server.base_url + '/', 'max_pages': max_pages, 'delay': 0,
+                'scope': {'exclude': ['/2']}, 'metadata': ['title']
+            })
+            assert response.status_code == 200
+            return max_pages, response.get_json()
+
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            results = list(executor.map(crawl, [3, 5, 8, 3, 5, 8]))
+
+        deep = app.test_client().post('/crawl', json={'url': server.base_url + '/', 'max_depth': 1, 'delay': 0}).get_json()
+        budgeted = app.test_client().post('/crawl', json={'url': server.base_url + '/', 'max_bytes': 1, 'delay': 0}).get_json()
+
+    for max_pages, body in results:
+        assert body['pages_crawled'] == max_pages and body['stop_reason'] == 'max_pages_reached'
+        assert not any(route == '/2' or route.startswith('/2/') for route in body['found_routes'])
+        assert body['tree']['metadata'] == {'title': '/'}
+    assert deep['max_depth_reached'] == 1 and 'metadata' not in deep['tree']
+    # Budget per request juga berlaku di endpoint blocking
+    assert budgeted['stop_reason'] == 'byte_budget_reached' and budgeted['pages_crawled'] == 1
+
+    # Dedup konten opt-in: default hasil /crawl tidak berubah
+    printable = SyntheticSite(SiteSpec(pages=10, fanout=3, depth=2, cross_links=0, print_views=True))
+    with SyntheticServer(printable) as server:
+        default = app.test_client().post('/crawl', json={'url': server.base_url + '/', 'delay': 0}).get_json()
+        deduped = app.test_client().post('/crawl', json={'url': server.base_url + '/', 'delay': 0, 'content_dedup': True}).get_json()
+    assert not default['duplicate_clusters']
+    assert deduped['duplicate_clusters']
+
+
+if __name__ == '__main__':
+    test_scoped_http_client()
+    test_concurrent_crawls_shared_container()
+    test_concurrent_crawl_requests()
+    test_crawl_request_fields()
+    print("✓ PASS")
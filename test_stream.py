@@ -1,11 +1,26 @@
 """
 Test script untuk streaming DFS Web Crawler
 """
+import json
+import subprocess
 import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
 sys.path.insert(0, '.')
 
+import pytest
+
 from app import create_app
+from app.config import Config
 from app.container.service_container import get_container
+from app.domain.entities import CrawlResult
+from app.domain.exceptions import OverloadedError
+from app.infrastructure.admission import AdmissionController
+from app.infrastructure.crawl_history import CrawlHistoryStore
+from app.presentation.sse import SSEEventStream
+from benchmarks.synthetic_site import SiteSpec, SyntheticSite, SyntheticServer
 
 def test_stream():
     """Test streaming crawl functionality"""
@@ -42,5 +57,183 @@ def test_stream():
                 print("\n🌳 Tree:")
                 print(result.get_tree_visual())
 
+def test_health_cold_start():
+    """/health dan /api dijawab tanpa meng-import crawler stack (proses baru)"""
+    snippet = (
+        "import sys\n"
+        "from app import create_app\n"
+        "client = create_app().test_client()\n"
+        "assert client.get('/health').status_code == 200\n"
+        "assert client.get('/api').status_code == 200\n"
+        "print(','.join(m for m in ('requests', 'urllib3', 'bs4') if m in sys.modules))\n"
+    )
+    output = subprocess.run([sys.executable, '-c', snippet], capture_output=True, text=True, check=True)
+    assert output.stdout.strip() == ''
+
+
+def test_admission_control():
+    """Batas crawl per tenant: antrian dengan waktu tunggu terbatas, lalu 429 + Retry-After"""
+    controller = AdmissionController(max_crawls=4, max_crawls_per_tenant=1, max_fetches_per_tenant=8, max_wait=1.0)
+    permit = controller.acquire('a', fetches=50)
+    assert permit.fetches == 8
+    threading.Timer(0.1, permit.release).start()
+    with controller.acquire('a') as queued:
+        assert queued.waited >= 0.05
+    assert controller.stats()['active_crawls'] == 0
+
+    controller.max_wait = 0.1
+    with controller.acquire('a'):
+        with pytest.raises(OverloadedError) as error:
+            controller.acquire('a')
+        assert error.value.retry_after >= 1
+        controller.acquire('b').release()
+    assert controller.stats()['rejected_total'] == 1
+
+    class LimitedConfig(Config):
+        CRAWLER_ALLOW_PRIVATE_HOSTS = True
+        ADMISSION_MAX_CRAWLS_PER_TENANT = 1
+        ADMISSION_MAX_WAIT = 0.0
+
+    # Default: header tenant dari client tidak dipercaya, kuota per IP tidak bisa dilewati
+    client = create_app(LimitedConfig).test_client()
+    with SyntheticServer(SyntheticSite(SiteSpec(pages=5, fanout=2, depth=2))) as server:
+        body = {'url': server.base_url + '/', 'delay': 0}
+        first = client.post('/crawl/stream', json=body, headers={'X-Tenant-ID': 'a'})
+        assert first.status_code == 200
+        assert client.post('/crawl/stream', json=body, headers={'X-Tenant-ID': 'b'}).status_code == 429
+        first.close()
+
+    # Di belakang proxy yang mengautentikasi: tenant dari header
+    class TrustedHeaderConfig(LimitedConfig):
+        ADMISSION_TRUST_TENANT_HEADER = True
+
+    client = create_app(TrustedHeaderConfig).test_client()
+    with SyntheticServer(SyntheticSite(SiteSpec(pages=5, fanout=2, depth=2))) as server:
+        body = {'url': server.base_url + '/', 'delay': 0}
+        first = client.post('/crawl/stream', json=body, headers={'X-Tenant-ID': 'a'})
+        assert first.status_code == 200
+
+        rejected = client.post('/crawl/stream', json=body, headers={'X-Tenant-ID': 'a'})
+        assert rejected.status_code == 429
+        assert int(rejected.headers['Retry-After']) >= 1
+        assert client.post('/crawl/stream', json=body, headers={'X-Tenant-ID': 'b'}).status_code == 200
+
+        # Slot dilepas saat stream ditutup
+        first.close()
+        second = client.post('/crawl/stream', json=body, headers={'X-Tenant-ID': 'a'})
+        assert second.status_code == 200
+        assert b'"type": "complete"' in second.get_data() or b'"type":"complete"' in second.get_data()
+        metrics_text = client.get('/metrics').get_data(as_text=True)
+        assert 'crawler_admission_rejected_total 1' in metrics_text
+        # Histogram stage default nonaktif: fetch tidak di-instrument
+        assert get_container().get_metrics() is None
+        assert 'crawler_stage_seconds' not in metrics_text
+        # Default server: crawl sequential, fetch paralel opt-in
+        assert get_container().config.max_concurrency == 1
+        assert not get_container().config.adaptive_concurrency
+        assert not get_container().config.adaptive_timeouts
+
+
+def test_crawl_history(tmp_path):
+    """Route history, ringkasan site dan diff antar crawl dari store SQLite, juga lewat endpoint"""
+    store = CrawlHistoryStore(str(tmp_path / 'history.db'))
+    week = 7 * 24 * 3600
+    first = store.record(CrawlResult(
+        start_url='https://Example.com/', found_routes=['/', '/a', '/b'], invalid_routes=['/old'],
+        pages_crawled=4, route_depths={'/': 0, '/a': 1, '/b': 1, '/old': 1}
+    ), started_at=time.time() - 2 * week)
+    second = store.record(CrawlResult(
+        start_url='https://example.com/', found_routes=['/', '/a', '/c'], invalid_routes=['/b'],
+        pages_crawled=4, route_depths={'/': 0, '/a': 1, '/b': 1, '/c': 2}
+    ))
+
+    history = store.route_history('example.com', '/a')
+    assert history['first_seen']['crawl_id'] == first
+    assert history['last_seen']['crawl_id'] == second
+    assert [entry['crawl_id'] for entry in history['history']] == [second, first]
+    assert store.route_history('example.com', '/c')['history'][0]['depth'] == 2
+
+    diff = store.diff(first, second)
+    assert diff['added'] == ['/c']
+    assert diff['removed'] == ['/old']
+    assert diff['became_invalid'] == ['/b']
+    assert diff['became_valid'] == []
+
+    last_week = [item['route'] for item in store.routes('example.com', valid=False, since=time.time() - week)]
+    assert last_week == ['/b']
+    summary = store.site_summary('example.com')
+    assert summary['total_crawls'] == 2 and summary['known_routes'] == 5
+    assert summary['latest_invalid_routes'] == ['/b']
+    assert store.site_summary('unknown.test') is None
+    store.close()
+
+    class HistoryConfig(Config):
+        CRAWLER_ALLOW_PRIVATE_HOSTS = True
+        HISTORY_PATH = str(tmp_path / 'api.db')
+
+    client = create_app(HistoryConfig).test_client()
+    with SyntheticServer(SyntheticSite(SiteSpec(pages=10, fanout=3, depth=2))) as server:
+        body = {'url': server.base_url + '/', 'delay': 0}
+        crawl_id = client.post('/crawl', json=body).get_json()['history_crawl_id']
+        # Stream: ID history ada di frame complete, juga ketika event profile menyusul
+        data = client.post('/crawl/stream', json={**body, 'profile': True}).get_data(as_text=True)
+        events = [json.loads(frame[len('data: '):]) for frame in data.split('\n\n') if frame.startswith('data: ')]
+        assert [event['type'] for event in events][-2:] == ['complete', 'profile']
+        latest = events[-2]['history_crawl_id']
+        host = server.base_url.split('://', 1)[1]
+
+        summary = client.get(f'/history/sites/{host}').get_json()
+        assert summary['total_crawls'] == 2
+        assert summary['crawls'][0]['id'] == latest
+        assert latest != crawl_id
+        diff = client.get(f'/history/diff?from={crawl_id}&to={latest}').get_json()
+        assert diff['added'] == [] and diff['removed'] == []
+        route = client.get(f'/history/sites/{host}/route?route=/').get_json()
+        assert route['seen_in_crawls'] == 2
+        assert client.get(f'/history/sites/{host}/routes?status=valid').get_json()['routes']
+        assert client.get(f'/history/sites/{host}/routes?since=yesterday').status_code == 400
+        assert client.get('/history/sites/unknown.test').status_code == 404
+    get_container().reset()
+
+
+def test_sse_flush_during_slow_fetch():
+    """Page yang sudah selesai di-flush sesuai flush_interval meskipun fetch berikutnya lambat"""
+    closed = threading.Event()
+
+    def events():
+        try:
+            yield {'type': 'start', 'url': 'http://x.test/'}
+            yield {'type': 'page', 'route': '/'}
+            time.sleep(0.5)  # fetch lambat
+            yield {'type': 'page', 'route': '/slow'}
+            yield {'type': 'complete', 'result': {'found_routes': ['/', '/slow']}, 'stop_reason': 'queue_empty'}
+        finally:
+            closed.set()
+
+    stream = SSEEventStream(flush_interval=0.05, max_batch_events=50).stream(events())
+    start = time.perf_counter()
+    frames = [next(stream), next(stream)]
+    assert time.perf_counter() - start < 0.3
+    assert '"route":"/"' in frames[1] and '/slow' not in frames[1]
+    assert '"type":"complete"' in ''.join(stream)
+
+    def endless():
+        try:
+            while True:
+                yield {'type': 'page', 'route': '/'}
+        finally:
+            closed.set()
+
+    closed.clear()
+    stream = SSEEventStream(flush_interval=0.05, max_batch_events=5).stream(endless())
+    next(stream)
+    stream.close()  # client disconnect
+    assert closed.wait(1.0)
+
+
 if __name__ == '__main__':
     test_stream()
+    test_health_cold_start()
+    test_admission_control()
+    test_crawl_history(Path(tempfile.mkdtemp()))
+    test_sse_flush_during_slow_fetch()
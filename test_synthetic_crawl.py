@@ -0,0 +1,771 @@
+"""
+Test DFS Web Crawler terhadap website sintetis lokal (tanpa jaringan)
+"""
+import argparse
+import gzip
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+sys.path.insert(0, '.')
+
+import pytest
+
+from app.domain.entities import PAGE_METADATA_FIELDS, CrawlConfig, HttpResponse, ScopeRules
+from app.infrastructure.dfs_crawler import DFSWebCrawler
+from app.infrastructure.http_client import RequestsHttpClient
+from app.infrastructure.link_extractor import BeautifulSoupLinkExtractor
+from app.infrastructure.url_parser import UrlParser
+from app.infrastructure.metrics import CrawlMetrics
+from app.infrastructure.profiler import SamplingProfiler
+from app.infrastructure.scope import ScopeMatcher
+from app.infrastructure.concurrency import AdaptiveConcurrency, HostPacer
+from app.infrastructure.budget import CostModel, CrawlBudget, DeadlineFrontier
+from app.infrastructure.tail_latency import Hedger, LatencyTracker
+from app.infrastructure.link_graph import LinkGraphBuilder
+from app.infrastructure.page_archive import WarcArchiveReader, WarcArchiveSet, WarcArchiveWriter
+from app.infrastructure.replay_client import RecordingHttpClient, ReplayHttpClient
+from app.infrastructure.frontier import (
+    BestFirstFrontier, QueueFrontier, SpillingQueueFrontier, SpillingStackFrontier, StackFrontier,
+    create_frontier, decode_segment, encode_segment
+)
+from app.infrastructure.revisit_scheduler import RevisitScheduler, RevisitStore
+from app.infrastructure.trap_detector import path_template
+from app.presentation.schemas import CrawlRequest
+from benchmarks.revisit_bench import ChangingSite, SimClock, make_scheduler, simulate
+from benchmarks.synthetic_site import SiteSpec, SyntheticSite, SyntheticServer
+
+
+def make_crawler(metrics=None, http_client=None, profiler=None, **overrides) -> DFSWebCrawler:
+    config = CrawlConfig(**{
+        'delay': 0.0,
+        'retry_count': 1,
+        'retry_delay': 0.0,
+        'rotate_user_agent': False,
+        'allow_private_hosts': True,
+        **overrides
+    })
+    return DFSWebCrawler(
+        http_client=http_client or RequestsHttpClient(),
+        url_parser=UrlParser(allow_private_hosts=True),
+        link_extractor=BeautifulSoupLinkExtractor(),
+        config=config,
+        metrics=metrics,
+        profiler=profiler
+    )
+
+
+def test_synthetic_crawl():
+    """Semua halaman sintetis ditemukan, halaman error masuk invalid"""
+    site = SyntheticSite(SiteSpec(pages=40, fanout=3, depth=4, cross_links=0, error_rate=0.1))
+
+    with SyntheticServer(site) as server:
+        result = make_crawler(max_pages=100, max_depth=10).crawl(server.base_url + '/')
+
+    assert result.validate_page_count()
+    assert result.stop_reason == 'queue_empty'
+    # Anak dari halaman error tidak pernah ditemukan, jadi cukup subset
+    assert result.invalid_routes
+    assert set(result.invalid_routes) <= site.broken
+    assert not set(result.found_routes) & site.broken
+    reachable = set(result.found_routes) | set(result.invalid_routes)
+    assert '/' in reachable
+    assert reachable <= set(site.paths)
+
+
+def test_synthetic_crawl_max_pages():
+    site = SyntheticSite(SiteSpec(pages=60, fanout=4, depth=5))
+
+    with SyntheticServer(site) as server:
+        result = make_crawler(max_pages=10).crawl(server.base_url + '/')
+
+    assert result.pages_crawled == 10
+    assert result.stop_reason == 'max_pages_reached'
+    assert result.validate_page_count()
+
+
+def test_page_timings_and_metrics():
+    """Event 'page' membawa timing dan metrics teragregasi"""
+    site = SyntheticSite(SiteSpec(pages=20, fanout=3, depth=3))
+    metrics = CrawlMetrics()
+    crawler = make_crawler(metrics=metrics, max_pages=8, collect_timings=True)
+
+    with SyntheticServer(site) as server:
+        pages = [e for e in crawler.crawl_stream(server.base_url + '/') if e['type'] == 'page']
+
+    assert len(pages) == 8
+    for event in pages:
+        timings = event['timings']
+        assert timings['bytes'] > 0
+        assert timings['fetch'] >= timings['ttfb'] > 0
+        assert timings['retries'] == 0
+
+    text = metrics.render_prometheus()
+    assert 'crawler_stage_seconds_count{stage="parse"} 8' in text
+    assert 'crawler_pages_total{valid="true"} 8' in text
+
+
+def test_profile_stream():
+    """Profiler hanya merekam stack di bawah crawl_stream"""
+    site = SyntheticSite(SiteSpec(pages=30, fanout=3, depth=3, latency=0.005))
+    profiler = SamplingProfiler(interval=0.001)
+
+    with SyntheticServer(site) as server:
+        events = list(profiler.profile_stream(make_crawler(max_pages=15).crawl_stream(server.base_url + '/')))
+
+    assert events[-1]['type'] == 'complete'
+    report = profiler.report()
+    assert report['samples'] > 0
+    assert report['top_functions'][0]['function'].startswith('dfs_crawler.py:crawl_stream')
+    assert 'test_synthetic_crawl.py' not in report['collapsed']
+
+    # Fetch paralel: thread executor ikut disampling, stack dimulai dari _fetch_entry
+    profiler = SamplingProfiler(interval=0.001)
+    with SyntheticServer(site) as server:
+        crawler = make_crawler(profiler=profiler, max_pages=15, max_concurrency=4, adaptive_concurrency=False)
+        events = list(profiler.profile_stream(crawler.crawl_stream(server.base_url + '/')))
+
+    assert events[-1]['type'] == 'complete'
+    worker_stacks = [line for line in profiler.collapsed().splitlines() if line.startswith('dfs_crawler.py:_fetch_entry')]
+    assert worker_stacks
+    assert any('http_client.py' in line for line in worker_stacks)
+    assert 'thread.py:_worker' not in profiler.collapsed()
+
+
+def test_frontier_strategies_cover_sections():
+    """BFS dan best-first tidak terjebak di arsip panjang seperti DFS"""
+    site = SyntheticSite(SiteSpec(pages=40, fanout=6, depth=3, cross_links=0, archive_pages=100))
+    sections = {path for path in site.paths if site.depths[path] == 1 and not path.startswith('/archive')}
+
+    with SyntheticServer(site) as server:
+        for strategy in ('bfs', 'best_first'):
+            result = make_crawler(max_pages=15, max_depth=200, frontier_strategy=strategy).crawl(server.base_url + '/')
+            assert sections <= set(result.found_routes), strategy
+
+        result = make_crawler(max_pages=15, max_depth=200, frontier_strategy='dfs').crawl(server.base_url + '/')
+        assert result.max_depth_reached == 14
+
+
+def test_trap_detection():
+    """Calendar dan loop trap tidak menghabiskan budget max_pages"""
+    site = SyntheticSite(SiteSpec(pages=30, fanout=3, depth=3, cross_links=0, traps=True))
+
+    with SyntheticServer(site) as server:
+        result = make_crawler(
+            max_pages=200,
+            max_depth=1000,
+            max_pages_per_template=20,
+            frontier_strategy='bfs'
+        ).crawl(server.base_url + '/')
+
+    assert result.stop_reason == 'queue_empty'
+    assert set(site.paths) <= set(result.found_routes)
+    assert sum(1 for route in result.found_routes if route.startswith('/calendar/')) == 20
+    assert result.skipped_by_template['/calendar/{n}/{n}/{n}'] >= 1
+    assert result.skipped_loops >= 1
+
+    # Hanya token opaque yang jadi {id}; slug artikel yang kebetulan berisi angka tidak
+    assert path_template('/s/9f8e7d6c5b4a39281706/cart') == '/s/{id}/cart'
+    assert path_template('/o/123e4567-e89b-12d3-a456-426614174000') == '/o/{id}'
+    assert path_template('/t/aZ3kQ9xLmP2wR7vT') == '/t/{id}'
+    assert path_template('/blog/python-tips-for-2024') == '/blog/python-tips-for-{n}'
+    assert path_template('/blog/release-notes-v3-2') == '/blog/release-notes-v{n}-{n}'
+    assert path_template('/blog/introduction2python') == '/blog/introduction{n}python'
+
+
+def test_content_dedup():
+    """Print view dengan konten hampir sama tercatat sebagai duplikat dan tidak di-expand"""
+    site = SyntheticSite(SiteSpec(pages=20, fanout=3, depth=3, cross_links=0, print_views=True))
+
+    with SyntheticServer(site) as server:
+        result = make_crawler(max_pages=200, content_dedup=True, frontier_strategy='bfs').crawl(server.base_url + '/')
+
+    print_routes = {route for route in result.found_routes if route.startswith('/print')}
+    duplicates = {route for routes in result.duplicate_clusters.values() for route in routes}
+    assert print_routes
+    assert print_routes == duplicates
+    assert result.duplicate_clusters['/1'] == ['/print/1']
+
+
+def test_redirect_and_canonical_aliases():
+    """URL redirect (/old/...) dan canonical (/amp/...) dicatat sebagai alias, bukan route terpisah"""
+    site = SyntheticSite(SiteSpec(pages=30, fanout=3, depth=3, cross_links=0, aliases=True))
+
+    with SyntheticServer(site) as server:
+        result = make_crawler(max_pages=500).crawl(server.base_url + '/')
+
+    assert set(result.found_routes) == set(site.paths)
+    assert result.validate_page_count()
+    assert result.pages_crawled == len(site.paths)
+    assert result.aliases['/old/1'] == '/1'
+    assert result.aliases['/amp/1'] == '/1'
+
+    # Canonical "/" di semua halaman (head template): alias dicatat, link setiap halaman tetap diikuti
+    site = SyntheticSite(SiteSpec(pages=30, fanout=3, depth=3, cross_links=0, site_canonical='/'))
+    with SyntheticServer(site) as server:
+        result = make_crawler(max_pages=500).crawl(server.base_url + '/')
+
+    assert result.found_routes == ['/']
+    assert set(result.aliases) == set(site.paths) - {'/'}
+    assert set(result.aliases.values()) == {'/'}
+    assert result.validate_page_count()
+
+
+def test_http2_transport():
+    """Crawl lewat h2c memakai satu koneksi; server HTTP/1.1 otomatis fallback"""
+    pytest.importorskip('h2')
+    from app.infrastructure.http2_client import Http2HttpClient
+    from benchmarks.h2_server import H2SyntheticServer
+
+    site = SyntheticSite(SiteSpec(pages=30, fanout=3, depth=3, cross_links=0, aliases=True))
+
+    for server in (H2SyntheticServer(site), SyntheticServer(site)):
+        client = Http2HttpClient(prior_knowledge=True)
+        with server:
+            result = make_crawler(max_pages=500, http_client=client, collect_timings=True).crawl(server.base_url + '/')
+            response = client.get(server.base_url + '/1', timeout=5, headers={})
+        client.close()
+
+        assert set(result.found_routes) == set(site.paths)
+        assert result.aliases['/old/1'] == '/1'
+        assert server.connections == (1 if isinstance(server, H2SyntheticServer) else 2)
+        assert response.http_version == ('HTTP/2' if isinstance(server, H2SyntheticServer) else 'HTTP/1.1')
+
+
+def test_scope_rules():
+    """Rule exclude/include dikompilasi dan diterapkan ke setiap link"""
+    matcher = ScopeMatcher('https://www.example.com/', ScopeRules(
+        include=['/docs', '/blog/*.html', 're:^/p/\\d+$'],
+        exclude=['/docs/private', '*/draft/*'],
+        exclude_extensions=['pdf'],
+        allowed_subdomains=['blog', '*.docs'],
+    ))
+    assert matcher.allows('https://example.com/docs/intro')
+    assert matcher.allows('http://blog.example.com/blog/post.html')
+    assert matcher.allows('https://v2.docs.example.com/p/42')
+    assert not matcher.allows('https://example.com/docsx')
+    assert not matcher.allows('https://example.com/docs/private/key')
+    assert not matcher.allows('https://example.com/docs/draft/a')
+    assert not matcher.allows('https://example.com/docs/manual.PDF')
+    assert not matcher.allows('https://shop.example.com/docs')
+    assert not matcher.allows('https://example.com:8443/docs')
+    assert not matcher.allows('https://example.org/docs')
+
+    site = SyntheticSite(SiteSpec(pages=40, fanout=3, depth=4, cross_links=0))
+    with SyntheticServer(site) as server:
+        result = make_crawler(max_pages=100, scope=ScopeRules(exclude=['/2'])).crawl(server.base_url + '/')
+
+    excluded = {path for path in site.paths if path == '/2' or path.startswith('/2/')}
+    assert excluded
+    assert set(result.found_routes) == set(site.paths) - excluded
+
+    # Request dari client: prefix/glob saja, regex (ReDoS) hanya dari config server
+    request = CrawlRequest.from_dict({'url': 'https://example.com', 'scope': {'exclude': ['/docs/private', '*/draft/*']}})
+    assert request.scope.exclude == ['/docs/private', '*/draft/*']
+    for scope in ({'exclude': ['re:^(a+)+$']}, {'include': ['/a' * 200]}, {'exclude': ['/x'] * 1001}):
+        with pytest.raises(ValueError):
+            CrawlRequest.from_dict({'url': 'https://example.com', 'scope': scope})
+
+
+def test_adaptive_concurrency():
+    """Window naik selama latency stabil, turun tajam saat 503; crawl paralel tetap lengkap"""
+    controller = AdaptiveConcurrency(initial=1, maximum=8)
+    for _ in range(40):
+        controller.observe('example.com', 0.02, 200)
+    assert controller.window('example.com') == 8
+    controller.observe('example.com', 0.02, 503)
+    assert controller.window('example.com') == 4
+
+    site = SyntheticSite(SiteSpec(pages=60, fanout=4, depth=4, cross_links=1, latency=0.01, capacity=3))
+    with SyntheticServer(site) as server:
+        events = list(make_crawler(
+            max_pages=500, frontier_strategy='bfs', max_concurrency=6, adaptive_concurrency=True
+        ).crawl_stream(server.base_url + '/'))
+
+    result = events[-1]['result']
+    windows = [event['concurrency'] for event in events if event['type'] == 'page']
+    depths = [event['depth'] for event in events if event['type'] == 'page']
+    assert set(result.found_routes) | set(result.invalid_routes) == set(site.paths)
+    assert result.validate_page_count()
+    assert max(windows) > 1
+    # Entry yang ditunda karena window host penuh tidak pindah ke belakang antrian BFS
+    assert depths == sorted(depths)
+    assert site.max_in_flight <= 6
+    assert result.concurrency[server.base_url.split('//')[1]]['max_window'] >= 2
+
+
+def test_frontier_requeue():
+    """Entry yang di-pop lalu di-requeue keluar lagi dengan urutan semula, tanpa skor berubah"""
+    entries = [(f'http://x.test/{section}/{i}', i % 3, None) for i in range(12) for section in ('a', 'b')]
+    budget = CrawlBudget(deadline=10)
+    frontiers = {
+        'dfs': StackFrontier, 'bfs': QueueFrontier, 'best_first': BestFirstFrontier,
+        'dfs_spill': lambda: SpillingStackFrontier(memory_limit=1000),
+        'bfs_spill': lambda: SpillingQueueFrontier(memory_limit=1000),
+        'deadline': lambda: DeadlineFrontier(CostModel(), budget),
+    }
+    for name, factory in frontiers.items():
+        expected, frontier = factory(), factory()
+        for entry in entries:
+            expected.push(*entry)
+            frontier.push(*entry)
+        counts = dict(getattr(frontier, '_link_counts', {}))
+        popped = [frontier.pop() for _ in range(5)]
+        frontier.requeue(popped)
+        assert len(frontier) == len(entries), name
+        assert dict(getattr(frontier, '_link_counts', {})) == counts, name
+        assert [frontier.pop() for _ in entries] == [expected.pop() for _ in entries], name
+
+
+def test_best_first_relink():
+    """URL yang di-link ulang tidak menumpuk entry di heap; skor terbaik yang dipakai"""
+    frontier = BestFirstFrontier()
+    for i in range(200):
+        frontier.push('http://x.test/hub', 3, f'http://x.test/p/{i}')
+        frontier.push(f'http://x.test/p/{i}', 2, None)
+    assert len(frontier) == 201
+    assert len(frontier._heap) <= 2 * len(frontier._live)
+    assert sorted(entry[0] for entry in frontier).count('http://x.test/hub') == 1
+
+    frontier.push('http://x.test/hub', 1, 'http://x.test/')
+    assert frontier.pop() == ('http://x.test/hub', 1, 'http://x.test/')
+    popped = [frontier.pop() for _ in range(len(frontier))]
+    assert len(popped) == 200 and 'http://x.test/hub' not in [entry[0] for entry in popped]
+
+    # best_first tidak bisa spill: memory limit diabaikan (dengan warning), bukan error
+    assert isinstance(create_frontier('best_first', memory_limit=1000), BestFirstFrontier)
+
+
+def test_politeness_per_host():
+    """Delay berlaku per request per host, juga saat fetch paralel"""
+    now = [0.0]
+    pacer = HostPacer(0.5, clock=lambda: now[0], sleep=lambda seconds: None)
+    assert [pacer.reserve('a') for _ in range(3)] == [0.0, 0.5, 1.0]
+    assert pacer.reserve('b') == 0.0
+    now[0] = 5.0
+    assert pacer.reserve('a') == 0.0
+
+    site = SyntheticSite(SiteSpec(pages=12, fanout=3, depth=3, cross_links=0))
+    with SyntheticServer(site) as server:
+        start = time.perf_counter()
+        events = list(make_crawler(
+            max_pages=10, max_concurrency=4, adaptive_concurrency=False, delay=0.05, collect_timings=True
+        ).crawl_stream(server.base_url + '/'))
+        elapsed = time.perf_counter() - start
+    pages = [event for event in events if event['type'] == 'page']
+    assert len(pages) == 10
+    # 10 request ke satu host: minimal 9 jeda, seperti crawl sequential
+    assert elapsed >= 9 * 0.05
+    assert sum(event['timings']['sleep'] for event in pages) > 0
+
+
+def test_tail_latency():
+    """Timeout mengikuti p99 host; request lambat di-hedge dalam batas extra load"""
+    tracker = LatencyTracker(min_samples=20, timeout_multiplier=3.0, min_timeout=0.5)
+    assert tracker.timeout_for('example.com', 10) == 10
+    for i in range(100):
+        tracker.record('example.com', 0.5 if i >= 98 else 0.1)
+    assert tracker.percentile('example.com', 95) == 0.1
+    assert tracker.timeout_for('example.com', 10) == 1.5
+    assert tracker.timeout_for('example.com', 1) == 1
+
+    site = SyntheticSite(SiteSpec(
+        pages=200, fanout=6, depth=4, cross_links=1, latency=0.005, tail_rate=0.04, tail_latency=0.3
+    ))
+    with SyntheticServer(site) as server:
+        result = make_crawler(
+            max_pages=500, frontier_strategy='bfs', adaptive_timeouts=True,
+            hedge_requests=True, hedge_max_ratio=0.2
+        ).crawl(server.base_url + '/')
+        assert 0 < RequestsHttpClient().get(server.base_url + '/', timeout=5, headers={}).elapsed < 5
+
+    tail = result.tail_latency
+    assert set(result.found_routes) | set(result.invalid_routes) == set(site.paths)
+    assert result.validate_page_count()
+    assert tail['hedged'] > 0
+    assert tail['hedged'] <= 0.2 * tail['requests']
+    assert tail['hedge_wins'] <= tail['hedged']
+    assert tail['hosts'][server.base_url.split('//')[1]]['timeout'] < 10
+
+    # Tracker mencatat latency per attempt: tanpa retry/backoff, dan maksimal timeout jika gagal
+    response = HttpResponse(url='http://x.test/', final_url='http://x.test/', status_code=503, attempts=3, elapsed=0.2)
+    assert DFSWebCrawler._attempt_latency((response, None, 4.5), 10) == 0.2
+    assert DFSWebCrawler._attempt_latency((None, None, 9.0), 2) == 2
+
+    # Attempt yang selesai duluan gagal, attempt lain berhasil: hasil yang berhasil dipakai
+    tracker = LatencyTracker(min_samples=1)
+    tracker.record('example.com', 0.01)
+    hedger = Hedger(tracker, max_ratio=1.0)
+    primary_done = threading.Event()
+
+    def attempt(is_hedge):
+        if is_hedge:
+            return 'failed'
+        time.sleep(0.1)
+        primary_done.set()
+        return 'ok'
+
+    def failed(result):
+        if result == 'failed':
+            # Attempt lain sudah selesai saat hasil gagal diperiksa
+            primary_done.wait(1)
+            time.sleep(0.02)
+        return result == 'failed'
+
+    assert hedger.fetch('example.com', attempt, failed) == 'ok'
+    assert hedger.stats()['hedge_wins'] == 0
+    hedger.shutdown()
+
+
+def test_deadline_and_byte_budget():
+    """Deadline/byte budget menghentikan crawl dengan result parsial yang konsisten"""
+    site = SyntheticSite(SiteSpec(pages=300, fanout=6, depth=4, latency=0.02))
+    with SyntheticServer(site) as server:
+        start = time.perf_counter()
+        result = make_crawler(max_pages=500, deadline=0.6).crawl(server.base_url + '/')
+        elapsed = time.perf_counter() - start
+
+        assert result.stop_reason == 'deadline_reached'
+        assert elapsed < 1.2
+        assert 0 < result.pages_crawled < len(site.paths)
+        assert result.validate_page_count()
+        assert result.budget['focused']
+        assert result.frontier['pending'] > 0
+        assert sum(result.frontier['by_depth'].values()) == result.frontier['pending']
+
+        result = make_crawler(max_pages=500, max_bytes=20000).crawl(server.base_url + '/')
+        assert result.stop_reason == 'byte_budget_reached'
+        assert result.budget['bytes_used'] >= 20000
+        assert result.pages_crawled < 10
+
+    # Fetch yang masih in-flight saat deadline ditinggalkan, bukan ditunggu
+    slow = SyntheticSite(SiteSpec(pages=20, fanout=4, depth=2, latency=3.0))
+    with SyntheticServer(slow) as server:
+        for strategy in ('dfs', 'bfs', 'best_first'):
+            start = time.perf_counter()
+            result = make_crawler(
+                max_pages=50, deadline=0.3, timeout=10, frontier_strategy=strategy
+            ).crawl(server.base_url + '/')
+            assert time.perf_counter() - start < 1.0
+            assert result.stop_reason == 'deadline_reached'
+            assert result.pages_crawled == 0
+            assert result.validate_page_count()
+            assert result.frontier['pending'] == 1
+            assert result.frontier['sample'] == [server.base_url + '/']
+
+
+def test_deadline_frontier_source(tmp_path):
+    """Switch ke DeadlineFrontier melewati URL visited dan heap tetap dalam budget memori"""
+    source = SpillingStackFrontier(memory_limit=2000, spill_dir=str(tmp_path))
+    urls = ['http://example.com/p/%d' % i for i in range(200)]
+    for url in urls:
+        source.push(url, 1, None)
+    assert source.spilled_entries > 0
+    visited = set(urls[::2])
+
+    frontier = DeadlineFrontier(CostModel(), CrawlBudget(deadline=60), source, visited, memory_limit=2000)
+    assert frontier._memory_bytes <= 2000 + 200
+    frontier.push('http://example.com/new', 1, None)
+    popped = []
+    while frontier:
+        popped.append(frontier.pop()[0])
+        assert frontier._memory_bytes <= 2000 + 200
+    assert sorted(popped) == sorted(set(urls) - visited | {'http://example.com/new'})
+
+    # Tanpa batas memori: seluruh source (tanpa URL visited) masuk heap
+    source = StackFrontier()
+    for url in urls:
+        source.push(url, 1, None)
+    frontier = DeadlineFrontier(CostModel(), CrawlBudget(deadline=60), source, visited)
+    assert len(frontier) == len(urls) // 2 and not source
+
+
+def test_link_graph():
+    """Semua edge intra-site direkam; click depth, degree, PageRank, orphan dan alias"""
+    pytest.importorskip('numpy')
+    builder = LinkGraphBuilder()
+    root = builder.mark_fetched('/')
+    for route in ('/a', '/b', '/old-b'):
+        builder.add_edge(root, route)
+    a = builder.mark_fetched('/a')
+    builder.add_edge(a, '/c')
+    builder.add_edge(a, '/c')
+    builder.add_edge(a, '/')
+    builder.mark_fetched('/island')
+    builder.add_alias('/old-b', '/b')
+    graph = builder.build('/')
+
+    assert graph.edge_count == 4  # /old-b digabung ke /b, edge ganda di-dedup
+    depth = dict(zip(graph.routes, graph.click_depth().tolist()))
+    assert depth['/'] == 0 and depth['/b'] == 1 and depth['/c'] == 2
+    assert graph.unreachable() == ['/island']
+    assert graph.orphans() == ['/island']
+    assert graph.summary()['orphans'] == {'count': 1, 'sample': ['/island']}
+    assert graph.summary(sample=0)['unreachable'] == {'count': 1, 'sample': []}
+    assert abs(graph.pagerank().sum() - 1.0) < 1e-6
+    assert dict(zip(graph.routes, graph.in_degree().tolist()))['/b'] == 1
+
+    site = SyntheticSite(SiteSpec(pages=120, fanout=5, depth=4, cross_links=2))
+    with SyntheticServer(site) as server:
+        events = list(make_crawler(max_pages=500, link_graph=True).crawl_stream(server.base_url + '/'))
+
+    result, graph = events[-1]['result'], events[-1]['graph']
+    summary = result.link_graph
+    assert summary['nodes'] == len(site.paths)
+    assert summary['unreachable']['count'] == summary['orphans']['count'] == 0
+    assert summary['edges'] >= len(site.paths) - 1
+    assert graph.in_degree().sum() == graph.edge_count
+    assert max(result.route_depths.values()) >= summary['max_click_depth']
+    assert summary['top_in_degree'][0]['in_degree'] == graph.in_degree().max()
+    assert abs(graph.pagerank().sum() - 1.0) < 1e-6
+
+
+def test_page_archive(tmp_path):
+    """Response di-capture ke archive .warc.gz dan bisa dibaca per URL lewat mmap"""
+    archive_path = str(tmp_path / 'crawl.warc.gz')
+    site = SyntheticSite(SiteSpec(pages=40, fanout=4, depth=3, error_rate=0.1, aliases=True))
+    writer = WarcArchiveWriter(archive_path)
+    crawler = make_crawler(max_pages=200)
+    crawler.page_sink = writer
+    with SyntheticServer(site) as server:
+        result = crawler.crawl(server.base_url + '/')
+    writer.close()
+
+    with gzip.open(archive_path) as f:
+        assert f.read(8) == b'WARC/1.1'
+
+    with WarcArchiveReader(archive_path) as reader:
+        for route in result.found_routes:
+            page = reader.get(server.base_url + route)
+            assert page is not None and page.status_code == 200
+            assert page.body == site.render(route).decode('utf-8')
+        for route in result.invalid_routes:
+            assert reader.get(server.base_url + route).status_code >= 400
+        # Alias redirect menunjuk ke record halaman tujuan
+        alias = next(route for route in result.aliases if route.startswith('/old/'))
+        assert reader.get(server.base_url + alias).url == server.base_url + result.aliases[alias]
+        assert reader.get(server.base_url + '/missing') is None
+
+    # Archive semua worker lewat pattern {pid}; reader di-cache sampai index-nya bertambah
+    archives = WarcArchiveSet(str(tmp_path / 'crawl-{pid}.warc.gz'))
+    assert archives.get(server.base_url + '/') is None
+    first = WarcArchiveWriter(str(tmp_path / 'crawl-1.warc.gz'))
+    first.write(HttpResponse(url='http://x.test/a', final_url='http://x.test/a', status_code=200, text='a1'))
+    first.flush()
+    assert archives.get('http://x.test/a').body == 'a1'
+    reader = archives._readers[first.path][1]
+    assert archives.get('http://x.test/missing') is None
+    assert archives._readers[first.path][1] is reader
+
+    second = WarcArchiveWriter(str(tmp_path / 'crawl-2.warc.gz'))
+    second.write(HttpResponse(url='http://x.test/b', final_url='http://x.test/b', status_code=404, text=''))
+    second.flush()
+    first.write(HttpResponse(url='http://x.test/c', final_url='http://x.test/c', status_code=200, text='c'))
+    first.flush()
+    assert archives.get('http://x.test/b').status_code == 404
+    assert archives.get('http://x.test/c').body == 'c'
+    assert archives._readers[first.path][1] is not reader
+    first.close()
+    second.close()
+    archives.close()
+
+
+def test_spilling_frontier(tmp_path):
+    """Frontier dengan budget memori: urutan traversal sama, entry berlebih ada di disk"""
+    entries = [('http://x/a', 1, 'http://x/'), ('http://x/\u00e9', 2, None)]
+    assert decode_segment(encode_segment(entries)) == entries
+
+    frontier = SpillingStackFrontier(memory_limit=2000, spill_dir=str(tmp_path))
+    for i in range(100):
+        frontier.push(f'http://x/{i}', i, None)
+    assert frontier.spilled_entries > 0
+    assert frontier.peak_memory_bytes <= 2000 + 200
+    assert [frontier.pop()[1] for _ in range(100)] == list(range(99, -1, -1))
+
+    queue = SpillingQueueFrontier(memory_limit=2000)
+    for i in range(100):
+        queue.push(f'http://x/{i}', i, None)
+    assert len(queue) == 100 and [entry[1] for entry in queue] == list(range(100))
+    assert [queue.pop()[1] for _ in range(100)] == list(range(100))
+
+    site = SyntheticSite(SiteSpec(pages=120, fanout=6, depth=4, cross_links=2))
+    with SyntheticServer(site) as server:
+        for strategy in ('dfs', 'bfs'):
+            def routes(**overrides):
+                crawler = make_crawler(max_pages=80, max_depth=10, frontier_strategy=strategy, **overrides)
+                events = list(crawler.crawl_stream(server.base_url + '/'))
+                return [event['route'] for event in events if event['type'] == 'page'], events[-1]['result']
+
+            baseline, _ = routes()
+            spilled, result = routes(frontier_memory_limit=3000, frontier_spill_dir=str(tmp_path))
+            assert spilled == baseline
+            assert result.frontier_spill['spilled_segments'] > 0
+            assert result.frontier_spill['peak_memory_bytes'] <= 3000 + 500
+
+
+def test_record_replay(tmp_path):
+    """Crawl direkam ke fixture, lalu di-replay tanpa server dengan hasil yang sama"""
+    fixture = str(tmp_path / 'site.jsonl.gz')
+    site = SyntheticSite(SiteSpec(pages=30, fanout=3, depth=3, latency=0.02, error_rate=0.1, aliases=True))
+    with SyntheticServer(site) as server:
+        url = server.base_url + '/'
+        with RecordingHttpClient(RequestsHttpClient(), fixture) as recorder:
+            recorded = make_crawler(http_client=recorder, max_pages=50).crawl(url)
+            # Client per crawl: session (cookie) sendiri, rekaman ke fixture yang sama
+            scoped = recorder.scoped()
+            assert scoped is not recorder and scoped.inner is not recorder.inner
+            assert scoped.inner.session is not recorder.inner.session
+            before = recorder.records
+            scoped.get(url, 5, {})
+            assert recorder.records == before + 1
+        assert recorder.records >= recorded.pages_crawled
+
+    fast = ReplayHttpClient(fixture)
+    start = time.perf_counter()
+    replayed = make_crawler(http_client=fast, max_pages=50, collect_timings=True).crawl(url)
+    fast_seconds = time.perf_counter() - start
+    assert replayed.to_dict() == recorded.to_dict()
+    assert fast.misses == [] and next(fast.urls()) == url
+
+    start = time.perf_counter()
+    realtime = make_crawler(http_client=ReplayHttpClient(fixture, latency_scale=1.0), max_pages=50).crawl(url)
+    assert realtime.to_dict() == recorded.to_dict()
+    # Latency rekaman (>= 20ms per request) diputar ulang
+    assert time.perf_counter() - start >= 0.02 * recorded.pages_crawled > fast_seconds
+
+    missing = ReplayHttpClient(fixture)
+    assert missing.get(url + 'not-recorded', 5, {}) is None
+    assert missing.misses == [url + 'not-recorded']
+
+
+def test_page_metadata():
+    """Metadata halaman di-extract di pass yang sama dengan links, masuk event 'page' dan tree"""
+    extractor = BeautifulSoupLinkExtractor()
+    html = (
+        '<html lang="en"><head><title>  Hello\n World </title>'
+        '<meta name="Description" content="A  page"><meta name="robots" content="NOINDEX, follow">'
+        '<link rel="canonical" href="/canonical"><style>p { color: red }</style></head>'
+        '<body><!-- not counted --><p>one two <a href="/a">three</a></p><script>var x = 1;</script></body></html>'
+    )
+    page = extractor.extract_page(html, 'http://x.test/page', PAGE_METADATA_FIELDS)
+    assert page.metadata == {
+        'title': 'Hello World',
+        'description': 'A page',
+        'canonical': 'http://x.test/canonical',
+        'robots': ['noindex', 'follow'],
+        'lang': 'en',
+        'word_count': 3,
+    }
+    assert page.links == extractor.extract_page(html, 'http://x.test/page').links == ['http://x.test/a']
+    assert extractor.extract_page(html, 'http://x.test/page', ['title']).metadata == {'title': 'Hello World'}
+    assert extractor.extract_page('<p>plain</p>', 'http://x.test/', ['title', 'lang']).metadata == {'title': None, 'lang': None}
+
+    site = SyntheticSite(SiteSpec(pages=20, fanout=3, depth=3, cross_links=0, head_metadata=True))
+    with SyntheticServer(site) as server:
+        crawler = make_crawler(max_pages=10, page_metadata=['title', 'robots', 'lang', 'word_count'])
+        events = list(crawler.crawl_stream(server.base_url + '/'))
+        plain = make_crawler(max_pages=10).crawl(server.base_url + '/')
+
+    pages = [event for event in events if event['type'] == 'page']
+    assert len(pages) == 10
+    for event in pages:
+        # Termasuk halaman terakhir (max_pages), yang link-nya tidak di-extract lagi
+        assert event['metadata']['title'] == event['route']
+        assert event['metadata']['robots'] == ['index', 'follow'] and event['metadata']['lang'] == 'id'
+        assert event['metadata']['word_count'] > 0
+    result = events[-1]['result']
+    assert result.tree.metadata['title'] == '/'
+    assert result.tree.to_dict()['children'][0]['metadata']['lang'] == 'id'
+    assert 'metadata' not in plain.tree.to_dict()
+    assert result.found_routes == plain.found_routes
+
+    with pytest.raises(ValueError):
+        list(make_crawler(page_metadata=['h1']).crawl_stream(server.base_url + '/'))
+    assert CrawlRequest.from_dict({'url': 'http://x.test', 'metadata': True}).metadata == list(PAGE_METADATA_FIELDS)
+    assert CrawlRequest.from_dict({'url': 'http://x.test', 'metadata': False}).metadata == []
+    with pytest.raises(ValueError):
+        CrawlRequest.from_dict({'url': 'http://x.test', 'metadata': ['title', 'h1']})
+
+
+def test_revisit_scheduler(tmp_path):
+    """Budget per jam dipakai untuk route yang sering berubah, state bertahan setelah restart"""
+    clock = SimClock()
+    site = ChangingSite(clock, routes=40, min_period=600, max_period=30 * 24 * 3600, seed=1)
+    path = str(tmp_path / 'revisit.db')
+    scheduler = make_scheduler(site, clock, path, 'change_rate', budget=60, tick_seconds=60)
+
+    for _ in range(24 * 60):
+        scheduler.tick()
+        # Crawl discovery tidak pernah memakai lebih dari token yang tersedia
+        assert scheduler._tokens >= 0
+        clock.now += 60
+
+    # Discovery lewat DFSWebCrawler: root + semua route, halaman crawl sekaligus jadi baseline
+    assert set(site.urls) <= set(scheduler.routes)
+    report = scheduler.report()
+    assert report['routes'] == 41
+    assert report['fetches'] <= 60 * 24 + 2 and report['fetches'] == site.requests
+    assert report['changes'] and 0 < report['estimated_freshness'] < 1
+    assert site.not_modified > 0  # route dengan ETag di-revisit dengan If-None-Match
+    assert site.user_agents == {scheduler.config.user_agent}  # revisit memakai User-Agent config, seperti crawl
+
+    by_rate = sorted(site.urls, key=site.rates.get)
+    slow_checks = sum(scheduler.routes[url].checks for url in by_rate[:10])
+    fast_checks = sum(scheduler.routes[url].checks for url in by_rate[-10:])
+    assert fast_checks > 3 * slow_checks
+    fastest = scheduler.routes[by_rate[-1]]
+    assert fastest.change_rate(scheduler.prior_interval) > scheduler.routes[by_rate[0]].change_rate(scheduler.prior_interval)
+
+    states = {url: (state.checks, state.changes, state.content_hash, state.etag) for url, state in scheduler.routes.items()}
+    scheduler.close()
+    restored = RevisitScheduler(
+        RevisitStore(path), site, scheduler.url_parser, scheduler.link_extractor, scheduler.config,
+        sites=scheduler.sites, clock=clock
+    )
+    assert {url: (state.checks, state.changes, state.content_hash, state.etag) for url, state in restored.routes.items()} == states
+    assert restored.report()['fetches'] == report['fetches']
+    # Discovery tidak diulang sebelum rediscover_interval; revisit ke host yang sama mengikuti delay
+    waits = []
+    restored._pacer = HostPacer(0.5, clock=lambda: 0.0, sleep=waits.append)
+    tick = restored.tick()
+    assert tick['discovered'] == 0 and tick['fetches'] > 1
+    assert waits == [0.5 * i for i in range(1, tick['fetches'])]
+    assert restored.discover(scheduler.sites[0], max_pages=3) == (0, 3)
+    restored.close()
+
+    with pytest.raises(ValueError):
+        RevisitScheduler(RevisitStore(':memory:'), site, None, None, scheduler.config, policy='cron')
+
+    # Dengan budget yang sama, policy laju perubahan mendeteksi lebih banyak perubahan per fetch dari cron tetap
+    args = argparse.Namespace(routes=100, budget=30, hours=24, tick=60, min_period=600, max_period=30 * 24 * 3600, seed=7)
+    change_rate, uniform = simulate('change_rate', args), simulate('uniform', args)
+    assert change_rate['fetches'] == uniform['fetches']
+    assert change_rate['changes_per_fetch'] > 1.2 * uniform['changes_per_fetch']
+
+
+if __name__ == '__main__':
+    test_synthetic_crawl()
+    test_synthetic_crawl_max_pages()
+    test_page_timings_and_metrics()
+    test_profile_stream()
+    test_frontier_strategies_cover_sections()
+    test_trap_detection()
+    test_content_dedup()
+    test_redirect_and_canonical_aliases()
+    test_http2_transport()
+    test_scope_rules()
+    test_adaptive_concurrency()
+    test_frontier_requeue()
+    test_best_first_relink()
+    test_politeness_per_host()
+    test_tail_latency()
+    test_deadline_and_byte_budget()
+    test_link_graph()
+    test_page_archive(Path(tempfile.mkdtemp()))
+    test_deadline_frontier_source(Path(tempfile.mkdtemp()))
+    test_spilling_frontier(Path(tempfile.mkdtemp()))
+    test_record_replay(Path(tempfile.mkdtemp()))
+    test_page_metadata()
+    test_revisit_scheduler(Path(tempfile.mkdtemp()))
+    print("✓ PASS")